@@ -1,18 +1,25 @@
 import random
 import csv
 import numpy as np
-from typing import List, Dict, Tuple, Set, Optional
+from typing import List, Dict, Tuple, Set, Optional, FrozenSet, Callable, Hashable
 import copy
+import math
+import gzip
+import os
+import pickle
 import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from functools import lru_cache
+from time import perf_counter
 from datetime import datetime, time
-from dataclasses import dataclass
-from pkg_resources import get_distribution
+from dataclasses import dataclass, field
+from types import SimpleNamespace
 from sqlalchemy.orm import Session
 from sqlalchemy import text
 from models import Lecturer, Course, Room, Timeslot, Constraint
 from database import get_db
 import logging
-from collections import defaultdict
+from collections import defaultdict, Counter, deque, OrderedDict
 # Configure the logger
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -38,6 +45,20 @@ class ScheduleItem:
     semester: Optional[str] = None  # Add semester
     year: Optional[int] = None
 
+@dataclass(frozen=True)
+class ParameterSpec:
+    """
+    One request parameter: bool, int, float (any number) or a tuple of the
+    allowed values, with inclusive bounds unless exclusive_minimum. None is
+    accepted only where it is the default.
+    """
+    name: str
+    kind: object
+    minimum: Optional[float] = None
+    maximum: Optional[float] = None
+    default: object = None
+    exclusive_minimum: bool = False
+
 # Constants for the genetic algorithm
 DAYS = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
 # Calculate how many periods fit between 8:30 and 18:30
@@ -51,13 +72,85 @@ PERIOD_DURATION = 120  # 120 minutes per period
 AVAILABLE_MINUTES = (ENDING_HOUR * 60 + ENDING_MINUTE) - (STARTING_HOUR * 60 + STARTING_MINUTE)
 PERIODS_PER_DAY = AVAILABLE_MINUTES // PERIOD_DURATION  # Integer division to get whole periods
 MAX_GENERATIONS_WITHOUT_IMPROVEMENT = 50
+# Simulated annealing reports progress, and counts a "generation", every this many moves
+SA_MOVES_PER_GENERATION = 100
+# Adaptive control: operators
+MUTATION_TYPES = ("time", "room", "day")
+# Guided mutation: move a gene involved in hard violations to a free placement
+CONFLICT_MUTATION = "conflict"
+# Crossovers swap all sessions of a course at once: uniformly per course ("block"), by the
+# days a parent holds them on ("day"), or course by course from the parent clashing least ("resource")
+CROSSOVER_TYPES = ("block", "day", "resource")
+ADAPTIVE_MIN_PROBABILITY = 0.05  # no operator is ever switched off
+ADAPTIVE_DECAY = 0.2             # weight of the latest generation in an operator's success rate
+# Adaptive control: below this share of distinct fitness values the population counts as
+# converged, and the mutation rate is raised up to MAX_ADAPTIVE_MUTATION_RATE
+DIVERSITY_FLOOR = 0.2
+MAX_ADAPTIVE_MUTATION_RATE = 0.5
+# Duplicate suppression: mutations tried on a repeated genome until it is new
+DUPLICATE_RETRIES = 3
+# How often generate_semester_timetables calls its heartbeat while years are running
+SEMESTER_HEARTBEAT_SECONDS = 1
+# Generations between diversity lines in the run log
+DIVERSITY_LOG_INTERVAL = 10
+# Default number of genomes whose scores the fitness cache keeps; 0 leaves it
+# off, so every chromosome is evaluated unless a run asks for the cache
+FITNESS_CACHE_SIZE = 0
+# Re-planning runs inside an API request: its local search gets at most this many seconds in all
+MAX_REPLAN_SECONDS = 30
+
+# Parameters of generate_timetable as sent by the frontend, checked by validate_generation_parameters
+GENERATION_PARAMETERS = (
+    ParameterSpec('populationSize', float, 50, 200, 50),
+    ParameterSpec('generations', float, 50, 2000, 50),
+    ParameterSpec('crossoverRate', float, 0.7, 0.9, 0.8),
+    ParameterSpec('mutationRate', float, 0.01, 0.1, 0.05),
+    ParameterSpec('elitismCount', float, 1, 10, 5),
+    ParameterSpec('tournamentSize', float, 2, 5, 5),
+    ParameterSpec('genomeMode', ('object', 'array'), default='object'),
+    ParameterSpec('fitnessEvaluator', ('loop', 'vectorized'), default='loop'),
+    ParameterSpec('parallelEvaluation', bool, default=False),
+    ParameterSpec('workers', int, 1),  # None: one per CPU
+    ParameterSpec('deltaEvaluation', bool, default=False),
+    ParameterSpec('islands', int, 1, 32, 1),
+    ParameterSpec('migrationInterval', int, 1, None, 10),
+    ParameterSpec('migrationSize', int, 0, None, 2),
+    ParameterSpec('migrationTopology', ('ring', 'full'), default='ring'),
+    ParameterSpec('checkpointInterval', int, 1, None, 25),
+    ParameterSpec('warmStart', bool, default=False),
+    ParameterSpec('warmStartFraction', float, 0, 1, 0.5, exclusive_minimum=True),
+    ParameterSpec('warmStartPerturbation', float, 0, 1, 0.05),
+    ParameterSpec('memetic', bool, default=False),
+    ParameterSpec('memeticElite', int, 1, 10, 1),
+    ParameterSpec('memeticSteps', int, 1, 500, 10),
+    ParameterSpec('memeticNeighbours', int, 1, 200, 8),
+    ParameterSpec('tabuTenure', int, 0, 100, 7),
+    ParameterSpec('engine', ('ga', 'sa'), default='ga'),  # the keys of ENGINES
+    ParameterSpec('annealingIterations', int, 100, 1000000, 20000),
+    ParameterSpec('initialTemperature', float, 0, exclusive_minimum=True),  # None: calibrated per run
+    ParameterSpec('finalTemperature', float, 0, None, 0.05, exclusive_minimum=True),
+    ParameterSpec('reheatAfter', int, 1, None, 1000),
+    ParameterSpec('reheatTemperature', float, 0, 1, 0.5, exclusive_minimum=True),
+    ParameterSpec('maxReheats', int, 0, None, 3),
+    ParameterSpec('presolve', bool, default=True),
+    ParameterSpec('adaptive', bool, default=False),
+    ParameterSpec('guidedMutation', bool, default=False),
+    ParameterSpec('crossoverType', CROSSOVER_TYPES, default='block'),
+    ParameterSpec('deduplicate', bool, default=False),
+    ParameterSpec('fitnessCacheSize', int, 0, 1000000, FITNESS_CACHE_SIZE),
+    ParameterSpec('cacheConflicts', bool, default=False),
+)
+# Parameters of replan_timetable as sent by the frontend
+REPLAN_PARAMETERS = (
+    ParameterSpec('timeLimit', float, 0, MAX_REPLAN_SECONDS, 5.0, exclusive_minimum=True),
+)
 
 # Constraint penalty weights
 HARD_CONSTRAINT_PENALTY = 500.0  # Heavily penalize hard constraint violations
 SOFT_CONSTRAINT_PENALTY = 2.0    # Normal penalty for soft constraints
 
 # Helper function to convert period number to time
-def period_to_time(period: int) -> Tuple[time, time]:
+def _compute_period_times(period: int) -> Tuple[time, time]:
     # Start at 8:30 AM
     start_hour = STARTING_HOUR
     start_minute = STARTING_MINUTE
@@ -81,30 +174,42 @@ def period_to_time(period: int) -> Tuple[time, time]:
     
     return start_time, end_time
 
+def period_to_time(period: int) -> Tuple[time, time]:
+    # Periods of the teaching day are precomputed in PERIOD_TIMES
+    if 1 <= period <= PERIODS_PER_DAY:
+        return PERIOD_TIMES[period - 1]
+    return _compute_period_times(period)
+
+@lru_cache(maxsize=None)
+def _string_time_to_minutes(t: str) -> int:
+    try:
+        parsed = datetime.strptime(t, '%H:%M:%S').time()
+    except ValueError:
+        parsed = datetime.strptime(t, '%H:%M').time()
+    return parsed.hour * 60 + parsed.minute
+
+def time_to_minutes(t) -> int:
+    """Minutes since midnight of a time object or an 'HH:MM[:SS]' string"""
+    if isinstance(t, str):
+        return _string_time_to_minutes(t)
+    return t.hour * 60 + t.minute
+
+def minutes_overlap(s1_start: int, s1_end: int, s2_start: int, s2_end: int) -> bool:
+    return (
+        (s1_start <= s2_start < s1_end) or
+        (s1_start < s2_end <= s1_end) or
+        (s2_start <= s1_start < s2_end) or
+        (s2_start < s1_end <= s2_end)
+    )
+
 # Helper function to check if two timeslots overlap
 def timeslots_overlap(slot1: TimeSlot, slot2: TimeSlot) -> bool:
-       if slot1.day != slot2.day:
-           return False
-       def time_to_minutes(t):
-           # Handle both string and time objects
-           if isinstance(t, str):
-               try:
-                   t = datetime.strptime(t, '%H:%M:%S').time()
-               except ValueError:
-                   t = datetime.strptime(t, '%H:%M').time()
-           return t.hour * 60 + t.minute
-       
-       s1_start = time_to_minutes(slot1.start_time)
-       s1_end = time_to_minutes(slot1.end_time)
-       s2_start = time_to_minutes(slot2.start_time)
-       s2_end = time_to_minutes(slot2.end_time)
-       
-       return (
-           (s1_start <= s2_start < s1_end) or
-           (s1_start < s2_end <= s1_end) or
-           (s2_start <= s1_start < s2_end) or
-           (s2_start < s1_end <= s2_end)
-       )
+    if slot1.day != slot2.day:
+        return False
+    return minutes_overlap(
+        time_to_minutes(slot1.start_time), time_to_minutes(slot1.end_time),
+        time_to_minutes(slot2.start_time), time_to_minutes(slot2.end_time)
+    )
 
 
 # Helper function to parse time string (format: "HH:MM")
@@ -115,6 +220,111 @@ def parse_time_string(time_str: str) -> time:
         hours, minutes = map(int, time_str.split(':'))
         return time(hour=hours, minute=minutes)
 
+# Friday prayer time (HC13) and the early/late soft-constraint bands (SC1/SC2),
+# in minutes since midnight
+PRAYER_START_MINUTES = 12 * 60 + 30
+PRAYER_END_MINUTES = 14 * 60 + 30
+EARLY_BAND_MINUTES = (8 * 60 + 30, 10 * 60)
+LATE_BAND_MINUTES = (16 * 60, 18 * 60 + 30)
+WEEKDAYS = DAYS[:5]
+DAY_INDEX = {day: i for i, day in enumerate(DAYS)}
+
+@dataclass(frozen=True)
+class SlotInfo:
+    """One (day, period) cell of the weekly grid. slot_id = day_index * PERIODS_PER_DAY + period - 1"""
+    slot_id: int
+    day: str
+    day_index: int
+    period: int  # 1-based, as for period_to_time
+    start_time: time
+    end_time: time
+    start_minutes: int
+    end_minutes: int
+    is_prayer: bool
+    is_early: bool
+    is_late: bool
+    is_weekend: bool
+
+def _in_prayer_time(day: str, start_minutes: int, end_minutes: int) -> bool:
+    return day == "Friday" and (
+        (PRAYER_START_MINUTES <= start_minutes < PRAYER_END_MINUTES) or
+        (PRAYER_START_MINUTES < end_minutes <= PRAYER_END_MINUTES)
+    )
+
+def _in_band(start_minutes: int, end_minutes: int, band: Tuple[int, int]) -> bool:
+    return start_minutes < band[1] and end_minutes > band[0]
+
+def _build_slot_table() -> Tuple[SlotInfo, ...]:
+    slots = []
+    for day_index, day in enumerate(DAYS):
+        for period in range(1, PERIODS_PER_DAY + 1):
+            start_time, end_time = PERIOD_TIMES[period - 1]
+            start_minutes, end_minutes = time_to_minutes(start_time), time_to_minutes(end_time)
+            slots.append(SlotInfo(
+                slot_id=len(slots),
+                day=day,
+                day_index=day_index,
+                period=period,
+                start_time=start_time,
+                end_time=end_time,
+                start_minutes=start_minutes,
+                end_minutes=end_minutes,
+                is_prayer=_in_prayer_time(day, start_minutes, end_minutes),
+                is_early=_in_band(start_minutes, end_minutes, EARLY_BAND_MINUTES),
+                is_late=_in_band(start_minutes, end_minutes, LATE_BAND_MINUTES),
+                is_weekend=day in ("Saturday", "Sunday")
+            ))
+    return tuple(slots)
+
+# Immutable slot grid built once at import; hot paths work on slot IDs from here
+PERIOD_TIMES = tuple(_compute_period_times(period) for period in range(1, PERIODS_PER_DAY + 1))
+SLOT_TABLE = _build_slot_table()
+SLOT_INDEX = {(slot.day, slot.start_time, slot.end_time): slot.slot_id for slot in SLOT_TABLE}
+TEACHING_SLOTS = tuple(slot.slot_id for slot in SLOT_TABLE if not slot.is_weekend and not slot.is_prayer)
+
+def schedule_span(day: str, start_time, end_time) -> Tuple[Optional[int], str, int, int]:
+    """
+    (slot_id, day, start_minutes, end_minutes) of a class. Classes on the
+    period grid are looked up in SLOT_INDEX; slot_id is None for off-grid times.
+    """
+    slot_id = SLOT_INDEX.get((day, start_time, end_time))
+    if slot_id is not None:
+        slot = SLOT_TABLE[slot_id]
+        return slot_id, day, slot.start_minutes, slot.end_minutes
+    return None, day, time_to_minutes(start_time), time_to_minutes(end_time)
+
+def spans_overlap(span1, span2) -> bool:
+    if span1[0] is not None and span2[0] is not None:
+        return span1[0] == span2[0]
+    return span1[1] == span2[1] and minutes_overlap(span1[2], span1[3], span2[2], span2[3])
+
+def span_in_prayer_time(span) -> bool:
+    if span[0] is not None:
+        return SLOT_TABLE[span[0]].is_prayer
+    return _in_prayer_time(span[1], span[2], span[3])
+
+def span_hits_slots(span, slot_ids) -> bool:
+    """Whether a class overlaps any of the given grid slots"""
+    if not slot_ids:
+        return False
+    if span[0] is not None:
+        return span[0] in slot_ids
+    return any(
+        spans_overlap(span, (slot_id, SLOT_TABLE[slot_id].day, SLOT_TABLE[slot_id].start_minutes,
+                             SLOT_TABLE[slot_id].end_minutes))
+        for slot_id in slot_ids
+    )
+
+def span_is_early(span) -> bool:
+    if span[0] is not None:
+        return SLOT_TABLE[span[0]].is_early
+    return _in_band(span[2], span[3], EARLY_BAND_MINUTES)
+
+def span_is_late(span) -> bool:
+    if span[0] is not None:
+        return SLOT_TABLE[span[0]].is_late
+    return _in_band(span[2], span[3], LATE_BAND_MINUTES)
+
 @dataclass
 class Conflict:
     type: str
@@ -124,6 +334,152 @@ class Conflict:
     constraint_value: Optional[str] = None  # Added to fix constructor error
     severity: str = 'hard'
 
+# Spellings found in the constraints table, folded to one rule kind
+CONSTRAINT_KIND_ALIASES = {
+    "AVIOD_EARLY_MORNING_CLASS": "AVOID_EARLY_MORNING_CLASS",
+    "PRAYER_TIME": "PRAYER_TIME_FRIDAY",
+}
+TIME_WINDOW_KINDS = ("AVOID_EARLY_MORNING_CLASS", "AVOID_LATE_NIGHT_CLASS",
+                     "PRAYER_TIME_FRIDAY", "EVENING_LECTURES_IN_AC_ROOMS")
+
+@dataclass(frozen=True)
+class CompiledConstraint:
+    """A Constraint row with its type normalized and its value parsed once"""
+    position: int  # row order in the constraints table, kept for conflict ordering
+    constraint_id: str
+    kind: str
+    course_id: Optional[str] = None
+    lecturer_id: Optional[str] = None
+    room_id: Optional[str] = None
+    days: FrozenSet[str] = frozenset()  # NO_WEEKEND_CLASSES
+    window: Optional[Tuple[int, int]] = None  # time-window kinds, minutes since midnight
+    window_text: Tuple[str, str] = ("", "")  # the window as written, for conflict descriptions
+    rest_minutes: Optional[int] = None  # AVOID_CONSECUTIVE_LECTURES
+
+    def applies_to(self, course_id: str, lecturer_id: str, room_id: str) -> bool:
+        return ((self.course_id is None or self.course_id == course_id) and
+                (self.lecturer_id is None or self.lecturer_id == lecturer_id) and
+                (self.room_id is None or self.room_id == room_id))
+
+class ConstraintIndex:
+    """
+    Compiled constraints indexed by their most specific scope (course, then
+    lecturer, then room), so an item only looks at rules that can apply to it.
+    """
+    def __init__(self, rules: List[CompiledConstraint]):
+        self.rules = rules
+        self.by_course = defaultdict(list)
+        self.by_lecturer = defaultdict(list)
+        self.by_room = defaultdict(list)
+        self.unscoped = []
+        for rule in rules:
+            if rule.course_id is not None:
+                self.by_course[rule.course_id].append(rule)
+            elif rule.lecturer_id is not None:
+                self.by_lecturer[rule.lecturer_id].append(rule)
+            elif rule.room_id is not None:
+                self.by_room[rule.room_id].append(rule)
+            else:
+                self.unscoped.append(rule)
+        self._cache = {}
+
+    def __len__(self):
+        return len(self.rules)
+
+    def rules_for(self, course_id: str, lecturer_id: str, room_id: str) -> Tuple[CompiledConstraint, ...]:
+        """Rules matching an item, in constraints-table order"""
+        key = (course_id, lecturer_id, room_id)
+        rules = self._cache.get(key)
+        if rules is None:
+            candidates = (self.by_course.get(course_id, []) + self.by_lecturer.get(lecturer_id, []) +
+                          self.by_room.get(room_id, []) + self.unscoped)
+            rules = tuple(sorted(
+                (rule for rule in candidates if rule.applies_to(course_id, lecturer_id, room_id)),
+                key=lambda rule: rule.position
+            ))
+            self._cache[key] = rules
+        return rules
+
+def compile_constraints(constraints) -> ConstraintIndex:
+    """Parse Constraint rows (or their snapshots) into a ConstraintIndex. Malformed rows are skipped."""
+    rules = []
+    for position, constraint in enumerate(constraints):
+        kind = (constraint.constraint_type or "").upper()
+        kind = CONSTRAINT_KIND_ALIASES.get(kind, kind)
+        value = constraint.constraint_value or ""
+        fields = dict(
+            position=position,
+            constraint_id=constraint.constraint_id,
+            kind=kind,
+            course_id=getattr(constraint, 'course_id', None),
+            lecturer_id=getattr(constraint, 'lecturer_id', None),
+            room_id=getattr(constraint, 'room_id', None)
+        )
+        try:
+            if kind == "NO_WEEKEND_CLASSES":
+                fields['days'] = frozenset(day.strip() for day in value.split('&'))
+            elif kind in TIME_WINDOW_KINDS:
+                window_start, window_end = value.split('-')
+                fields['window'] = (time_to_minutes(window_start.strip()), time_to_minutes(window_end.strip()))
+                fields['window_text'] = (window_start, window_end)
+            elif kind == "AVOID_CONSECUTIVE_LECTURES":
+                fields['rest_minutes'] = int(value)
+            else:
+                continue
+        except ValueError:
+            print(f"Warning: Skipping constraint {constraint.constraint_id}: "
+                  f"cannot parse {constraint.constraint_type} value '{value}'")
+            continue
+        rules.append(CompiledConstraint(**fields))
+    return ConstraintIndex(rules)
+
+# Integer type used for every gene array of an ArrayChromosome
+GENE_DTYPE = np.int16
+
+@dataclass
+class CandidateRooms:
+    """Feasible rooms of one course, each tuple sorted by how closely capacity fits"""
+    buffered: Tuple[str, ...]    # capacity >= students * 1.1, lab courses only in LAB rooms
+    fitting: Tuple[str, ...]     # capacity >= students, lab courses only in LAB rooms
+    sufficient: Tuple[str, ...]  # capacity >= students, any room type
+    lab: Tuple[str, ...]         # LAB rooms with capacity >= students
+    is_lab_course: bool
+    is_lettered_course: bool
+
+@dataclass
+class GenomeTables:
+    """Lookup tables that translate gene indices back to database entities.
+
+    Built once per generator. Every course contributes one gene per required
+    session, so the gene layout (``gene_course``) is identical for all
+    chromosomes of a run.
+    """
+    course_ids: List[str]
+    room_ids: List[str]
+    lecturer_ids: List[str]
+    group_ids: List[str]
+    gene_course: np.ndarray       # course index of each gene
+    course_lecturer: np.ndarray   # lecturer index of each course
+    course_group: np.ndarray      # student group index of each course
+    course_students: np.ndarray
+    course_is_lab: np.ndarray
+    room_capacity: np.ndarray
+    room_is_lab: np.ndarray
+    slot_is_prayer: np.ndarray    # [day, period] -> overlaps Friday prayer time
+    period_is_early: np.ndarray   # period overlaps 8:30-10:00 (SC1)
+    period_is_late: np.ndarray    # period overlaps 16:00-18:30 (SC2)
+    course_hash: np.ndarray       # random 64-bit value per course, for multiset hashing
+    gene_lecturer: np.ndarray     # lecturer index of each gene
+    gene_group: np.ndarray        # student group index of each gene
+    valid_slots: List[Tuple[int, int]]  # weekday (day, period) pairs outside prayer time
+    course_buffered_rooms: List[np.ndarray]    # room indices of CandidateRooms.buffered per course
+    course_sufficient_rooms: List[np.ndarray]  # room indices of CandidateRooms.sufficient per course
+    room_reserved: np.ndarray      # [room, day, period] -> slot held by another timetable
+    lecturer_reserved: np.ndarray  # [lecturer, day, period] -> slot held by another timetable
+    course_domain: Optional[np.ndarray] = None       # [course, room, day, period] -> placement left by presolve_domains
+    course_domain_cells: Optional[List[np.ndarray]] = None  # flat [room, day, period] indices of course_domain per course
+    infeasibilities: Optional[List[str]] = None  # proven by presolve_domains, with course_domain
+
 class Chromosome:
     def __init__(self, schedule_items: List[ScheduleItem] = None):
         self.schedule_items = schedule_items or []
@@ -132,20 +488,722 @@ class Chromosome:
         self.hard_violations = 0
         self.soft_violations = 0
         self.conflicts = []  # Now using Conflict objects instead of strings
+        # (crossover type or None, mutation type or None, parent fitness) until adaptive control credits it
+        self.origin = None
+        # Indices of items this chromosome may edit in place. Any other item
+        # can be shared with copies or parents and is cloned on first write.
+        self._owned = set()
         
     
     def copy(self):
-        new_chromosome = Chromosome(copy.deepcopy(self.schedule_items))
+        # Copy-on-write: share the ScheduleItems, clone them in item_for_write
+        new_chromosome = Chromosome(list(self.schedule_items))
+        new_chromosome.fitness = self.fitness
+        new_chromosome.hard_violations = self.hard_violations
+        new_chromosome.soft_violations = self.soft_violations
+        # calculate_fitness rebuilds conflicts into a new list, so sharing is safe
+        new_chromosome.conflicts = self.conflicts
+        self._owned = set()  # Our items are now shared with the copy
+        return new_chromosome
+
+    def item_for_write(self, index: int) -> ScheduleItem:
+        """Return schedule item ``index`` for modification, cloning it if it may be shared"""
+        if index not in self._owned:
+            self.schedule_items[index] = copy.copy(self.schedule_items[index])
+            self._owned.add(index)
+        return self.schedule_items[index]
+
+    def own_items(self):
+        """Clone every possibly shared item, so items can be edited through any reference"""
+        for index in range(len(self.schedule_items)):
+            self.item_for_write(index)
+
+    def genome_key(self) -> frozenset:
+        """Hashable key equal for chromosomes with the same placements, in any item order"""
+        return frozenset(Counter(
+            (item.course_id, item.lecturer_id, item.room_id, item.day, item.start_time, item.end_time)
+            for item in self.schedule_items
+        ).items())
+
+class ArrayChromosome:
+    """Integer-encoded chromosome: one entry per gene in each NumPy array.
+
+    ``course_idx`` follows the fixed gene layout of the run and is shared
+    between copies; room, day and period indices are owned by each chromosome.
+    Periods are zero-based here (``period_to_time`` expects ``period + 1``).
+    """
+    def __init__(self, course_idx: np.ndarray, room_idx: np.ndarray,
+                 day_idx: np.ndarray, period_idx: np.ndarray):
+        self.course_idx = course_idx
+        self.room_idx = room_idx
+        self.day_idx = day_idx
+        self.period_idx = period_idx
+        self.fitness = 0.0
+        self.hard_violations = 0
+        self.soft_violations = 0
+        self.conflicts = []
+        self.state = None  # FitnessState, only kept while genes change through move_gene
+        self.origin = None  # As Chromosome.origin
+
+    def __len__(self):
+        return len(self.course_idx)
+
+    def copy(self):
+        new_chromosome = ArrayChromosome(
+            self.course_idx,
+            self.room_idx.copy(),
+            self.day_idx.copy(),
+            self.period_idx.copy()
+        )
         new_chromosome.fitness = self.fitness
         new_chromosome.hard_violations = self.hard_violations
         new_chromosome.soft_violations = self.soft_violations
-        new_chromosome.conflicts = copy.deepcopy(self.conflicts)
+        new_chromosome.conflicts = self.conflicts
+        new_chromosome.state = self.state.copy() if self.state is not None else None
         return new_chromosome
 
+    def genome_key(self) -> bytes:
+        """Hashable key equal for chromosomes with the same placements (the gene layout is fixed)"""
+        return self.room_idx.tobytes() + self.day_idx.tobytes() + self.period_idx.tobytes()
+
+class FitnessState:
+    """
+    Occupancy counters and penalty subtotals of an ArrayChromosome, so a
+    single-gene move can be re-scored without a full evaluation.
+
+    ``flag_counts[f, course]`` counts genes of a course hit by per-gene check f
+    (see GENE_FLAGS) and ``slot_counts`` counts genes per (day, period) slot.
+    For room, lecturer and student group overlaps, ``cells`` maps each
+    occupied (resource, slot) cell to its {gene: course} bucket and
+    ``overlap_keys`` maps each penalised conflict key to the genes producing it.
+    """
+    def __init__(self, flag_counts: np.ndarray, slot_counts: np.ndarray, cells: List[Dict[tuple, Dict[int, int]]],
+                 overlap_keys: List[Dict[tuple, Set[int]]]):
+        self.flag_counts = flag_counts
+        self.slot_counts = slot_counts
+        self.cells = cells
+        self.overlap_keys = overlap_keys
+
+    def copy(self):
+        return FitnessState(
+            self.flag_counts.copy(),
+            self.slot_counts.copy(),
+            [{cell: dict(genes) for cell, genes in cells.items()} for cells in self.cells],
+            [{key: set(genes) for key, genes in keys.items()} for keys in self.overlap_keys]
+        )
+
+# Per-gene checks tracked by FitnessState, with their penalties
+GENE_FLAGS = ("HC3", "HC4", "HC13", "HC2R", "HC1R", "SC4", "SC1", "SC2")
+GENE_FLAG_HARD_PENALTIES = (10000, 50000, 50000, 10000, 10000)
+GENE_FLAG_SOFT_PENALTIES = (1, 0.5, 0.5)
+
+def _gene_flags(tables: GenomeTables, course, room, day, period) -> np.ndarray:
+    """Per-gene check results in GENE_FLAGS order; works on scalars or arrays"""
+    return np.array([
+        tables.room_capacity[room] < tables.course_students[course],
+        tables.course_is_lab[course] & ~tables.room_is_lab[room],
+        tables.slot_is_prayer[day, period],
+        tables.room_reserved[room, day, period],
+        tables.lecturer_reserved[tables.course_lecturer[course], day, period],
+        np.asarray(day) >= 5,
+        tables.period_is_early[period],
+        tables.period_is_late[period],
+    ], dtype=bool)
+
+def _cell_conflict_keys(genes: Dict[int, int]) -> Dict[tuple, List[int]]:
+    """
+    Conflict keys calculate_fitness penalises for the {gene: course} booked in
+    one cell, each with the genes producing it: a gene's key is the course
+    multiset of its cell with its own course counted once.
+    """
+    counts = Counter(genes.values())
+    if len(counts) < 2:
+        return {}
+    own_key = {
+        own_course: tuple(sorted((co, 1 if co == own_course else n) for co, n in counts.items()))
+        for own_course in counts
+    }
+    keys = defaultdict(list)
+    for gene, course in genes.items():
+        keys[own_key[course]].append(gene)
+    return keys
+
+def _unkey_cell(keys: Dict[tuple, Set[int]], genes: Dict[int, int]):
+    for key, key_genes in _cell_conflict_keys(genes).items():
+        keys[key].difference_update(key_genes)
+        if not keys[key]:
+            del keys[key]
+
+def _key_cell(keys: Dict[tuple, Set[int]], genes: Dict[int, int]):
+    for key, key_genes in _cell_conflict_keys(genes).items():
+        keys.setdefault(key, set()).update(key_genes)
+
+def _count_merged_conflicts(keys: Dict[tuple, Set[int]]) -> int:
+    """
+    Number of conflicts calculate_fitness reports for these keys. It meets
+    each key at its first gene and _add_conflict merges it into the first
+    earlier conflict sharing a course, so the merge is replayed in that order.
+    """
+    conflicts = []
+    for key in sorted(keys, key=lambda key: min(keys[key])):
+        courses = {co for co, _ in key}
+        for conflict in conflicts:
+            if conflict & courses:
+                conflict |= courses
+                break
+        else:
+            conflicts.append(courses)
+    return len(conflicts)
+
+def _overlap_penalties(row: np.ndarray, resource: np.ndarray, slot: np.ndarray, course: np.ndarray,
+                       course_hash: np.ndarray, n_pop: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Overlap penalties per chromosome for one resource type (room, lecturer or
+    student group), as counted by calculate_fitness.
+
+    Genes are binned into (chromosome, resource, day, period) cells. A gene in a
+    cell holding more than one distinct course is penalised under the key "course
+    multiset of its cell, own course counted once", and keys are deduplicated per
+    chromosome. Multisets are compared through additive 64-bit course hashes.
+    Returns (penalised keys, merged conflicts) arrays of shape (n_pop,).
+    """
+    n_slots = len(DAYS) * PERIODS_PER_DAY
+    n_courses = len(course_hash)
+    n_resources = int(resource.max()) + 1
+    cell = ((row * n_resources + resource) * n_slots + slot).ravel()
+    course = course.ravel()
+    row = row.ravel()
+
+    pairs, pair_of_gene, pair_counts = np.unique(cell * n_courses + course, return_inverse=True, return_counts=True)
+    cells, cell_of_pair, distinct_courses = np.unique(pairs // n_courses, return_inverse=True, return_counts=True)
+    cell_of_gene = cell_of_pair[pair_of_gene]
+    genes = np.flatnonzero(distinct_courses[cell_of_gene] > 1)
+    if not len(genes):
+        return np.zeros(n_pop, dtype=np.int64), np.zeros(n_pop, dtype=np.int64)
+
+    gene_cells = cell_of_gene[genes]
+    gene_hash = course_hash[course[genes]]
+    cell_hash = np.zeros(len(cells), dtype=np.uint64)
+    np.add.at(cell_hash, gene_cells, gene_hash)
+    own_count = pair_counts[pair_of_gene[genes]].astype(np.uint64)
+    key = cell_hash[gene_cells] - (own_count - np.uint64(1)) * gene_hash
+    keys = np.unique(np.stack([row[genes], key.view(np.int64)], axis=1), axis=0)
+    penalised = np.bincount(keys[:, 0], minlength=n_pop)
+
+    # _add_conflict merges conflicts that share a course: count connected
+    # components of courses linked through clashing cells
+    nodes, node_of_gene = np.unique(row[genes] * n_courses + course[genes], return_inverse=True)
+    label = np.arange(len(nodes))
+    while True:
+        cell_label = np.full(len(cells), len(nodes))
+        np.minimum.at(cell_label, gene_cells, label[node_of_gene])
+        new_label = label.copy()
+        np.minimum.at(new_label, node_of_gene, cell_label[gene_cells])
+        new_label = new_label[new_label]
+        if np.array_equal(new_label, label):
+            break
+        label = new_label
+    merged = np.bincount(nodes[np.unique(label)] // n_courses, minlength=n_pop)
+    return penalised, merged
+
+def evaluate_population_vectorized(tables: GenomeTables, course_idx: np.ndarray, room_idx: np.ndarray,
+                                   day_idx: np.ndarray, period_idx: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    NumPy evaluation of a whole population of integer-encoded schedules.
+
+    ``room_idx``, ``day_idx`` and ``period_idx`` are (population, genes) arrays
+    and ``course_idx`` is the shared gene layout. Returns (fitness,
+    hard_violations, soft_violations) arrays with the same penalties as
+    TimetableGenerator.calculate_fitness. The gene layout always holds every
+    required session and the lecturer comes from the course, so HC7, HC8, HC9
+    and over-scheduling cannot occur and are not checked. Violation counts
+    follow the loop's conflict merging, but can come out slightly lower when
+    overlaps chain across many courses. No Conflict objects are built.
+    """
+    room_idx = np.atleast_2d(room_idx)
+    day_idx = np.atleast_2d(day_idx)
+    period_idx = np.atleast_2d(period_idx)
+    n_pop, n_genes = room_idx.shape
+    n_courses = len(tables.course_ids)
+    course = np.broadcast_to(course_idx, (n_pop, n_genes)).astype(np.int64)
+    row = np.broadcast_to(np.arange(n_pop, dtype=np.int64)[:, None], (n_pop, n_genes))
+    slot = day_idx.astype(np.int64) * PERIODS_PER_DAY + period_idx
+
+    def distinct_courses(flagged):
+        # Conflicts for single items are merged per course by _add_conflict
+        seen = np.bincount((row * n_courses + course)[flagged], minlength=n_pop * n_courses)
+        return np.count_nonzero(seen.reshape(n_pop, n_courses), axis=1)
+
+    students = tables.course_students[course]
+    capacity = tables.room_capacity[room_idx]
+    hard_penalty = np.zeros(n_pop, dtype=np.int64)
+    hard_violations = np.zeros(n_pop, dtype=np.int64)
+    # Per-gene hard checks: HC3 room capacity, HC4 lab room, HC13 Friday prayer,
+    # and room (HC2) or lecturer (HC1) slots reserved by other timetables
+    for flagged, penalty in (
+        (capacity < students, 10000),
+        (tables.course_is_lab[course] & ~tables.room_is_lab[room_idx], 50000),
+        (tables.slot_is_prayer[day_idx, period_idx], 50000),
+        (tables.room_reserved[room_idx, day_idx, period_idx], 10000),
+        (tables.lecturer_reserved[tables.course_lecturer[course], day_idx, period_idx], 10000),
+    ):
+        hard_penalty += penalty * np.count_nonzero(flagged, axis=1)
+        hard_violations += distinct_courses(flagged)
+
+    # HC2 room, HC1 lecturer and HC5 student group overlaps
+    for resource in (room_idx.astype(np.int64), tables.course_lecturer[course], tables.course_group[course]):
+        penalised, merged = _overlap_penalties(row, resource.astype(np.int64), slot, course,
+                                               tables.course_hash, n_pop)
+        hard_penalty += 10000 * penalised
+        hard_violations += merged
+
+    # SC4 weekend, SC1 early morning and SC2 late evening classes
+    weekend = day_idx >= 5
+    early = tables.period_is_early[period_idx]
+    late = tables.period_is_late[period_idx]
+    soft_penalty = 1.0 * np.count_nonzero(weekend, axis=1) + 0.5 * np.count_nonzero(early, axis=1) + \
+        0.5 * np.count_nonzero(late, axis=1)
+    soft_violations = distinct_courses(weekend) + distinct_courses(early) + distinct_courses(late)
+
+    # Penalize low timeslot utilization
+    n_slots = len(DAYS) * PERIODS_PER_DAY
+    used_slots = np.bincount(np.unique(row * n_slots + slot) // n_slots, minlength=n_pop)
+    soft_penalty += (1 - used_slots / (PERIODS_PER_DAY * 5)) * 5
+
+    fitness = np.where(hard_penalty > 0, 1 / (1 + hard_penalty), 1 + (1 / (1 + soft_penalty)))
+    return fitness, hard_violations, soft_violations
+
+def evaluate_genome_vectorized(tables: GenomeTables, course_idx: np.ndarray, room_idx: np.ndarray,
+                               day_idx: np.ndarray, period_idx: np.ndarray) -> Tuple[float, int, int]:
+    """Single-chromosome form of evaluate_population_vectorized"""
+    fitness, hard_violations, soft_violations = evaluate_population_vectorized(
+        tables, course_idx, room_idx[None, :], day_idx[None, :], period_idx[None, :]
+    )
+    return float(fitness[0]), int(hard_violations[0]), int(soft_violations[0])
+
+def presolve_domains(tables: GenomeTables) -> Tuple[np.ndarray, List[str]]:
+    """
+    Hard-constraint pre-solve of the array genome's problem. The domain of a
+    course holds the (room, day, period) placements free of per-gene hard
+    violations: a large enough room (HC3), a lab for lab courses (HC4), a
+    weekday slot outside Friday prayer (HC13), and a room and lecturer not
+    held by another timetable (HC2/HC1). Domains are then made arc
+    consistent on the lecturer, student group and room resources: a course
+    left with one slot removes that slot from the other courses of its
+    lecturer and student group, and with one placement also from every other
+    course in that room. Distinct courses sharing a resource need distinct
+    slots (sessions of one course may share a slot, as in calculate_fitness),
+    so more courses than placements left is proven infeasible.
+    Returns (domain [course, room, day, period], proven infeasibilities).
+    """
+    n_courses = len(tables.course_ids)
+    room_ok = (tables.room_capacity[None, :] >= tables.course_students[:, None]) & \
+        (tables.room_is_lab[None, :] | ~tables.course_is_lab[:, None])
+    slot_ok = np.zeros((len(DAYS), PERIODS_PER_DAY), dtype=bool)
+    for day, period in tables.valid_slots:
+        slot_ok[day, period] = True
+    lecturer_free = slot_ok[None] & ~tables.lecturer_reserved[tables.course_lecturer]
+    domain = room_ok[:, :, None, None] & lecturer_free[:, None] & ~tables.room_reserved[None]
+
+    infeasibilities = []
+    empty = ~domain.reshape(n_courses, -1).any(axis=1)
+    for c in np.flatnonzero(empty):
+        course_id = tables.course_ids[c]
+        if not room_ok[c].any():
+            room_kind = "lab room" if tables.course_is_lab[c] else "room"
+            infeasibilities.append(f"Course {course_id}: no {room_kind} holds its {tables.course_students[c]} students")
+        elif not lecturer_free[c].any():
+            infeasibilities.append(f"Course {course_id}: lecturer {tables.lecturer_ids[tables.course_lecturer[c]]} "
+                                   f"has no teaching slot left")
+        else:
+            infeasibilities.append(f"Course {course_id}: every suitable room is taken when its lecturer is free")
+
+    # Arc consistency: propagate courses fixed to a single slot or placement
+    course_resources = (tables.course_lecturer, tables.course_group)
+    changed = True
+    while changed:
+        changed = False
+        slots = domain.any(axis=1)
+        for c in np.flatnonzero(slots.reshape(n_courses, -1).sum(axis=1) == 1):
+            day, period = np.argwhere(slots[c])[0]
+            for course_resource in course_resources:
+                others = np.flatnonzero(course_resource == course_resource[c])
+                others = others[(others != c) & domain[others, :, day, period].any(axis=1)]
+                if len(others):
+                    domain[others, :, day, period] = False
+                    changed = True
+            rooms = np.flatnonzero(domain[c, :, day, period])
+            if len(rooms) == 1:
+                others = np.flatnonzero(domain[:, rooms[0], day, period])
+                others = others[others != c]
+                if len(others):
+                    domain[others, rooms[0], day, period] = False
+                    changed = True
+    placed = domain.reshape(n_courses, -1).any(axis=1)
+    for c in np.flatnonzero(~empty & ~placed):
+        infeasibilities.append(f"Course {tables.course_ids[c]}: no placement left once courses fixed "
+                               f"to a single slot take theirs")
+
+    # Pigeonhole, on the courses not reported above: courses sharing a
+    # lecturer or student group need one slot each
+    slots = domain.any(axis=1).reshape(n_courses, -1)
+    for label, resource_ids, course_resource in (("Lecturer", tables.lecturer_ids, tables.course_lecturer),
+                                                 ("Student group", tables.group_ids, tables.course_group)):
+        for resource in np.unique(course_resource):
+            courses = np.flatnonzero((course_resource == resource) & placed)
+            n_slots = np.count_nonzero(slots[courses].any(axis=0))
+            if len(courses) > 1 and len(courses) > n_slots:
+                infeasibilities.append(f"{label} {resource_ids[resource]}: {len(courses)} courses "
+                                       f"but only {n_slots} slots left for them")
+    # ... and courses that only fit a set of rooms need one placement each in it
+    cells = domain.reshape(n_courses, -1)
+    for rooms in np.unique(room_ok[room_ok.any(axis=1)], axis=0):
+        courses = np.flatnonzero(~(room_ok & ~rooms).any(axis=1) & placed)
+        n_cells = np.count_nonzero(cells[courses].any(axis=0))
+        if len(courses) > n_cells:
+            room_ids = [tables.room_ids[r] for r in np.flatnonzero(rooms)]
+            infeasibilities.append(f"Rooms {', '.join(room_ids[:5])}{' ...' if len(room_ids) > 5 else ''}: "
+                                   f"{len(courses)} courses fit only these but {n_cells} placements are left")
+    return domain, infeasibilities
+
+def build_fitness_state(tables: GenomeTables, chromosome: ArrayChromosome) -> FitnessState:
+    """Compute the FitnessState of a chromosome from scratch"""
+    n_courses = len(tables.course_ids)
+    flags = _gene_flags(tables, chromosome.course_idx, chromosome.room_idx, chromosome.day_idx, chromosome.period_idx)
+    flag_counts = np.stack([np.bincount(chromosome.course_idx, weights=f, minlength=n_courses) for f in flags]).astype(np.int64) \
+        if len(chromosome) else np.zeros((len(GENE_FLAGS), n_courses), dtype=np.int64)
+    slot = chromosome.day_idx.astype(np.int64) * PERIODS_PER_DAY + chromosome.period_idx
+    slot_counts = np.bincount(slot, minlength=len(DAYS) * PERIODS_PER_DAY)
+
+    all_cells, overlap_keys = [], []
+    course_idx = chromosome.course_idx.tolist()
+    for resource in (chromosome.room_idx, tables.gene_lecturer, tables.gene_group):
+        cells = {}
+        for gene, (gene_resource, gene_slot, course) in enumerate(zip(resource.tolist(), slot.tolist(), course_idx)):
+            cells.setdefault((gene_resource, gene_slot), {})[gene] = course
+        keys = {}
+        for genes in cells.values():
+            _key_cell(keys, genes)
+        all_cells.append(cells)
+        overlap_keys.append(keys)
+    return FitnessState(flag_counts, slot_counts, all_cells, overlap_keys)
+
+def fitness_state_penalties(state: FitnessState) -> Tuple[float, float]:
+    """(hard, soft) constraint penalties from FitnessState subtotals"""
+    totals = state.flag_counts.sum(axis=1).tolist()
+    n_hard = len(GENE_FLAG_HARD_PENALTIES)
+    hard_penalty = sum(penalty * total for penalty, total in zip(GENE_FLAG_HARD_PENALTIES, totals))
+    hard_penalty += 10000 * sum(len(keys) for keys in state.overlap_keys)
+    weekend, early, late = totals[n_hard:]
+    soft_penalty = 1.0 * weekend + 0.5 * early + 0.5 * late
+    soft_penalty += (1 - np.count_nonzero(state.slot_counts) / (PERIODS_PER_DAY * 5)) * 5
+    return hard_penalty, soft_penalty
+
+def score_fitness_state(state: FitnessState) -> Tuple[float, int, int]:
+    """(fitness, hard_violations, soft_violations) from FitnessState subtotals"""
+    hard_penalty, soft_penalty = fitness_state_penalties(state)
+    distinct_courses = np.count_nonzero(state.flag_counts, axis=1).tolist()
+    n_hard = len(GENE_FLAG_HARD_PENALTIES)
+    hard_violations = sum(distinct_courses[:n_hard]) + sum(_count_merged_conflicts(keys) for keys in state.overlap_keys)
+    soft_violations = sum(distinct_courses[n_hard:])
+
+    if hard_penalty > 0:
+        fitness = 1 / (1 + hard_penalty)
+    else:
+        fitness = 1 + (1 / (1 + soft_penalty))
+    return fitness, hard_violations, soft_violations
+
+def _overlap_key_delta(keys: Dict[tuple, Set[int]], leaving: Dict[int, int], entering: Dict[int, int],
+                       gene: int, course: int) -> int:
+    """Change in the number of distinct conflict keys if ``gene`` left one cell's genes for another's"""
+    change = Counter()
+    for genes, sign in ((leaving, -1), ({g: co for g, co in leaving.items() if g != gene}, 1),
+                        (entering, -1), ({**entering, gene: course}, 1)):
+        for key, key_genes in _cell_conflict_keys(genes).items():
+            change[key] += sign * len(key_genes)
+    return sum((len(keys.get(key, ())) + n > 0) - (key in keys) for key, n in change.items() if n)
+
+def stack_population(population: List[ArrayChromosome]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Stack ArrayChromosomes into (population, genes) room, day and period arrays"""
+    return (
+        np.stack([chromosome.room_idx for chromosome in population]),
+        np.stack([chromosome.day_idx for chromosome in population]),
+        np.stack([chromosome.period_idx for chromosome in population])
+    )
+
+def mean_pairwise_hamming(slots: np.ndarray) -> float:
+    """
+    Mean number of genes at which two rows of a (population, genes) slot
+    matrix differ, over all pairs, from the per-gene counts of equal values
+    """
+    n_pop, n_genes = slots.shape
+    if n_pop < 2:
+        return 0.0
+    values = slots.astype(np.int64) + 1  # -1 marks a missing session
+    cells = np.arange(n_genes, dtype=np.int64) * (int(values.max()) + 1) + values
+    _, counts = np.unique(cells, return_counts=True)
+    agreeing_pairs = int((counts * (counts - 1) // 2).sum())
+    return n_genes - agreeing_pairs / (n_pop * (n_pop - 1) // 2)
+
+@dataclass
+class ProblemData:
+    """
+    Picklable snapshot of the static scheduling problem. Entities are plain
+    SimpleNamespace records carrying the same attributes as the ORM objects,
+    so they can be sent to worker processes without a database session.
+    """
+    semester: str
+    year: Optional[int]
+    lecturers: Dict[str, SimpleNamespace]
+    courses: Dict[str, SimpleNamespace]
+    rooms: Dict[str, SimpleNamespace]
+    constraints: List[SimpleNamespace]
+    course_lecturer_mapping: Dict[str, str]
+    reserved: Optional['ReservedSlots'] = None
+
+@dataclass
+class ReservedSlots:
+    """
+    Grid slots (SLOT_TABLE IDs) that rooms and lecturers spend on other
+    timetables, e.g. the other years of the semester. Classes booked into
+    them are penalised like room (HC2) and lecturer (HC1) overlaps.
+    """
+    rooms: Dict[str, Set[int]] = field(default_factory=dict)
+    lecturers: Dict[str, Set[int]] = field(default_factory=dict)
+
+# Non-column attributes the generator attaches to or reads from ORM objects
+SNAPSHOT_EXTRA_ATTRIBUTES = ('sessions_count', 'student_group', 'lecturer_id', 'courses', 'has_ac')
+
+def _snapshot_record(obj) -> SimpleNamespace:
+    """Copy column values and generator-specific attributes of an ORM object"""
+    if isinstance(obj, SimpleNamespace):
+        return SimpleNamespace(**vars(obj))
+    values = {column.key: getattr(obj, column.key) for column in obj.__table__.columns}
+    for attribute in SNAPSHOT_EXTRA_ATTRIBUTES:
+        if attribute in obj.__dict__:
+            values[attribute] = copy.copy(obj.__dict__[attribute])
+    return SimpleNamespace(**values)
+
+# Per-process generator used by the evaluation pool, set up by _init_evaluation_worker
+_worker_generator = None
+
+def _init_evaluation_worker(problem: ProblemData, genome_tables: GenomeTables, fitness_evaluator: str):
+    """Pool initializer: receive the static problem once per worker process"""
+    global _worker_generator
+    # The parent's tables, so gene indices mean the same thing on both sides
+    _worker_generator = TimetableGenerator(
+        db=None,
+        semester=problem.semester,
+        year=problem.year,
+        fitness_evaluator=fitness_evaluator,
+        problem=problem,
+        genome_tables=genome_tables
+    )
+
+def _evaluate_chunk(genomes) -> List[Tuple[float, int, int]]:
+    """
+    Score a chunk of genomes in a worker process. ``genomes`` is either a
+    (room_idx, day_idx, period_idx) tuple of 2-D arrays or a list of
+    ScheduleItem lists. Returns (fitness, hard_violations, soft_violations) per genome.
+    """
+    generator = _worker_generator
+    if isinstance(genomes, tuple):
+        room_idx, day_idx, period_idx = genomes
+        course_idx = generator.genome_tables.gene_course
+        if generator.fitness_evaluator == "vectorized":
+            fitness, hard_violations, soft_violations = evaluate_population_vectorized(
+                generator.genome_tables, course_idx, room_idx, day_idx, period_idx
+            )
+            return list(zip(fitness.tolist(), hard_violations.tolist(), soft_violations.tolist()))
+        chromosomes = [ArrayChromosome(course_idx, *genes) for genes in zip(room_idx, day_idx, period_idx)]
+    else:
+        chromosomes = [Chromosome(schedule_items) for schedule_items in genomes]
+    
+    results = []
+    for chromosome in chromosomes:
+        fitness = generator.calculate_fitness(chromosome)
+        results.append((fitness, chromosome.hard_violations, chromosome.soft_violations))
+    return results
+
+def _island_worker(problem: ProblemData, genome_tables: GenomeTables, settings: dict, seed: int,
+                   inbox, outbox):
+    """
+    Process body of one island. Waits for (generations, immigrants) on
+    ``inbox``, replaces its worst chromosomes with the immigrants, evolves
+    for that many generations and answers on ``outbox`` with
+    (emigrants, best, generations_run, mean_fitness). ``None`` ends the island.
+    """
+    random.seed(seed)
+    np.random.seed(seed % 2**32)
+    migration_size = settings.pop('migration_size')
+    # Same gene indices as the parent, so array chromosomes can migrate between islands
+    generator = TimetableGenerator(db=None, semester=problem.semester, year=problem.year,
+                                   problem=problem, genome_tables=genome_tables, **settings)
+    generator.initialize_population()
+    generator._distribute_population()
+    generator.evaluate_population()
+
+    while True:
+        message = inbox.get()
+        if message is None:
+            break
+        generations, immigrants = message
+        generator.accept_migrants(immigrants)
+        for _ in range(generations):
+            generator.evolve()
+            generator.evaluate_population()
+            if generator.adaptive:
+                generator.adapt()
+            generator.generations_run += 1
+        ranked = sorted(generator.population, key=lambda c: c.fitness, reverse=True)
+        mean_fitness = sum(c.fitness for c in ranked) / len(ranked)
+        outbox.put(([c.copy() for c in ranked[:migration_size]], ranked[0].copy(), generator.generations_run,
+                    mean_fitness))
+
+CHECKPOINT_VERSION = 1
+
+def _placement(room_id, lecturer_id, day, start_time, end_time) -> dict:
+    """Where and when a session takes place, as reported in schedule diffs"""
+    def clock(t):
+        return t.strftime('%H:%M:%S') if isinstance(t, time) else str(t)
+    return {'room_id': room_id, 'lecturer_id': lecturer_id, 'day': day,
+            'start_time': clock(start_time), 'end_time': clock(end_time)}
+
+def _checkpoint_chromosome(chromosome):
+    """Shallow copy of a chromosome without what is rebuilt after loading a checkpoint"""
+    clone = copy.copy(chromosome)
+    clone.conflicts = []
+    if isinstance(clone, ArrayChromosome):
+        clone.state = None
+    else:
+        # Items shared between chromosomes stay shared when unpickled
+        clone._owned = set()
+    return clone
+
+class AdaptiveOperators:
+    """
+    Probability matching over interchangeable operators. Each operator keeps
+    an exponential moving average of its success rate (offspring fitter than
+    their parent) and is chosen with probability proportional to it, never
+    below ADAPTIVE_MIN_PROBABILITY.
+    """
+    def __init__(self, names):
+        self.names = tuple(names)
+        self.success = dict.fromkeys(self.names, 1.0)  # optimistic, so every operator gets tried
+        self.applied = Counter()
+        self.improved = Counter()
+        self.total_applied = Counter()
+        self.total_improved = Counter()
+
+    def probabilities(self) -> Dict[str, float]:
+        total = sum(self.success.values())
+        share = 1 - ADAPTIVE_MIN_PROBABILITY * len(self.names)
+        return {
+            name: ADAPTIVE_MIN_PROBABILITY + share * (self.success[name] / total if total else 1 / len(self.names))
+            for name in self.names
+        }
+
+    def choose(self) -> str:
+        probabilities = self.probabilities()
+        return random.choices(self.names, weights=[probabilities[name] for name in self.names])[0]
+
+    def record(self, name: str, improved: bool):
+        self.applied[name] += 1
+        self.improved[name] += improved
+
+    def update(self):
+        """Fold the outcomes recorded since the last update into the success rates"""
+        for name in self.names:
+            if self.applied[name]:
+                rate = self.improved[name] / self.applied[name]
+                self.success[name] += ADAPTIVE_DECAY * (rate - self.success[name])
+        self.total_applied.update(self.applied)
+        self.total_improved.update(self.improved)
+        self.applied.clear()
+        self.improved.clear()
+
+    def summary(self) -> Dict[str, dict]:
+        """Probability, applications and success share of each operator over the run"""
+        probabilities = self.probabilities()
+        return {
+            name: {
+                'probability': probabilities[name],
+                'applied': self.total_applied[name],
+                'improved': self.total_improved[name],
+            }
+            for name in self.names
+        }
+
+class FitnessCache:
+    """
+    Bounded LRU cache of evaluation results keyed by genome_key(): fitness,
+    hard and soft violation counts and, with keep_conflicts, the conflict
+    list. Elites and children left unchanged by crossover and mutation are
+    looked up here instead of being evaluated again.
+    """
+    def __init__(self, max_size: int, keep_conflicts: bool = False):
+        self.max_size = max_size
+        self.keep_conflicts = keep_conflicts
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def key(chromosome) -> Hashable:
+        # The whole key, not its hash: a hash collision would hand one genome another's score
+        return chromosome.genome_key()
+
+    def load(self, key: Hashable, chromosome) -> bool:
+        """Copy the cached result for ``key`` onto a chromosome; False on a miss"""
+        entry = self.entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return False
+        self.hits += 1
+        self.entries.move_to_end(key)
+        chromosome.fitness, chromosome.hard_violations, chromosome.soft_violations, conflicts = entry
+        # Conflict lists are rebuilt, never edited, by calculate_fitness, so sharing is safe
+        chromosome.conflicts = conflicts if conflicts is not None else []
+        return True
+
+    def store(self, key: Hashable, chromosome):
+        self.entries[key] = (chromosome.fitness, chromosome.hard_violations, chromosome.soft_violations,
+                             chromosome.conflicts if self.keep_conflicts else None)
+        self.entries.move_to_end(key)
+        if len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            'size': len(self.entries),
+            'max_size': self.max_size,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'evictions': self.evictions,
+        }
+
+class GenerationStopped(Exception):
+    """Raised at the end of a generation once the run's stop_event is set"""
+
 class TimetableGenerator:
     def __init__(self, db: Session, semester: str, year=None, timeslots=None,
              population_size=50, max_generations=100, crossover_rate=0.8,
-             mutation_rate=0.05, elitism_count=5, tournament_size=5):
+             mutation_rate=0.05, elitism_count=5, tournament_size=5,
+             genome_mode="object", fitness_evaluator="loop",
+             parallel_evaluation=False, n_workers=None, delta_evaluation=False,
+             problem: Optional[ProblemData] = None, genome_tables: Optional[GenomeTables] = None,
+             progress_callback: Optional[Callable[[dict], None]] = None,
+             islands=1, migration_interval=10, migration_size=2, migration_topology="ring",
+             reserved: Optional[ReservedSlots] = None,
+             checkpoint_path: Optional[str] = None, checkpoint_interval=25, resume=False,
+             warm_start=False, warm_start_fraction=0.5, warm_start_perturbation=0.05,
+             memetic=False, memetic_elite=1, memetic_steps=10, memetic_neighbours=8, tabu_tenure=7,
+             presolve=True, adaptive=False, guided_mutation=False, crossover_type="block",
+             deduplicate=False, fitness_cache_size=FITNESS_CACHE_SIZE, cache_conflicts=False):
         print(f"Initializing TimetableGenerator for semester: {semester}" + 
             (f" and year: {year}" if year else ""))
         self.db = db
@@ -155,14 +1213,95 @@ class TimetableGenerator:
         self.population_size = population_size
         self.max_generations = max_generations
         self.crossover_rate = crossover_rate
+        if crossover_type not in CROSSOVER_TYPES:
+            raise ValueError(f"crossover_type must be one of {', '.join(CROSSOVER_TYPES)}")
+        self.crossover_type = crossover_type
         self.mutation_rate = mutation_rate
         self.elitism_count = elitism_count
         self.tournament_size = tournament_size
-        self.lecturers = self._load_lecturers()
-        self.courses = self._load_courses(year=year)
-        self.rooms = self._load_rooms()
-        self.constraints = self._load_constraints()
-        self.course_lecturer_mapping = self._create_course_lecturer_mapping()
+        if genome_mode not in ("object", "array"):
+            raise ValueError("genome_mode must be 'object' or 'array'")
+        self.genome_mode = genome_mode
+        if fitness_evaluator not in ("loop", "vectorized"):
+            raise ValueError("fitness_evaluator must be 'loop' or 'vectorized'")
+        self.fitness_evaluator = fitness_evaluator
+        self.parallel_evaluation = parallel_evaluation
+        if delta_evaluation and genome_mode != "array":
+            raise ValueError("delta_evaluation requires genome_mode 'array'")
+        self.delta_evaluation = delta_evaluation
+        self.n_workers = n_workers or multiprocessing.cpu_count()
+        # Called after every generation with the dict built by _report_progress
+        self.progress_callback = progress_callback
+        # Event set from another process or thread to stop the run after the current generation
+        self.stop_event = None
+        self.generations_run = 0
+        self.evolution_started = perf_counter()
+        self.evolution_start_generation = 0
+        # Island model: each island is a process evolving its own population_size chromosomes
+        if migration_topology not in ("ring", "full"):
+            raise ValueError("migration_topology must be 'ring' or 'full'")
+        self.islands = islands
+        self.migration_interval = migration_interval
+        self.migration_size = migration_size
+        self.migration_topology = migration_topology
+        # Checkpoints hold the single population of _run_evolution
+        if checkpoint_path and islands > 1:
+            raise ValueError("checkpoints are not supported with islands")
+        self.checkpoint_path = checkpoint_path
+        self.checkpoint_interval = checkpoint_interval
+        self.resume = resume
+        # Warm start: seed part of the population from the stored timetable (self.timeslots)
+        self.warm_start = warm_start
+        self.warm_start_fraction = warm_start_fraction
+        self.warm_start_perturbation = warm_start_perturbation
+        self.warm_start_count = 0
+        # Memetic phase: tabu search on the best memetic_elite chromosomes every generation
+        if memetic and genome_mode != "array":
+            raise ValueError("memetic search requires genome_mode 'array'")
+        self.memetic = memetic
+        self.memetic_elite = memetic_elite
+        self.memetic_steps = memetic_steps
+        self.memetic_neighbours = memetic_neighbours
+        self.tabu_tenure = tabu_tenure
+        # Pre-solve: domains restricting array initialization and mutation, and proven infeasibilities
+        self.presolve = presolve
+        # Adaptive control: operator choice from their success, mutation rate and tournament
+        # size from population diversity, starting at the configured values
+        self.adaptive = adaptive
+        self.base_mutation_rate = mutation_rate
+        self.base_tournament_size = tournament_size
+        # Guided mutation adds the conflict-directed operator, chosen like the others when adaptive
+        self.guided_mutation = guided_mutation
+        self.mutation_types = MUTATION_TYPES + (CONFLICT_MUTATION,) if guided_mutation else MUTATION_TYPES
+        self.mutation_operators = AdaptiveOperators(self.mutation_types)
+        self.crossover_operators = AdaptiveOperators(CROSSOVER_TYPES)
+        # Duplicate suppression: repeated genomes of a new generation are mutated before evaluation
+        self.deduplicate = deduplicate
+        self.duplicates_replaced = 0
+        # Latest diversity_metrics(), reported with the progress
+        self.diversity = None
+        # Fitness memoization, off with fitness_cache_size=0
+        self.fitness_cache_size = fitness_cache_size
+        self.cache_conflicts = cache_conflicts
+        self.fitness_cache = FitnessCache(
+            fitness_cache_size, keep_conflicts=cache_conflicts
+        ) if fitness_cache_size > 0 else None
+        if problem is not None:
+            # Problem already loaded elsewhere (e.g. in a worker process), no database access
+            self.lecturers = problem.lecturers
+            self.courses = problem.courses
+            self.rooms = problem.rooms
+            self.constraints = problem.constraints
+            self.course_lecturer_mapping = problem.course_lecturer_mapping
+            reserved = reserved or problem.reserved
+        else:
+            self.lecturers = self._load_lecturers()
+            self.courses = self._load_courses(year=year)
+            self.rooms = self._load_rooms()
+            self.constraints = self._load_constraints()
+            self.course_lecturer_mapping = self._create_course_lecturer_mapping()
+            if warm_start and not self.timeslots:
+                self.timeslots = self._load_stored_timeslots()
         
         # Debug resource availability
         lab_rooms = [r for r_id, r in self.rooms.items() if getattr(r, 'room_type', '') == 'LAB']
@@ -183,9 +1322,21 @@ class TimetableGenerator:
         self.soft_constraints = [c for c in self.constraints if c.constraint_id.startswith('SC')]
         print(f"Loaded {len(self.hard_constraints)} hard constraints and "
             f"{len(self.soft_constraints)} soft constraints")
+        self.constraint_index = compile_constraints(self.constraints)
+        self.reserved = reserved
+        self.room_index = self._build_room_index()
+        # Tables of another generator of the same problem keep its gene indices, e.g. in worker processes
+        self.genome_tables = genome_tables if genome_tables is not None else self._build_genome_tables()
         
     
         
+    def _load_stored_timeslots(self) -> list:
+        """Timeslots currently stored for this semester/year, as plain records"""
+        query = self.db.query(Timeslot).filter(Timeslot.semester == self.semester)
+        if self.year is not None:
+            query = query.filter(Timeslot.year == self.year)
+        return [_snapshot_record(ts) for ts in query.all()]
+
     def create_chromosome(self) -> Chromosome:
         """Create a chromosome from provided timeslots or generate a random one if none provided."""
         if self.timeslots:
@@ -213,13 +1364,42 @@ class TimetableGenerator:
             return self.create_random_chromosome()
         
     def __del__(self):
-        if self.pool:
-            self.pool.close()
-            self.pool.join()
+        # Only for pools started outside run(); joining here could hang at interpreter shutdown
+        if getattr(self, 'pool', None) is not None:
+            self.pool.terminate()
 
     def _initialize_pool(self):
         if self.pool is None:
-            self.pool = multiprocessing.Pool(processes=multiprocessing.cpu_count())
+            self.pool = multiprocessing.Pool(
+                processes=self.n_workers,
+                initializer=_init_evaluation_worker,
+                initargs=(self.problem_data(), self.genome_tables, self.fitness_evaluator)
+            )
+
+    def close_pool(self):
+        """Shut down the evaluation pool, if one was started"""
+        if self.pool is not None:
+            self.pool.close()
+            self.pool.join()
+            self.pool = None
+
+    def problem_data(self) -> ProblemData:
+        """Snapshot the loaded problem as plain picklable records"""
+        return ProblemData(
+            semester=self.semester,
+            year=self.year,
+            lecturers={l_id: _snapshot_record(l) for l_id, l in self.lecturers.items()},
+            courses={c_id: _snapshot_record(c) for c_id, c in self.courses.items()},
+            rooms={r_id: _snapshot_record(r) for r_id, r in self.rooms.items()},
+            constraints=[_snapshot_record(c) for c in self.constraints],
+            course_lecturer_mapping=dict(self.course_lecturer_mapping),
+            reserved=self.reserved
+        )
+
+    def reserve_slots(self, reserved: Optional[ReservedSlots]):
+        """Set the slots held by other timetables and rebuild the tables that depend on them"""
+        self.reserved = reserved
+        self.genome_tables = self._build_genome_tables()
 
             
     def _create_course_lecturer_mapping(self) -> Dict[str, str]:
@@ -318,41 +1498,248 @@ class TimetableGenerator:
         """Load all constraints from the database"""
         constraints = self.db.query(Constraint).all()
         return constraints
+
+    def _build_room_index(self) -> Dict[str, CandidateRooms]:
+        """Candidate rooms per course, so operators sample instead of rescanning self.rooms"""
+        def is_lab_room(room):
+            return getattr(room, 'room_type', '') == "LAB"
+
+        room_index = {}
+        for course_id, course in self.courses.items():
+            students = course.no_of_students or 0
+            course_name = getattr(course, 'course_name', '') or ''
+            is_lab_course = "Lab" in course_name
+            by_fit = sorted(self.rooms.items(), key=lambda entry: abs((entry[1].capacity or 0) - students))
+            room_index[course_id] = CandidateRooms(
+                buffered=tuple(
+                    r_id for r_id, r in by_fit
+                    if (r.capacity or 0) >= students * 1.1 and (is_lab_room(r) or not is_lab_course)
+                ),
+                fitting=tuple(
+                    r_id for r_id, r in by_fit
+                    if (r.capacity or 0) >= students and (is_lab_room(r) or not is_lab_course)
+                ),
+                sufficient=tuple(r_id for r_id, r in by_fit if (r.capacity or 0) >= students),
+                lab=tuple(r_id for r_id, r in by_fit if is_lab_room(r) and (r.capacity or 0) >= students),
+                is_lab_course=is_lab_course,
+                is_lettered_course=any(suffix in course_name.split() for suffix in ["A", "B", "C", "D"])
+            )
+        return room_index
+
+    def _build_genome_tables(self) -> GenomeTables:
+        """Index courses, rooms, lecturers and student groups for the array genome"""
+        course_ids = sorted(
+            self.courses.keys(),
+            key=lambda c_id: (
+                'Lab' not in self.courses[c_id].course_name,
+                -self.courses[c_id].no_of_students
+            )
+        )
+        room_ids = list(self.rooms.keys())
+        lecturer_ids = list(self.lecturers.keys())
+        lecturer_index = {l_id: i for i, l_id in enumerate(lecturer_ids)}
+        group_index = {}
+
+        course_lecturer = []
+        course_group = []
+        gene_course = []
+        for c_idx, course_id in enumerate(course_ids):
+            course = self.courses[course_id]
+            lecturer_id = self.course_lecturer_mapping.get(course_id)
+            if lecturer_id not in lecturer_index:
+                # Same fallback as _create_random_schedule_item, but seeded from the course
+                # so every build of the tables picks the same lecturer
+                lecturer_id = random.Random(course_id).choice(lecturer_ids)
+                print(f"Warning: No lecturer assigned for course {course_id}, using {lecturer_id}")
+            course_lecturer.append(lecturer_index[lecturer_id])
+            student_group = getattr(course, 'student_group', course_id)
+            course_group.append(group_index.setdefault(student_group, len(group_index)))
+            gene_course.extend([c_idx] * getattr(course, 'sessions_count', 1))
+
+        slot_is_prayer = np.array([slot.is_prayer for slot in SLOT_TABLE], dtype=bool).reshape(len(DAYS), PERIODS_PER_DAY)
+        valid_slots = [divmod(slot_id, PERIODS_PER_DAY) for slot_id in TEACHING_SLOTS]
+        period_is_early = np.array([slot.is_early for slot in SLOT_TABLE[:PERIODS_PER_DAY]], dtype=bool)
+        period_is_late = np.array([slot.is_late for slot in SLOT_TABLE[:PERIODS_PER_DAY]], dtype=bool)
+
+        room_position = {r_id: i for i, r_id in enumerate(room_ids)}
+        room_reserved = np.zeros((len(room_ids), len(DAYS), PERIODS_PER_DAY), dtype=bool)
+        lecturer_reserved = np.zeros((len(lecturer_ids), len(DAYS), PERIODS_PER_DAY), dtype=bool)
+        if self.reserved is not None:
+            for grid, index, held in ((room_reserved, room_position, self.reserved.rooms),
+                                      (lecturer_reserved, lecturer_index, self.reserved.lecturers)):
+                for resource_id, slot_ids in held.items():
+                    if resource_id in index:
+                        grid[index[resource_id]].flat[list(slot_ids)] = True
+        def room_positions(r_ids):
+            return np.array([room_position[r_id] for r_id in r_ids], dtype=np.intp)
+
+        gene_course = np.array(gene_course, dtype=GENE_DTYPE)
+        gene_course.flags.writeable = False  # Shared by every ArrayChromosome of the run
+        tables = GenomeTables(
+            course_ids=course_ids,
+            room_ids=room_ids,
+            lecturer_ids=lecturer_ids,
+            group_ids=list(group_index.keys()),
+            gene_course=gene_course,
+            course_lecturer=np.array(course_lecturer, dtype=GENE_DTYPE),
+            course_group=np.array(course_group, dtype=GENE_DTYPE),
+            course_students=np.array([self.courses[c].no_of_students or 0 for c in course_ids]),
+            course_is_lab=np.array(["Lab" in self.courses[c].course_name for c in course_ids], dtype=bool),
+            room_capacity=np.array([self.rooms[r].capacity or 0 for r in room_ids]),
+            room_is_lab=np.array([getattr(self.rooms[r], 'room_type', '') == "LAB" for r in room_ids], dtype=bool),
+            slot_is_prayer=slot_is_prayer,
+            period_is_early=period_is_early,
+            period_is_late=period_is_late,
+            gene_lecturer=np.array(course_lecturer, dtype=GENE_DTYPE)[gene_course],
+            gene_group=np.array(course_group, dtype=GENE_DTYPE)[gene_course],
+            course_hash=np.random.default_rng(0).integers(0, 2**63, size=len(course_ids), dtype=np.uint64) * np.uint64(2) + np.uint64(1),
+            valid_slots=valid_slots,
+            course_buffered_rooms=[room_positions(self.room_index[c].buffered) for c in course_ids],
+            course_sufficient_rooms=[room_positions(self.room_index[c].sufficient) for c in course_ids],
+            room_reserved=room_reserved,
+            lecturer_reserved=lecturer_reserved
+        )
+        return tables
+
+    def presolve_tables(self) -> GenomeTables:
+        """
+        Run presolve_domains on the genome tables unless this build already
+        has its domains; workers and islands given the tables reuse them.
+        """
+        tables = self.genome_tables
+        if tables.course_domain is not None:
+            return tables
+        tables.course_domain, tables.infeasibilities = presolve_domains(tables)
+        tables.course_domain_cells = [np.flatnonzero(domain) for domain in tables.course_domain]
+        if tables.infeasibilities:
+            logger.warning(f"Pre-solve: no timetable can meet every hard constraint "
+                           f"({len(tables.infeasibilities)} proven infeasibilities)")
+            for infeasibility in tables.infeasibilities:
+                logger.warning(f"  {infeasibility}")
+        else:
+            logger.info(f"Pre-solve: {sum(len(cells) for cells in tables.course_domain_cells)} placements "
+                        f"left in the domains of {len(tables.course_ids)} courses")
+        return tables
+
+    def _presolve_if_used(self):
+        """Pre-solve when enabled and the run reads the domains, which only the array genome does"""
+        if self.presolve and self.genome_mode == "array":
+            self.presolve_tables()
+
+    @property
+    def infeasibilities(self) -> List[str]:
+        """Infeasibilities proven by presolve_tables; empty until it has run"""
+        return self.genome_tables.infeasibilities or []
+
+    def decode_chromosome(self, chromosome: ArrayChromosome) -> Chromosome:
+        """Convert an integer-encoded chromosome back into ScheduleItems"""
+        tables = self.genome_tables
+        schedule_items = []
+        for c_idx, r_idx, d_idx, p_idx in zip(chromosome.course_idx.tolist(), chromosome.room_idx.tolist(),
+                                              chromosome.day_idx.tolist(), chromosome.period_idx.tolist()):
+            course_id = tables.course_ids[c_idx]
+            lecturer_id = tables.lecturer_ids[tables.course_lecturer[c_idx]]
+            room_id = tables.room_ids[r_idx]
+            start_time, end_time = period_to_time(p_idx + 1)
+            schedule_items.append(ScheduleItem(
+                course_id=course_id,
+                course_name=self.courses[course_id].course_name,
+                lecturer_id=lecturer_id,
+                lecturer_name=self.lecturers[lecturer_id].lecturer_name,
+                room_id=room_id,
+                room_name=self.rooms[room_id].room_name,
+                day=DAYS[d_idx],
+                start_time=start_time,
+                end_time=end_time,
+                semester=self.semester,
+                year=self.year
+            ))
+        decoded = Chromosome(schedule_items)
+        decoded.fitness = chromosome.fitness
+        decoded.hard_violations = chromosome.hard_violations
+        decoded.soft_violations = chromosome.soft_violations
+        decoded.conflicts = list(chromosome.conflicts)
+        return decoded
+
+    def encode_chromosome(self, chromosome: Chromosome) -> Optional[ArrayChromosome]:
+        """
+        Encode a ScheduleItem chromosome onto the gene layout of this run.
+        Returns None when the schedule cannot be represented exactly (unknown
+        course or room, wrong lecturer, off-grid times or wrong session counts).
+        """
+        tables = self.genome_tables
+        course_index = {c_id: i for i, c_id in enumerate(tables.course_ids)}
+        room_index = {r_id: i for i, r_id in enumerate(tables.room_ids)}
+        day_start = STARTING_HOUR * 60 + STARTING_MINUTE
+
+        genes_by_course = defaultdict(list)
+        for item in chromosome.schedule_items:
+            c_idx = course_index.get(item.course_id)
+            r_idx = room_index.get(item.room_id)
+            if c_idx is None or r_idx is None or item.day not in DAYS:
+                return None
+            if item.lecturer_id != tables.lecturer_ids[tables.course_lecturer[c_idx]]:
+                return None
+            start_time, end_time = item.start_time, item.end_time
+            if isinstance(start_time, str):
+                start_time = parse_time_string(start_time)
+            if isinstance(end_time, str):
+                end_time = parse_time_string(end_time)
+            offset = start_time.hour * 60 + start_time.minute - day_start
+            period, remainder = divmod(offset, PERIOD_DURATION)
+            if remainder or not 0 <= period < PERIODS_PER_DAY or (start_time, end_time) != period_to_time(period + 1):
+                return None
+            genes_by_course[c_idx].append((r_idx, DAYS.index(item.day), period))
+
+        genes = []
+        for c_idx in tables.gene_course.tolist():
+            if not genes_by_course[c_idx]:
+                return None
+            genes.append(genes_by_course[c_idx].pop(0))
+        if any(genes_by_course.values()):
+            return None
+
+        return ArrayChromosome(
+            tables.gene_course,
+            np.array([gene[0] for gene in genes], dtype=GENE_DTYPE),
+            np.array([gene[1] for gene in genes], dtype=GENE_DTYPE),
+            np.array([gene[2] for gene in genes], dtype=GENE_DTYPE)
+        )
     
     def initialize_population(self):
         """Create an initial random population of chromosomes"""
         print("Initializing population...")
         self.population = []
+        if self.warm_start and self.timeslots:
+            self.population = self._warm_start_population()
+        elif self.warm_start:
+            print("Warm start: no stored timetable, starting from random chromosomes")
+        self.warm_start_count = len(self.population)
         
-        for _ in range(self.population_size):
-            chromosome = self.create_random_chromosome()
+        for _ in range(self.population_size - self.warm_start_count):
+            if self.genome_mode == "array":
+                chromosome = self.create_random_array_chromosome()
+            else:
+                chromosome = self.create_random_chromosome()
             self.population.append(chromosome)
         
         print(f"Population initialized with {len(self.population)} chromosomes")
     
     def create_random_chromosome(self) -> Chromosome:
         chromosome = Chromosome()
-        lecturer_schedule = {l_id: {day: [] for day in DAYS} for l_id in self.lecturers}
-        room_schedule = {r_id: {day: [] for day in DAYS} for r_id in self.rooms}
-        student_schedule = defaultdict(lambda: {day: [] for day in DAYS})
-        
-        # Helper function to check valid timeslot (especially for Friday prayer time)
-        def is_valid_timeslot(day, period):
-            if day == "Friday":
-                start_time, end_time = period_to_time(period)
-                prayer_start = time(12, 30)
-                prayer_end = time(14, 30)
-                return not ((start_time >= prayer_start and start_time < prayer_end) or 
-                        (end_time > prayer_start and end_time <= prayer_end))
-            return True
-
-        # Generate valid time slots excluding Friday prayer time
-        valid_time_slots = []
-        for day in ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday"]:
-            for period in range(1, PERIODS_PER_DAY + 1):
-                if is_valid_timeslot(day, period):
-                    start_time, end_time = period_to_time(period)
-                    valid_time_slots.append(TimeSlot(day=day, start_time=start_time, end_time=end_time))
+        # Busy slot IDs per resource; every class placed here sits on the period grid
+        lecturer_schedule = defaultdict(set)  # {lecturer_id: {slot_id}}
+        room_schedule = defaultdict(set)  # {room_id: {slot_id}}
+        if self.reserved is not None:
+            # Slots held by other timetables start out busy
+            for l_id, slot_ids in self.reserved.lecturers.items():
+                lecturer_schedule[l_id].update(slot_ids)
+            for r_id, slot_ids in self.reserved.rooms.items():
+                room_schedule[r_id].update(slot_ids)
+        student_schedule = defaultdict(set)  # {student_group: {slot_id}}
+
+        # Weekday slots excluding Friday prayer time
+        valid_time_slots = [SLOT_TABLE[slot_id] for slot_id in TEACHING_SLOTS]
         
         # Sort courses by priority: lab courses first, then by student count
         course_order = sorted(
@@ -376,15 +1763,8 @@ class TimetableGenerator:
                 print(f"Warning: No lecturer assigned for course {course_id}")
                 continue
                 
-            is_lab_course = "Lab" in course.course_name
-            
-            # Find suitable rooms with capacity (with 10% buffer)
-            suitable_rooms = [
-                r_id for r_id, r in self.rooms.items()
-                if r.capacity >= course.no_of_students * 1.1 and 
-                ((is_lab_course and getattr(r, 'room_type', '') == "LAB") or 
-                 (not is_lab_course))
-            ]
+            # Suitable rooms with capacity (with 10% buffer), shuffled below so copy the tuple
+            suitable_rooms = list(self.room_index[course_id].buffered)
             
             if not suitable_rooms:
                 print(f"Warning: No suitable rooms found for {course.course_name}")
@@ -400,22 +1780,14 @@ class TimetableGenerator:
                     new_timeslot = random.choice(valid_time_slots)
                     
                     # Check lecturer availability
-                    lecturer_conflict = any(
-                        timeslots_overlap(new_timeslot, existing_slot)
-                        for existing_slot in lecturer_schedule[assigned_lecturer_id][new_timeslot.day]
-                    )
-                    if lecturer_conflict:
+                    if new_timeslot.slot_id in lecturer_schedule[assigned_lecturer_id]:
                         continue
                         
                     # Find available room
                     random.shuffle(suitable_rooms)
                     room_id = None
                     for r_id in suitable_rooms:
-                        room_conflict = any(
-                            timeslots_overlap(new_timeslot, existing_slot)
-                            for existing_slot in room_schedule[r_id][new_timeslot.day]
-                        )
-                        if not room_conflict:
+                        if new_timeslot.slot_id not in room_schedule[r_id]:
                             room_id = r_id
                             break
                             
@@ -423,11 +1795,7 @@ class TimetableGenerator:
                         continue
                         
                     # Check student group availability
-                    student_conflict = any(
-                        timeslots_overlap(new_timeslot, existing_slot)
-                        for existing_slot in student_schedule[student_group][new_timeslot.day]
-                    )
-                    if student_conflict:
+                    if new_timeslot.slot_id in student_schedule[student_group]:
                         continue
                         
                     # If all checks passed, schedule the course
@@ -445,9 +1813,9 @@ class TimetableGenerator:
                         year=self.year
                     )
                     chromosome.schedule_items.append(schedule_item)
-                    lecturer_schedule[assigned_lecturer_id][new_timeslot.day].append(new_timeslot)
-                    room_schedule[room_id][new_timeslot.day].append(new_timeslot)
-                    student_schedule[student_group][new_timeslot.day].append(new_timeslot)
+                    lecturer_schedule[assigned_lecturer_id].add(new_timeslot.slot_id)
+                    room_schedule[room_id].add(new_timeslot.slot_id)
+                    student_schedule[student_group].add(new_timeslot.slot_id)
                     scheduled = True
                     scheduled_courses.add(course_id)
                     
@@ -456,6 +1824,8 @@ class TimetableGenerator:
         
         # Ensure all courses are scheduled - fallback with potential conflicts
         missing_courses = set(self.courses.keys()) - scheduled_courses
+        day_distribution = Counter({day: 0 for day in WEEKDAYS})
+        day_distribution.update(item.day for item in chromosome.schedule_items)
         for course_id in missing_courses:
             course = self.courses[course_id]
             print(f"Fallback scheduling for missing course: {course.course_name}")
@@ -466,7 +1836,7 @@ class TimetableGenerator:
                 
             # Find any available timeslot and room, even if it causes conflicts
             # Choose day with least classes
-            chosen_day = min(get_distribution.keys(), key=lambda d: get_distribution[d])
+            chosen_day = min(WEEKDAYS, key=lambda d: day_distribution[d])
             day_slots = [ts for ts in valid_time_slots if ts.day == chosen_day]
             if not day_slots:
                 day_slots = valid_time_slots
@@ -488,11 +1858,329 @@ class TimetableGenerator:
                 year=self.year
             )
             chromosome.schedule_items.append(schedule_item)
-            get_distribution[new_timeslot.day] += 1
+            day_distribution[new_timeslot.day] += 1
         
         return chromosome
+
+    def create_random_array_chromosome(self) -> ArrayChromosome:
+        """Integer-encoded counterpart of create_random_chromosome"""
+        tables = self.genome_tables
+        n_genes = len(tables.gene_course)
+        chromosome = ArrayChromosome(tables.gene_course, np.zeros(n_genes, dtype=GENE_DTYPE),
+                                     np.zeros(n_genes, dtype=GENE_DTYPE), np.zeros(n_genes, dtype=GENE_DTYPE))
+        self._place_array_genes(chromosome, range(n_genes), *self._array_occupancy())
+        return chromosome
+
+    def _array_occupancy(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Empty lecturer, room and student-group grids indexed by [resource, day, period]"""
+        tables = self.genome_tables
+        # Slots held by other timetables start out busy
+        lecturer_busy = tables.lecturer_reserved.copy()
+        room_busy = tables.room_reserved.copy()
+        group_busy = np.zeros((len(tables.group_ids), len(DAYS), PERIODS_PER_DAY), dtype=bool)
+        return lecturer_busy, room_busy, group_busy
+
+    def _place_array_genes(self, chromosome: ArrayChromosome, genes, lecturer_busy: np.ndarray,
+                           room_busy: np.ndarray, group_busy: np.ndarray):
+        """Place the given genes at random clash-free slots, in place, marking the grids busy"""
+        tables = self.genome_tables
+        valid_slots = tables.valid_slots
+        max_attempts = 200
+
+        for gene in genes:
+            c_idx = int(chromosome.course_idx[gene])
+            lecturer = tables.course_lecturer[c_idx]
+            group = tables.course_group[c_idx]
+            suitable_rooms = tables.course_buffered_rooms[c_idx]
+            if len(suitable_rooms) == 0:
+                suitable_rooms = np.arange(len(tables.room_ids))
+            domain = self._course_domain(c_idx)
+
+            room = None
+            for _ in range(max_attempts):
+                day, period = random.choice(valid_slots)
+                if lecturer_busy[lecturer, day, period] or group_busy[group, day, period]:
+                    continue
+                free = ~room_busy[suitable_rooms, day, period]
+                if domain is not None:
+                    free &= domain[suitable_rooms, day, period]
+                free_rooms = suitable_rooms[free]
+                if len(free_rooms):
+                    room = random.choice(free_rooms)
+                    break
+
+            if room is None:
+                # Fallback with potential conflicts, left for the GA to repair
+                print(f"Warning: Could not schedule {self.courses[tables.course_ids[c_idx]].course_name} "
+                      f"after {max_attempts} attempts")
+                day, period = random.choice(valid_slots)
+                room = random.choice(suitable_rooms)
+
+            chromosome.room_idx[gene], chromosome.day_idx[gene], chromosome.period_idx[gene] = room, day, period
+            lecturer_busy[lecturer, day, period] = True
+            room_busy[room, day, period] = True
+            group_busy[group, day, period] = True
+
+    def _course_domain(self, c_idx: int) -> Optional[np.ndarray]:
+        """[room, day, period] domain of a course from presolve_domains, None if off or empty"""
+        tables = self.genome_tables
+        if tables.course_domain_cells is None or not len(tables.course_domain_cells[c_idx]):
+            return None
+        return tables.course_domain[c_idx]
+
+    def _random_domain_placement(self, c_idx: int) -> Optional[Tuple[int, int, int]]:
+        """Random (room, day, period) from a course's domain, None without one"""
+        tables = self.genome_tables
+        if tables.course_domain_cells is None or not len(tables.course_domain_cells[c_idx]):
+            return None
+        cell = random.choice(tables.course_domain_cells[c_idx])
+        return tuple(int(i) for i in np.unravel_index(cell, tables.course_domain.shape[1:]))
+
+    def timeslots_to_array_chromosome(self, timeslots) -> Tuple[ArrayChromosome, list]:
+        """
+        Follow stored timeslots as closely as the current problem allows.
+        Sessions of removed courses and off-grid sessions are dropped, sessions
+        whose room is gone get another suitable room at the same time, and
+        sessions with no stored placement (new courses, extra sessions) are
+        placed at random around the rest. Returns the chromosome and, per gene,
+        the stored timeslot it follows or None.
+        """
+        tables = self.genome_tables
+        course_index = {c_id: i for i, c_id in enumerate(tables.course_ids)}
+        room_index = {r_id: i for i, r_id in enumerate(tables.room_ids)}
+        stored = defaultdict(list)
+        for ts in timeslots:
+            c_idx = course_index.get(ts.course_id)
+            slot_id = schedule_span(ts.day_of_the_week, ts.start_time, ts.end_time)[0]
+            if c_idx is None or slot_id is None:
+                continue
+            day, period = divmod(slot_id, PERIODS_PER_DAY)
+            stored[c_idx].append((room_index.get(ts.room_id), day, period, ts))
+
+        n_genes = len(tables.gene_course)
+        chromosome = ArrayChromosome(tables.gene_course, np.zeros(n_genes, dtype=GENE_DTYPE),
+                                     np.zeros(n_genes, dtype=GENE_DTYPE), np.zeros(n_genes, dtype=GENE_DTYPE))
+        lecturer_busy, room_busy, group_busy = self._array_occupancy()
+        unplaced = []
+        sources = [None] * n_genes
+        for gene, c_idx in enumerate(tables.gene_course.tolist()):
+            if not stored[c_idx]:
+                unplaced.append(gene)
+                continue
+            room, day, period, sources[gene] = stored[c_idx].pop(0)
+            if room is None:
+                candidates = tables.course_buffered_rooms[c_idx]
+                if len(candidates) == 0:
+                    candidates = np.arange(len(tables.room_ids))
+                free_rooms = candidates[~room_busy[candidates, day, period]]
+                room = free_rooms[0] if len(free_rooms) else candidates[0]  # best fit first
+            chromosome.room_idx[gene], chromosome.day_idx[gene], chromosome.period_idx[gene] = room, day, period
+            lecturer_busy[tables.course_lecturer[c_idx], day, period] = True
+            room_busy[room, day, period] = True
+            group_busy[tables.course_group[c_idx], day, period] = True
+        self._place_array_genes(chromosome, unplaced, lecturer_busy, room_busy, group_busy)
+        return chromosome, sources
+
+    def _perturb_array_chromosome(self, chromosome: ArrayChromosome, n_moves: int) -> ArrayChromosome:
+        """Copy of the chromosome with n_moves random genes moved to a random slot and room"""
+        tables = self.genome_tables
+        perturbed = chromosome.copy()
+        for gene in random.sample(range(len(perturbed)), min(n_moves, len(perturbed))):
+            rooms = tables.course_buffered_rooms[perturbed.course_idx[gene]]
+            if len(rooms) == 0:
+                rooms = np.arange(len(tables.room_ids))
+            day, period = random.choice(tables.valid_slots)
+            perturbed.room_idx[gene], perturbed.day_idx[gene], perturbed.period_idx[gene] = random.choice(rooms), day, period
+        perturbed.state = None
+        return perturbed
+
+    def affected_genes(self, chromosome: ArrayChromosome, sources: list, course_ids=(), room_ids=(),
+                       lecturer_ids=()) -> List[int]:
+        """
+        Genes to re-place after an edit: sessions of the changed courses, of
+        courses taught by the changed lecturers, in the changed rooms, and
+        sessions that no longer follow their stored timeslot (new sessions,
+        replaced rooms, reassigned lecturers). sources comes from
+        timeslots_to_array_chromosome.
+        """
+        tables = self.genome_tables
+        course_ids, room_ids, lecturer_ids = set(course_ids), set(room_ids), set(lecturer_ids)
+        affected = []
+        for gene, source in enumerate(sources):
+            c_idx = int(chromosome.course_idx[gene])
+            room_id = tables.room_ids[chromosome.room_idx[gene]]
+            lecturer_id = tables.lecturer_ids[tables.course_lecturer[c_idx]]
+            if (source is None or source.room_id != room_id or source.lecturer_id != lecturer_id
+                    or tables.course_ids[c_idx] in course_ids
+                    or room_id in room_ids or lecturer_id in lecturer_ids):
+                affected.append(gene)
+        return affected
+
+    def local_search_genes(self, chromosome: ArrayChromosome, genes, time_limit: float = 5.0,
+                           max_passes: int = 5) -> ArrayChromosome:
+        """
+        Best-improvement local search that only moves the given genes, in place.
+        Each gene in turn goes to the (room, day, period) of its presolved
+        domain, or of its sufficient rooms and the valid slots without one,
+        scoring best against the rest of the timetable, until a pass improves
+        nothing or time_limit seconds have passed. Candidates are scored from
+        the FitnessState by move_fitness; only the chosen move is applied.
+        Ties go to the placement whose room, lecturer and student group cells
+        hold the fewest genes, so sessions of a course aren't stacked.
+        """
+        tables = self.genome_tables
+        if chromosome.state is None:
+            chromosome.state = build_fitness_state(tables, chromosome)
+        chromosome.fitness, chromosome.hard_violations, chromosome.soft_violations = score_fitness_state(chromosome.state)
+        deadline = perf_counter() + time_limit
+        for _ in range(max_passes):
+            improved = False
+            for gene in genes:
+                rooms, days, periods = self._candidate_placements(int(chromosome.course_idx[gene]))
+                fitness = self.move_fitness(chromosome, gene, rooms, days, periods)
+                best = self._least_busy(chromosome, gene, rooms, days, periods, np.flatnonzero(fitness == fitness.max()))
+                if fitness[best] > chromosome.fitness:
+                    self.move_gene(chromosome, gene, rooms[best], days[best], periods[best])
+                    improved = True
+                if perf_counter() > deadline:
+                    return chromosome
+            if not improved:
+                break
+        return chromosome
+
+    def _least_busy(self, chromosome: ArrayChromosome, gene: int, rooms: np.ndarray, days: np.ndarray,
+                    periods: np.ndarray, candidates: np.ndarray) -> int:
+        """The candidate placement whose cells hold the fewest other genes"""
+        tables = self.genome_tables
+        room_cells, lecturer_cells, group_cells = chromosome.state.cells
+        lecturer, group = int(tables.gene_lecturer[gene]), int(tables.gene_group[gene])
+        def busy(i):
+            slot = int(days[i]) * PERIODS_PER_DAY + int(periods[i])
+            cells = (room_cells.get((int(rooms[i]), slot), {}), lecturer_cells.get((lecturer, slot), {}),
+                     group_cells.get((group, slot), {}))
+            return sum(len(genes) - (gene in genes) for genes in cells)
+        return int(min(candidates.tolist(), key=busy))
+
+    def _candidate_placements(self, c_idx: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """(rooms, days, periods) of a course's domain, or its sufficient rooms in every valid slot"""
+        tables = self.genome_tables
+        if tables.course_domain_cells is not None and len(tables.course_domain_cells[c_idx]):
+            return np.unravel_index(tables.course_domain_cells[c_idx], tables.course_domain.shape[1:])
+        rooms = tables.course_sufficient_rooms[c_idx]
+        if len(rooms) == 0:
+            rooms = np.arange(len(tables.room_ids))
+        days, periods = np.array(tables.valid_slots, dtype=np.intp).reshape(-1, 2).T
+        return np.repeat(rooms, len(days)), np.tile(days, len(rooms)), np.tile(periods, len(rooms))
+
+    def move_fitness(self, chromosome: ArrayChromosome, gene: int, rooms: np.ndarray, days: np.ndarray,
+                     periods: np.ndarray) -> np.ndarray:
+        """
+        Fitness the chromosome would have with ``gene`` moved to each of the
+        given placements, from its FitnessState and the cells the gene would
+        leave and enter, without applying any move.
+        """
+        tables = self.genome_tables
+        if chromosome.state is None:
+            chromosome.state = build_fitness_state(tables, chromosome)
+        state = chromosome.state
+        course = int(chromosome.course_idx[gene])
+        old_room, old_day, old_period = int(chromosome.room_idx[gene]), int(chromosome.day_idx[gene]), int(chromosome.period_idx[gene])
+        old_slot = old_day * PERIODS_PER_DAY + old_period
+        hard_penalty, soft_penalty = fitness_state_penalties(state)
+        n_hard = len(GENE_FLAG_HARD_PENALTIES)
+        
+        # Per-gene checks, for every candidate at once
+        flag_change = _gene_flags(tables, course, rooms, days, periods).astype(np.int64) - \
+            _gene_flags(tables, course, old_room, old_day, old_period)[:, None]
+        hard = hard_penalty + np.dot(GENE_FLAG_HARD_PENALTIES, flag_change[:n_hard])
+        soft = soft_penalty + np.dot(GENE_FLAG_SOFT_PENALTIES, flag_change[n_hard:])
+        
+        # Timeslot utilization
+        slots = days * PERIODS_PER_DAY + periods
+        moved = slots != old_slot
+        used_change = (moved & (state.slot_counts[slots] == 0)).astype(np.int64) - \
+            (moved & (state.slot_counts[old_slot] == 1))
+        soft = soft - used_change / (PERIODS_PER_DAY * 5) * 5
+        
+        # Overlaps: the lecturer and student group cells only depend on the slot
+        lecturer, group = int(tables.gene_lecturer[gene]), int(tables.gene_group[gene])
+        room_cells, lecturer_cells, group_cells = state.cells
+        room_keys, lecturer_keys, group_keys = state.overlap_keys
+        person_change = {}
+        key_change = np.zeros(len(slots), dtype=np.int64)
+        for i, (room, slot) in enumerate(zip(rooms.tolist(), slots.tolist())):
+            if (room, slot) != (old_room, old_slot):
+                key_change[i] = _overlap_key_delta(room_keys, room_cells[old_room, old_slot],
+                                                   room_cells.get((room, slot), {}), gene, course)
+            if slot not in person_change:
+                person_change[slot] = 0 if slot == old_slot else (
+                    _overlap_key_delta(lecturer_keys, lecturer_cells[lecturer, old_slot],
+                                       lecturer_cells.get((lecturer, slot), {}), gene, course) +
+                    _overlap_key_delta(group_keys, group_cells[group, old_slot],
+                                       group_cells.get((group, slot), {}), gene, course))
+            key_change[i] += person_change[slot]
+        hard = hard + 10000 * key_change
+        
+        return np.where(hard > 0, 1 / (1 + hard), 1 + 1 / (1 + soft))
+
+    def schedule_diff(self, chromosome: ArrayChromosome, sources: list, timeslots) -> List[dict]:
+        """Moved, added and removed sessions going from the stored timeslots to the chromosome"""
+        tables = self.genome_tables
+        changes = []
+        for gene, source in enumerate(sources):
+            c_idx = int(chromosome.course_idx[gene])
+            start_time, end_time = period_to_time(int(chromosome.period_idx[gene]) + 1)
+            after = _placement(tables.room_ids[chromosome.room_idx[gene]],
+                               tables.lecturer_ids[tables.course_lecturer[c_idx]],
+                               DAYS[chromosome.day_idx[gene]], start_time, end_time)
+            before = None if source is None else _placement(source.room_id, source.lecturer_id,
+                                                            source.day_of_the_week, source.start_time, source.end_time)
+            if before != after:
+                course_id = tables.course_ids[c_idx]
+                changes.append({'change': 'added' if source is None else 'moved', 'course_id': course_id,
+                                'course_name': self.courses[course_id].course_name, 'before': before, 'after': after})
+        used = {id(source) for source in sources if source is not None}
+        for ts in timeslots:
+            if id(ts) not in used:
+                changes.append({'change': 'removed', 'course_id': ts.course_id, 'course_name': ts.course_name,
+                                'before': _placement(ts.room_id, ts.lecturer_id, ts.day_of_the_week,
+                                                     ts.start_time, ts.end_time),
+                                'after': None})
+        return changes
+
+    def _warm_start_population(self) -> List[Chromosome]:
+        """
+        The stored timetable plus perturbed variants of it, warm_start_fraction
+        of the population in all. Each variant has warm_start_perturbation of
+        its sessions moved at random.
+        """
+        seed, sources = self.timeslots_to_array_chromosome(self.timeslots)
+        kept = sum(source is not None for source in sources)
+        print(f"Warm start: kept {kept} of {len(seed)} sessions from {len(self.timeslots)} stored timeslots")
+        n_warm = min(self.population_size, max(1, round(self.population_size * self.warm_start_fraction)))
+        n_moves = max(1, round(len(seed) * self.warm_start_perturbation))
+        seeds = [seed] + [self._perturb_array_chromosome(seed, n_moves) for _ in range(n_warm - 1)]
+        if self.genome_mode == "object":
+            seeds = [self.decode_chromosome(c) for c in seeds]
+        return seeds
+
     def calculate_fitness(self, chromosome: Chromosome) -> float:
         """Calculate fitness score with proper conflict detection"""
+        if isinstance(chromosome, ArrayChromosome) and self.fitness_evaluator == "vectorized":
+            fitness, chromosome.hard_violations, chromosome.soft_violations = evaluate_genome_vectorized(
+                self.genome_tables, chromosome.course_idx, chromosome.room_idx,
+                chromosome.day_idx, chromosome.period_idx
+            )
+            chromosome.conflicts = []
+            return fitness
+        if isinstance(chromosome, ArrayChromosome):
+            decoded = self.decode_chromosome(chromosome)
+            fitness = self.calculate_fitness(decoded)
+            chromosome.hard_violations = decoded.hard_violations
+            chromosome.soft_violations = decoded.soft_violations
+            chromosome.conflicts = decoded.conflicts
+            return fitness
+
         hard_constraints_penalty = 0
         soft_constraints_penalty = 0
         chromosome.conflicts = []
@@ -500,14 +2188,15 @@ class TimetableGenerator:
         chromosome.soft_violations = 0
         
         # Initialize tracking structures
-        room_bookings = defaultdict(list)  # {room_id: [timeslots]}
-        lecturer_bookings = defaultdict(list)  # {lecturer_id: [timeslots]}
-        student_group_bookings = defaultdict(list)  # {student_group: [timeslots]}
+        # Bookings are bucketed per day and compared by slot ID (minutes for off-grid times)
+        room_bookings = defaultdict(list)  # {(room_id, day): [(span, item)]}
+        lecturer_bookings = defaultdict(list)  # {(lecturer_id, day): [(span, item)]}
+        student_group_bookings = defaultdict(list)  # {(student_group, day): [(span, item)]}
         sessions_scheduled = defaultdict(int)
+        spans = [schedule_span(item.day, item.start_time, item.end_time) for item in chromosome.schedule_items]
         
         # First pass: collect all bookings and validate individual items
-        for item in chromosome.schedule_items:
-            timeslot = TimeSlot(day=item.day, start_time=item.start_time, end_time=item.end_time)
+        for item, span in zip(chromosome.schedule_items, spans):
             course = self.courses.get(item.course_id)
             
             if not course:
@@ -564,28 +2253,47 @@ class TimetableGenerator:
                 hard_constraints_penalty += 50000
             
             # Check Friday prayer time (HC13)
-            if item.day == "Friday":
-                prayer_start = time(12, 30)
-                prayer_end = time(14, 30)
-                if (item.start_time >= prayer_start and item.start_time < prayer_end) or \
-                (item.end_time > prayer_start and item.end_time <= prayer_end):
+            if span_in_prayer_time(span):
+                self._add_conflict(
+                    chromosome,
+                    "PRAYER_TIME_CONFLICT",
+                    f"Class scheduled during Friday prayer time (12:30-14:30)",
+                    [item],
+                    "HC13",
+                    "hard"
+                )
+                hard_constraints_penalty += 50000
+            
+            # Slots this room or lecturer spends on another timetable (HC2/HC1)
+            if self.reserved is not None:
+                if span_hits_slots(span, self.reserved.rooms.get(item.room_id)):
                     self._add_conflict(
                         chromosome,
-                        "PRAYER_TIME_CONFLICT",
-                        f"Class scheduled during Friday prayer time (12:30-14:30)",
+                        "ROOM_RESERVED",
+                        f"Room {item.room_name} is booked by another timetable at this time",
                         [item],
-                        "HC13",
+                        "HC2",
                         "hard"
                     )
-                    hard_constraints_penalty += 50000
+                    hard_constraints_penalty += 10000
+                if span_hits_slots(span, self.reserved.lecturers.get(item.lecturer_id)):
+                    self._add_conflict(
+                        chromosome,
+                        "LECTURER_RESERVED",
+                        f"Lecturer {item.lecturer_name} teaches in another timetable at this time",
+                        [item],
+                        "HC1",
+                        "hard"
+                    )
+                    hard_constraints_penalty += 10000
             
             # Collect bookings for overlap detection
-            room_bookings[item.room_id].append((timeslot, item))
-            lecturer_bookings[item.lecturer_id].append((timeslot, item))
+            room_bookings[item.room_id, item.day].append((span, item))
+            lecturer_bookings[item.lecturer_id, item.day].append((span, item))
             
             # Get student group (fallback to course_id if not specified)
             student_group = getattr(course, 'student_group', item.course_id)
-            student_group_bookings[student_group].append((timeslot, item))
+            student_group_bookings[student_group, item.day].append((span, item))
             
             # Check soft constraints
             # Weekend classes (SC4)
@@ -601,9 +2309,7 @@ class TimetableGenerator:
                 soft_constraints_penalty += 1
                 
             # Early morning classes (SC1)
-            early_start = time(8, 30)
-            early_end = time(10, 0)
-            if (item.start_time < early_end and item.end_time > early_start):
+            if span_is_early(span):
                 self._add_conflict(
                     chromosome,
                     "EARLY_MORNING_CLASS",
@@ -615,9 +2321,7 @@ class TimetableGenerator:
                 soft_constraints_penalty += 0.5
                 
             # Late evening classes (SC2)
-            late_start = time(16, 0)
-            late_end = time(18, 30)
-            if (item.start_time < late_end and item.end_time > late_start):
+            if span_is_late(span):
                 self._add_conflict(
                     chromosome,
                     "LATE_EVENING_CLASS",
@@ -631,8 +2335,7 @@ class TimetableGenerator:
         # Second pass: detect overlap conflicts
         processed_conflicts = set()  # To avoid duplicate conflict reporting
         
-        for item in chromosome.schedule_items:
-            timeslot = TimeSlot(day=item.day, start_time=item.start_time, end_time=item.end_time)
+        for item, span in zip(chromosome.schedule_items, spans):
             course = self.courses.get(item.course_id)
             if not course:
                 continue
@@ -641,8 +2344,8 @@ class TimetableGenerator:
             
             # Check room overlaps (HC2)
             room_conflicts = [
-                existing_item for existing_slot, existing_item in room_bookings[item.room_id]
-                if existing_item.course_id != item.course_id and timeslots_overlap(timeslot, existing_slot)
+                existing_item for existing_span, existing_item in room_bookings[item.room_id, item.day]
+                if existing_item.course_id != item.course_id and spans_overlap(span, existing_span)
             ]
             
             if room_conflicts:
@@ -661,8 +2364,8 @@ class TimetableGenerator:
             
             # Check lecturer overlaps (HC1)
             lecturer_conflicts = [
-                existing_item for existing_slot, existing_item in lecturer_bookings[item.lecturer_id]
-                if existing_item.course_id != item.course_id and timeslots_overlap(timeslot, existing_slot)
+                existing_item for existing_span, existing_item in lecturer_bookings[item.lecturer_id, item.day]
+                if existing_item.course_id != item.course_id and spans_overlap(span, existing_span)
             ]
             
             if lecturer_conflicts:
@@ -681,8 +2384,8 @@ class TimetableGenerator:
             
             # Check student group overlaps (HC5)
             student_conflicts = [
-                existing_item for existing_slot, existing_item in student_group_bookings[student_group]
-                if existing_item.course_id != item.course_id and timeslots_overlap(timeslot, existing_slot)
+                existing_item for existing_span, existing_item in student_group_bookings[student_group, item.day]
+                if existing_item.course_id != item.course_id and spans_overlap(span, existing_span)
             ]
             
             if student_conflicts:
@@ -739,10 +2442,7 @@ class TimetableGenerator:
                 soft_constraints_penalty += (scheduled - sessions_needed) * 10
         
         # Calculate timeslot utilization
-        used_timeslots = set()
-        for item in chromosome.schedule_items:
-            timeslot_str = f"{item.day}_{item.start_time}_{item.end_time}"
-            used_timeslots.add(timeslot_str)
+        used_timeslots = {span[1:] for span in spans}
         
         total_possible_slots = PERIODS_PER_DAY * 5  # 5 weekdays
         utilization = len(used_timeslots) / total_possible_slots
@@ -760,6 +2460,23 @@ class TimetableGenerator:
             
         return fitness
 
+    def check_vectorized_fitness(self, chromosomes: List[ArrayChromosome]) -> List[int]:
+        """
+        Score chromosomes with both evaluators and return the indices where the
+        fitness differs. Used to validate the vectorized evaluator against the loop.
+        """
+        mismatches = []
+        for i, chromosome in enumerate(chromosomes):
+            loop_fitness = self.calculate_fitness(self.decode_chromosome(chromosome))
+            vectorized_fitness, _, _ = evaluate_genome_vectorized(
+                self.genome_tables, chromosome.course_idx, chromosome.room_idx,
+                chromosome.day_idx, chromosome.period_idx
+            )
+            if not np.isclose(loop_fitness, vectorized_fitness, rtol=1e-12, atol=0.0):
+                logger.warning(f"Fitness mismatch for chromosome {i}: loop={loop_fitness}, vectorized={vectorized_fitness}")
+                mismatches.append(i)
+        return mismatches
+
     def _add_conflict(self, chromosome, conflict_type, description, items, constraint=None, severity="hard"):
         """Enhanced conflict grouping with deduplication"""
         # Check if similar conflict already exists
@@ -791,288 +2508,161 @@ class TimetableGenerator:
             )
             chromosome.conflicts.append(conflict)
         
+    def _constraint_item(self, item: ScheduleItem) -> ScheduleItem:
+        """Copy of an item stamped with this run's semester and year, for conflict reports"""
+        return ScheduleItem(
+            course_id=item.course_id,
+            course_name=item.course_name,
+            lecturer_id=item.lecturer_id,
+            lecturer_name=item.lecturer_name,
+            room_id=item.room_id,
+            room_name=item.room_name,
+            day=item.day,
+            start_time=item.start_time,
+            end_time=item.end_time,
+            semester=self.semester,
+            year=self.year
+        )
+
     def _process_constraints(self, item: ScheduleItem, timeslot: TimeSlot, 
                    hard_constraints_penalty, soft_constraints_penalty,
                    chromosome: Chromosome):
-        if item.day == "Friday":
-            prayer_start = time(12, 30)
-            prayer_end = time(14, 30)
-            prayer_slot = TimeSlot(day="Friday", start_time=prayer_start, end_time=prayer_end)
-            if timeslots_overlap(timeslot, prayer_slot):
-                hard_constraints_penalty += 1000
-                chromosome.conflicts.append(Conflict(
-                    type="PRAYER_TIME_CONFLICT",
-                    description=f"Class scheduled during Friday prayer time (12:30-14:30)",
-                    items=[item],
-                    constraint="HC13",
-                    constraint_value="STRICT",
-                    severity="hard"
-                ))
-                return hard_constraints_penalty, soft_constraints_penalty
+        if item.day == "Friday" and self._is_friday_prayer_time(timeslot):
+            hard_constraints_penalty += 1000
+            chromosome.conflicts.append(Conflict(
+                type="PRAYER_TIME_CONFLICT",
+                description=f"Class scheduled during Friday prayer time (12:30-14:30)",
+                items=[item],
+                constraint="HC13",
+                constraint_value="STRICT",
+                severity="hard"
+            ))
+            return hard_constraints_penalty, soft_constraints_penalty
+
+        class_start_minutes = time_to_minutes(timeslot.start_time)
+        class_end_minutes = time_to_minutes(timeslot.end_time)
+        
+        # Only the compiled rules scoped to this course, lecturer and room
+        for rule in self.constraint_index.rules_for(item.course_id, item.lecturer_id, item.room_id):
+            in_window = rule.window is not None and minutes_overlap(
+                class_start_minutes, class_end_minutes, rule.window[0], rule.window[1]
+            )
+            window_start, window_end = rule.window_text
+            
+            if rule.kind == "NO_WEEKEND_CLASSES":
+                if item.day.strip() in rule.days:
+                    if item.day.strip() == "Sunday":
+                        hard_constraints_penalty += 10.0
+                        severity = "hard"
+                    else:
+                        soft_constraints_penalty += 0.5
+                        severity = "soft"
+                        
+                    chromosome.conflicts.append(Conflict(
+                        type="WEEKEND_CLASS",
+                        description=f"Class scheduled on weekend day {item.day}",
+                        items=[self._constraint_item(item)],
+                        constraint=rule.constraint_id,
+                        constraint_value="STRICT" if item.day.strip() == "Sunday" else "PREFERRED",
+                        severity=severity
+                    ))
 
-        for constraint in self.constraints:
-            if ((constraint.course_id == item.course_id or constraint.course_id is None) and
-                (constraint.lecturer_id == item.lecturer_id or constraint.lecturer_id is None) and
-                (constraint.room_id == item.room_id or constraint.room_id is None)):
+            elif rule.kind == "AVOID_EARLY_MORNING_CLASS":
+                if in_window:
+                    soft_constraints_penalty += 0.5
+                    chromosome.conflicts.append(Conflict(
+                        type="EARLY_MORNING_CLASS",
+                        description=f"Class scheduled during early morning hours {window_start}-{window_end}",
+                        items=[self._constraint_item(item)],
+                        constraint=rule.constraint_id,
+                        constraint_value="PREFERRED",
+                        severity="soft"
+                    ))
 
-                constraint_type = constraint.constraint_type.upper()
-                severity = "hard" if constraint.constraint_id.startswith("HC") else "soft"
-                penalty = HARD_CONSTRAINT_PENALTY if severity == "hard" else SOFT_CONSTRAINT_PENALTY
-                
-                if constraint_type == "NO_WEEKEND_CLASSES":
-                    weekend_days = constraint.constraint_value.split('&')
-                    if item.day.strip() in [day.strip() for day in weekend_days]:
-                        if item.day.strip() == "Sunday":
-                            hard_constraints_penalty += 10.0
-                            severity = "hard"
-                        else:
-                            soft_constraints_penalty += 0.5
-                            severity = "soft"
-                            
-                        chromosome.conflicts.append(Conflict(
-                            type="WEEKEND_CLASS",
-                            description=f"Class scheduled on weekend day {item.day}",
-                            items=[ScheduleItem(
-                                course_id=item.course_id,
-                                course_name=item.course_name,
-                                lecturer_id=item.lecturer_id,
-                                lecturer_name=item.lecturer_name,
-                                room_id=item.room_id,
-                                room_name=item.room_name,
-                                day=item.day,
-                                start_time=item.start_time,
-                                end_time=item.end_time,
-                                semester=self.semester,
-                                year=self.year
-                            )],
-                            constraint=constraint.constraint_id,
-                            constraint_value="STRICT" if item.day.strip() == "Sunday" else "PREFERRED",
-                            severity=severity
-                        ))
+            elif rule.kind == "AVOID_LATE_NIGHT_CLASS":
+                if in_window:
+                    soft_constraints_penalty += 0.5
+                    chromosome.conflicts.append(Conflict(
+                        type="LATE_NIGHT_CLASS",
+                        description=f"Class scheduled during late night hours {window_start}-{window_end}",
+                        items=[self._constraint_item(item)],
+                        constraint=rule.constraint_id,
+                        constraint_value="PREFERRED",
+                        severity="soft"
+                    ))
 
-                elif constraint_type in ["AVIOD_EARLY_MORNING_CLASS", "AVOID_EARLY_MORNING_CLASS"]:
-                    early_start, early_end = constraint.constraint_value.split('-')
-                    early_start_time = parse_time_string(early_start)
-                    early_end_time = parse_time_string(early_end)
-                    early_slot = TimeSlot(day=item.day, start_time=early_start_time, end_time=early_end_time)
-                    if timeslots_overlap(timeslot, early_slot):
+            elif rule.kind == "PRAYER_TIME_FRIDAY" and item.day == "Friday":
+                if in_window:
+                    hard_constraints_penalty += 1000
+                    chromosome.conflicts.append(Conflict(
+                        type="PRAYER_TIME_CONFLICT",
+                        description=f"Class scheduled during Friday prayer time {window_start}-{window_end}",
+                        items=[self._constraint_item(item)],
+                        constraint=rule.constraint_id,
+                        constraint_value="STRICT",
+                        severity="hard"
+                    ))
+
+            elif rule.kind == "AVOID_CONSECUTIVE_LECTURES":
+                # The lecturer's other classes that day
+                for existing_item in chromosome.schedule_items:
+                    if existing_item is item or existing_item.lecturer_id != item.lecturer_id \
+                            or existing_item.day != item.day:
+                        continue
+                    gap_minutes = abs(class_start_minutes - time_to_minutes(existing_item.end_time))
+                    if gap_minutes < rule.rest_minutes:
                         soft_constraints_penalty += 0.5
                         chromosome.conflicts.append(Conflict(
-                            type="EARLY_MORNING_CLASS",
-                            description=f"Class scheduled during early morning hours {early_start}-{early_end}",
-                            items=[ScheduleItem(
-                                course_id=item.course_id,
-                                course_name=item.course_name,
-                                lecturer_id=item.lecturer_id,
-                                lecturer_name=item.lecturer_name,
-                                room_id=item.room_id,
-                                room_name=item.room_name,
-                                day=item.day,
-                                start_time=item.start_time,
-                                end_time=item.end_time,
-                                semester=self.semester,
-                                year=self.year
-                            )],
-                            constraint=constraint.constraint_id,
+                            type="INSUFFICIENT_REST_TIME",
+                            description=f"Less than {rule.rest_minutes} minutes between classes for lecturer {item.lecturer_id}",
+                            items=[self._constraint_item(item), self._constraint_item(existing_item)],
+                            constraint=rule.constraint_id,
                             constraint_value="PREFERRED",
                             severity="soft"
                         ))
-
-                elif constraint_type == "AVOID_LATE_NIGHT_CLASS":
-                    late_start, late_end = constraint.constraint_value.split('-')
-                    late_start_time = parse_time_string(late_start)
-                    late_end_time = parse_time_string(late_end)
-                    late_slot = TimeSlot(day=item.day, start_time=late_start_time, end_time=late_end_time)
-                    if timeslots_overlap(timeslot, late_slot):
-                        soft_constraints_penalty += 0.5
+            
+            elif rule.kind == "EVENING_LECTURES_IN_AC_ROOMS":
+                if in_window:
+                    room = self.rooms[item.room_id]
+                    has_ac = hasattr(room, 'has_ac') and room.has_ac
+                    if not has_ac:
+                        soft_constraints_penalty += 1.0
                         chromosome.conflicts.append(Conflict(
-                            type="LATE_NIGHT_CLASS",
-                            description=f"Class scheduled during late night hours {late_start}-{late_end}",
-                            items=[ScheduleItem(
-                                course_id=item.course_id,
-                                course_name=item.course_name,
-                                lecturer_id=item.lecturer_id,
-                                lecturer_name=item.lecturer_name,
-                                room_id=item.room_id,
-                                room_name=item.room_name,
-                                day=item.day,
-                                start_time=item.start_time,
-                                end_time=item.end_time,
-                                semester=self.semester,
-                                year=self.year
-                            )],
-                            constraint=constraint.constraint_id,
+                            type="NON_AC_EVENING_CLASS",
+                            description=f"Evening class in non-AC room {item.room_id}",
+                            items=[self._constraint_item(item)],
+                            constraint=rule.constraint_id,
                             constraint_value="PREFERRED",
                             severity="soft"
                         ))
-
-                elif (constraint_type == "PRAYER_TIME_FRIDAY" or 
-                    constraint_type == "PRAYER_TIME") and item.day == "Friday":
-                    prayer_times = constraint.constraint_value.split('-')
-                    if len(prayer_times) == 2:
-                        prayer_start_time = parse_time_string(prayer_times[0])
-                        prayer_end_time = parse_time_string(prayer_times[1])
-                        prayer_slot = TimeSlot(day="Friday", start_time=prayer_start_time, end_time=prayer_end_time)
-                        if timeslots_overlap(timeslot, prayer_slot):
-                            hard_constraints_penalty += 1000
-                            chromosome.conflicts.append(Conflict(
-                                type="PRAYER_TIME_CONFLICT",
-                                description=f"Class scheduled during Friday prayer time {prayer_times[0]}-{prayer_times[1]}",
-                                items=[ScheduleItem(
-                                    course_id=item.course_id,
-                                    course_name=item.course_name,
-                                    lecturer_id=item.lecturer_id,
-                                    lecturer_name=item.lecturer_name,
-                                    room_id=item.room_id,
-                                    room_name=item.room_name,
-                                    day=item.day,
-                                    start_time=item.start_time,
-                                    end_time=item.end_time,
-                                    semester=self.semester,
-                                    year=self.year
-                                )],
-                                constraint=constraint.constraint_id,
-                                constraint_value="STRICT",
-                                severity="hard"
-                            ))
-
-                elif constraint_type == "AVOID_CONSECUTIVE_LECTURES":
-                    rest_minutes = int(constraint.constraint_value)
-                    lecturer_schedule = self.lecturer_schedules.get(item.lecturer_id, {}).get(item.day, [])
-                    for existing_slot in lecturer_schedule:
-                        gap_minutes = abs(
-                            (timeslot.start_time.hour * 60 + timeslot.start_time.minute) -
-                            (existing_slot.end_time.hour * 60 + existing_slot.end_time.minute)
-                        )
-                        if gap_minutes < rest_minutes:
-                            soft_constraints_penalty += 0.5
-                            conflicting_item = next(
-                                (x for x in chromosome.schedule_items 
-                                if x.lecturer_id == item.lecturer_id 
-                                and x.day == item.day 
-                                and x.start_time == existing_slot.start_time 
-                                and x.end_time == existing_slot.end_time),
-                                None
-                            )
-                            if conflicting_item:
-                                chromosome.conflicts.append(Conflict(
-                                    type="INSUFFICIENT_REST_TIME",
-                                    description=f"Less than {rest_minutes} minutes between classes for lecturer {item.lecturer_id}",
-                                    items=[ScheduleItem(
-                                        course_id=item.course_id,
-                                        course_name=item.course_name,
-                                        lecturer_id=item.lecturer_id,
-                                        lecturer_name=item.lecturer_name,
-                                        room_id=item.room_id,
-                                        room_name=item.room_name,
-                                        day=item.day,
-                                        start_time=item.start_time,
-                                        end_time=item.end_time,
-                                        semester=self.semester,
-                                        year=self.year
-                                    ), ScheduleItem(
-                                        course_id=conflicting_item.course_id,
-                                        course_name=conflicting_item.course_name,
-                                        lecturer_id=conflicting_item.lecturer_id,
-                                        lecturer_name=conflicting_item.lecturer_name,
-                                        room_id=conflicting_item.room_id,
-                                        room_name=conflicting_item.room_name,
-                                        day=conflicting_item.day,
-                                        start_time=conflicting_item.start_time,
-                                        end_time=conflicting_item.end_time,
-                                        semester=self.semester,
-                                        year=self.year
-                                    )],
-                                    constraint=constraint.constraint_id,
-                                    constraint_value="PREFERRED",
-                                    severity="soft"
-                                ))
-                
-                elif constraint_type == "EVENING_LECTURES_IN_AC_ROOMS":
-                    evening_start, evening_end = constraint.constraint_value.split('-')
-                    evening_start_time = parse_time_string(evening_start)
-                    evening_end_time = parse_time_string(evening_end)
-                    evening_slot = TimeSlot(day=item.day, start_time=evening_start_time, end_time=evening_end_time)
-                    if timeslots_overlap(timeslot, evening_slot):
-                        room = self.rooms[item.room_id]
-                        has_ac = hasattr(room, 'has_ac') and room.has_ac
-                        if not has_ac:
-                            soft_constraints_penalty += 1.0
-                            chromosome.conflicts.append(Conflict(
-                                type="NON_AC_EVENING_CLASS",
-                                description=f"Evening class in non-AC room {item.room_id}",
-                                items=[ScheduleItem(
-                                    course_id=item.course_id,
-                                    course_name=item.course_name,
-                                    lecturer_id=item.lecturer_id,
-                                    lecturer_name=item.lecturer_name,
-                                    room_id=item.room_id,
-                                    room_name=item.room_name,
-                                    day=item.day,
-                                    start_time=item.start_time,
-                                    end_time=item.end_time,
-                                    semester=self.semester,
-                                    year=self.year
-                                )],
-                                constraint=constraint.constraint_id,
-                                constraint_value="PREFERRED",
-                                severity="soft"
-                            ))
-        
-        course = self.courses[item.course_id]
+        
+        candidates = self.room_index[item.course_id]
         room = self.rooms[item.room_id]
-        course_name = course.course_name if hasattr(course, 'course_name') else ""
+        course_name = self.courses[item.course_id].course_name
         room_type = room.room_type if hasattr(room, 'room_type') else ""
         
-        if "Lab" in course_name and room_type != "LAB":
+        if candidates.is_lab_course and room_type != "LAB":
             hard_constraints_penalty += 5
             chromosome.conflicts.append(Conflict(
                 type="LAB_COURSE_IN_NON_LAB_ROOM",
                 description=f"Lab course {course_name} scheduled in non-lab room {room.room_name}",
-                items=[ScheduleItem(
-                    course_id=item.course_id,
-                    course_name=item.course_name,
-                    lecturer_id=item.lecturer_id,
-                    lecturer_name=item.lecturer_name,
-                    room_id=item.room_id,
-                    room_name=item.room_name,
-                    day=item.day,
-                    start_time=item.start_time,
-                    end_time=item.end_time,
-                    semester=self.semester,
-                    year=self.year
-                )],
+                items=[self._constraint_item(item)],
                 constraint="HC11",
                 constraint_value="STRICT",
                 severity="hard"
             ))
         
-        if any(suffix in course_name.split() for suffix in ["A", "B", "C", "D"]) and room_type != "LAB":
+        if candidates.is_lettered_course and room_type != "LAB":
             soft_constraints_penalty += 0.8
             chromosome.conflicts.append(Conflict(
                 type="LETTERED_COURSE_IN_NON_LAB_ROOM",
                 description=f"Lettered course {course_name} scheduled in non-lab room {room.room_name}",
-                items=[ScheduleItem(
-                    course_id=item.course_id,
-                    course_name=item.course_name,
-                    lecturer_id=item.lecturer_id,
-                    lecturer_name=item.lecturer_name,
-                    room_id=item.room_id,
-                    room_name=item.room_name,
-                    day=item.day,
-                    start_time=item.start_time,
-                    end_time=item.end_time,
-                    semester=self.semester,
-                    year=self.year
-                )],
+                items=[self._constraint_item(item)],
                 constraint="SC3",
                 constraint_value="PREFERRED",
                 severity="soft"
             ))
         
-        class_start_minutes = timeslot.start_time.hour * 60 + timeslot.start_time.minute
-        class_end_minutes = timeslot.end_time.hour * 60 + timeslot.end_time.minute
-        
         earliest_allowed = STARTING_HOUR * 60 + STARTING_MINUTE
         latest_allowed = ENDING_HOUR * 60 + ENDING_MINUTE
         
@@ -1081,19 +2671,7 @@ class TimetableGenerator:
             chromosome.conflicts.append(Conflict(
                 type="OUTSIDE_ALLOWED_HOURS",
                 description=f"Class scheduled outside allowed hours (8:30-18:30)",
-                items=[ScheduleItem(
-                    course_id=item.course_id,
-                    course_name=item.course_name,
-                    lecturer_id=item.lecturer_id,
-                    lecturer_name=item.lecturer_name,
-                    room_id=item.room_id,
-                    room_name=item.room_name,
-                    day=item.day,
-                    start_time=item.start_time,
-                    end_time=item.end_time,
-                    semester=self.semester,
-                    year=self.year
-                )],
+                items=[self._constraint_item(item)],
                 constraint="HC12",
                 constraint_value="STRICT",
                 severity="hard"
@@ -1104,8 +2682,85 @@ class TimetableGenerator:
     
     def evaluate_population(self):
         """Calculate fitness for all chromosomes in the population"""
-        for chromosome in self.population:
+        population = self.population
+        if self.delta_evaluation:
+            # Chromosomes carrying a FitnessState were already re-scored by move_gene
+            population = [c for c in population if getattr(c, 'state', None) is None]
+        if not population:
+            return
+        if self.fitness_cache is not None:
+            self._evaluate_population_cached(population)
+            return
+        self._evaluate_population_uncached(population)
+
+    def _evaluate_population_cached(self, population: List[Chromosome]):
+        """
+        Take scores from fitness_cache where it has them. Of the rest, only
+        the first chromosome of each genome is evaluated; its repeats are
+        then served from the cache as well.
+        """
+        cache = self.fitness_cache
+        pending = {}
+        for chromosome in population:
+            key = cache.key(chromosome)
+            if key in pending:
+                pending[key].append(chromosome)
+            elif not cache.load(key, chromosome):
+                pending[key] = [chromosome]
+        if not pending:
+            return
+        self._evaluate_population_uncached([group[0] for group in pending.values()])
+        for key, group in pending.items():
+            cache.store(key, group[0])
+            for chromosome in group[1:]:
+                cache.load(key, chromosome)
+
+    def _evaluate_population_uncached(self, population: List[Chromosome]):
+        if self.parallel_evaluation and len(population) > 1:
+            self._evaluate_population_parallel(population)
+            return
+        if self.fitness_evaluator == "vectorized" and \
+                all(isinstance(chromosome, ArrayChromosome) for chromosome in population):
+            self._evaluate_population_batch(population)
+            return
+        for chromosome in population:
             chromosome.fitness = self.calculate_fitness(chromosome)
+
+    def _evaluate_population_parallel(self, population: List[Chromosome]):
+        """
+        Split the population across the worker pool. Only genomes go out and
+        (fitness, hard, soft) tuples come back, so conflicts are left empty.
+        """
+        self._initialize_pool()
+        chunks = [chunk for chunk in np.array_split(np.arange(len(population)), self.n_workers) if len(chunk)]
+        payloads = []
+        for chunk in chunks:
+            members = [population[i] for i in chunk]
+            if all(isinstance(chromosome, ArrayChromosome) for chromosome in members):
+                payloads.append(stack_population(members))
+            else:
+                payloads.append([chromosome.schedule_items for chromosome in members])
+        
+        for chunk, results in zip(chunks, self.pool.map(_evaluate_chunk, payloads)):
+            for i, (fitness, hard, soft) in zip(chunk, results):
+                chromosome = population[i]
+                chromosome.fitness = fitness
+                chromosome.hard_violations = hard
+                chromosome.soft_violations = soft
+                chromosome.conflicts = []
+
+    def _evaluate_population_batch(self, population: List[ArrayChromosome]):
+        """Score every ArrayChromosome with one evaluate_population_vectorized call"""
+        room_idx, day_idx, period_idx = stack_population(population)
+        fitness, hard_violations, soft_violations = evaluate_population_vectorized(
+            self.genome_tables, self.genome_tables.gene_course, room_idx, day_idx, period_idx
+        )
+        for chromosome, f, hard, soft in zip(population, fitness.tolist(), hard_violations.tolist(),
+                                             soft_violations.tolist()):
+            chromosome.fitness = f
+            chromosome.hard_violations = hard
+            chromosome.soft_violations = soft
+            chromosome.conflicts = []
     
     def tournament_selection(self) -> Chromosome:
         tournament = random.sample(self.population, self.tournament_size)
@@ -1114,36 +2769,140 @@ class TimetableGenerator:
     
     def crossover(self, parent1: Chromosome, parent2: Chromosome) -> Tuple[Chromosome, Chromosome]:
         if random.random() > self.crossover_rate:
-            return parent1.copy(), parent2.copy()
-        
-        p1_items_by_course = {item.course_id: item for item in parent1.schedule_items}
-        p2_items_by_course = {item.course_id: item for item in parent2.schedule_items}
+            child1, child2 = parent1.copy(), parent2.copy()
+            child1.origin = (None, None, parent1.fitness)
+            child2.origin = (None, None, parent2.fitness)
+            return child1, child2
         
-        child1_items = []
-        child2_items = []
-        
-        all_courses = set(list(p1_items_by_course.keys()) + list(p2_items_by_course.keys()))
+        crossover_type = self.crossover_operators.choose() if self.adaptive else self.crossover_type
+        # A crossover counts as a success when a child beats both parents
+        reference = max(parent1.fitness, parent2.fitness)
+        if isinstance(parent1, ArrayChromosome):
+            child1, child2 = self._crossover_array(parent1, parent2, crossover_type)
+        else:
+            child1, child2 = self._crossover_items(parent1, parent2, crossover_type)
+        child1.origin = child2.origin = (crossover_type, None, reference)
+        return child1, child2
+    
+    def _course_masks(self, crossover_type: str, n_courses: int, placements) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Per course, whether child 1 and child 2 take its sessions from parent 1
+        rather than parent 2. ``placements()`` returns, for each parent, the
+        days and the room, lecturer and student group cells of every course's
+        sessions; only the day and resource crossovers need it.
+        """
+        if crossover_type == "block":
+            from_parent1 = np.array([random.random() < 0.5 for _ in range(n_courses)], dtype=bool)
+            return from_parent1, ~from_parent1
         
-        for course_id in all_courses:
-            if course_id in p1_items_by_course and course_id in p2_items_by_course:
-                if random.random() < 0.5:
-                    child1_items.append(p1_items_by_course[course_id])
-                    child2_items.append(p2_items_by_course[course_id])
-                else:
-                    child1_items.append(p2_items_by_course[course_id])
-                    child2_items.append(p1_items_by_course[course_id])
-            elif course_id in p1_items_by_course:
-                child1_items.append(p1_items_by_course[course_id])
-                child2_items.append(self._create_random_schedule_item(course_id))
+        (days1, cells1), (days2, cells2) = placements()
+        if crossover_type == "day":
+            # Each child keeps its own parent's courses held entirely on the drawn days
+            drawn = {day for day in range(len(WEEKDAYS)) if random.random() < 0.5}
+            return (np.array([bool(days) and days <= drawn for days in days1], dtype=bool),
+                    np.array([not (days and days <= drawn) for days in days2], dtype=bool))
+        # Child 2 takes every course child 1 did not, so no parent's sessions are lost
+        from_parent1 = self._least_clashing_courses(cells1, cells2)
+        return from_parent1, ~from_parent1
+    
+    @staticmethod
+    def _least_clashing_courses(cells1: list, cells2: list) -> np.ndarray:
+        """
+        Resource-aware child: courses in random order, each from the parent
+        whose sessions hit fewer cells already taken in the child, at random
+        on a tie. Returns whether each course comes from parent 1.
+        """
+        from_parent1 = np.zeros(len(cells1), dtype=bool)
+        order = list(range(len(cells1)))
+        random.shuffle(order)
+        occupied = set()
+        for c in order:
+            if not cells2[c]:
+                take_first = True
+            elif not cells1[c]:
+                take_first = False
             else:
-                child2_items.append(p2_items_by_course[course_id])
-                child1_items.append(self._create_random_schedule_item(course_id))
+                clashes1 = sum(cell in occupied for cell in cells1[c])
+                clashes2 = sum(cell in occupied for cell in cells2[c])
+                take_first = clashes1 < clashes2 or (clashes1 == clashes2 and random.random() < 0.5)
+            from_parent1[c] = take_first
+            occupied.update(cells1[c] if take_first else cells2[c])
+        return from_parent1
+    
+    def _crossover_items(self, parent1: Chromosome, parent2: Chromosome,
+                         crossover_type: str = "block") -> Tuple[Chromosome, Chromosome]:
+        """Crossover of ScheduleItem chromosomes carrying all sessions of each course"""
+        items_by_course = []
+        for parent in (parent1, parent2):
+            by_course = defaultdict(list)
+            for item in parent.schedule_items:
+                by_course[item.course_id].append(item)
+            items_by_course.append(by_course)
+        course_ids = sorted(set(items_by_course[0]) | set(items_by_course[1]))
         
-        child1 = Chromosome(child1_items)
-        child2 = Chromosome(child2_items)
+        def placements():
+            result = []
+            for by_course in items_by_course:
+                days, cells = [], []
+                for course_id in course_ids:
+                    student_group = getattr(self.courses.get(course_id), 'student_group', course_id)
+                    days.append({DAY_INDEX.get(item.day, -1) for item in by_course[course_id]})
+                    cells.append([cell for item in by_course[course_id] for cell in (
+                        ('room', item.room_id, item.day, item.start_time),
+                        ('lecturer', item.lecturer_id, item.day, item.start_time),
+                        ('group', student_group, item.day, item.start_time),
+                    )])
+                result.append((days, cells))
+            return result
         
-        return child1, child2
+        children = []
+        for from_parent1 in self._course_masks(crossover_type, len(course_ids), placements):
+            child_items = []
+            for course_id, first in zip(course_ids, from_parent1):
+                primary, fallback = items_by_course if first else items_by_course[::-1]
+                # A course only one parent schedules comes from that parent
+                child_items.extend(primary.get(course_id) or fallback.get(course_id, []))
+            children.append(Chromosome(child_items))
+        # The children share the parents' items, as with Chromosome.copy
+        parent1._owned = set()
+        parent2._owned = set()
+        return children[0], children[1]
     
+    def _crossover_array(self, parent1: ArrayChromosome, parent2: ArrayChromosome,
+                         crossover_type: str = "block") -> Tuple[ArrayChromosome, ArrayChromosome]:
+        """Crossover of ArrayChromosomes swapping whole courses, like _crossover_items"""
+        tables = self.genome_tables
+        n_courses = len(tables.course_ids)
+        
+        def placements():
+            n_slots = len(DAYS) * PERIODS_PER_DAY
+            n_rooms, n_lecturers = len(tables.room_ids), len(tables.lecturer_ids)
+            result = []
+            for parent in (parent1, parent2):
+                slot = parent.day_idx.astype(np.int64) * PERIODS_PER_DAY + parent.period_idx
+                gene_cells = np.stack([
+                    parent.room_idx.astype(np.int64) * n_slots + slot,
+                    (n_rooms + tables.gene_lecturer.astype(np.int64)) * n_slots + slot,
+                    (n_rooms + n_lecturers + tables.gene_group.astype(np.int64)) * n_slots + slot,
+                ], axis=1)
+                days = [set() for _ in range(n_courses)]
+                cells = [[] for _ in range(n_courses)]
+                for c, day, cell in zip(parent.course_idx.tolist(), parent.day_idx.tolist(), gene_cells.tolist()):
+                    days[c].add(day)
+                    cells[c].extend(cell)
+                result.append((days, cells))
+            return result
+        
+        children = []
+        for from_parent1 in self._course_masks(crossover_type, n_courses, placements):
+            from_parent1 = from_parent1[parent1.course_idx]
+            children.append(ArrayChromosome(
+                parent1.course_idx,
+                np.where(from_parent1, parent1.room_idx, parent2.room_idx),
+                np.where(from_parent1, parent1.day_idx, parent2.day_idx),
+                np.where(from_parent1, parent1.period_idx, parent2.period_idx)
+            ))
+        return children[0], children[1]
     
     def _create_random_schedule_item(self, course_id: str) -> ScheduleItem:
         """Create a random schedule item for a course with room diversity in mind"""
@@ -1156,46 +2915,26 @@ class TimetableGenerator:
         if not assigned_lecturer_id:
             assigned_lecturer_id = random.choice(list(self.lecturers.keys()))
         
-        # Check if this is a lab course or lettered course    
-        course_name = course.course_name if hasattr(course, 'course_name') else ""
-        is_lab_course = "Lab" in course_name
-        is_lettered_course = any(suffix in course_name.split() for suffix in ["A", "B", "C", "D"])
-        
         # Identify student group for this course
         student_group = course.student_group if hasattr(course, 'student_group') else course_id
         
         # Find suitable rooms based on course type
-        suitable_rooms = []
-        if is_lab_course:
-            # Try to find LAB rooms with sufficient capacity
-            lab_rooms = [r_id for r_id, r in self.rooms.items() 
-                        if hasattr(r, 'room_type') and r.room_type == "LAB" 
-                        and r.capacity >= course.no_of_students]
-            
-            if lab_rooms:
-                suitable_rooms = lab_rooms
-            else:
-                # Fallback to any room with sufficient capacity
-                suitable_rooms = [r_id for r_id, r in self.rooms.items() 
-                                if r.capacity >= course.no_of_students]
-        elif is_lettered_course:
+        candidates = self.room_index[course_id]
+        if candidates.is_lab_course:
+            # LAB rooms with sufficient capacity, else any room with sufficient capacity
+            suitable_rooms = candidates.lab or candidates.sufficient
+        elif candidates.is_lettered_course:
             # For lettered courses, prefer LAB rooms but don't require them
-            lab_rooms = [r_id for r_id, r in self.rooms.items() 
-                        if hasattr(r, 'room_type') and r.room_type == "LAB" 
-                        and r.capacity >= course.no_of_students]
-            
-            if lab_rooms and random.random() < 0.7:  # 70% chance to use a LAB room
-                suitable_rooms = lab_rooms
+            if candidates.lab and random.random() < 0.7:  # 70% chance to use a LAB room
+                suitable_rooms = candidates.lab
             else:
-                suitable_rooms = [r_id for r_id, r in self.rooms.items() 
-                                if r.capacity >= course.no_of_students]
+                suitable_rooms = candidates.sufficient
         else:
             # For other courses, any room with sufficient capacity
-            suitable_rooms = [r_id for r_id, r in self.rooms.items() 
-                            if r.capacity >= course.no_of_students]
+            suitable_rooms = candidates.sufficient
         
         if not suitable_rooms:
-            suitable_rooms = list(self.rooms.keys())
+            suitable_rooms = tuple(self.rooms.keys())
         
         # ENHANCED ROOM SELECTION: 
         # 1. Check which rooms this student group has already used in the current chromosome
@@ -1237,27 +2976,62 @@ class TimetableGenerator:
     def mutate(self, chromosome: Chromosome) -> Chromosome:
         if random.random() > self.mutation_rate:
             return chromosome
-        
+        return self._apply_mutation(chromosome)
+    
+    def _apply_mutation(self, chromosome: Chromosome) -> Chromosome:
+        """Mutated copy of a chromosome, tagged with the mutation type for adaptive control"""
+        if isinstance(chromosome, ArrayChromosome):
+            mutated, mutation_type = self._mutate_array(chromosome)
+        else:
+            mutated, mutation_type = self._mutate_items(chromosome)
+        crossover_type, _, reference = chromosome.origin or (None, None, chromosome.fitness)
+        mutated.origin = (crossover_type, mutation_type, reference)
+        return mutated
+    
+    def _choose_mutation_type(self) -> str:
+        if self.adaptive:
+            return self.mutation_operators.choose()
+        if self.guided_mutation:
+            return CONFLICT_MUTATION
+        return random.choice(MUTATION_TYPES)
+    
+    def _mutate_items(self, chromosome: Chromosome) -> Tuple[Chromosome, str]:
+        """Change the time, room or day of one ScheduleItem; returns (mutant, mutation type)"""
         mutated = chromosome.copy()
         
         if not mutated.schedule_items:
-            return mutated
+            return mutated, None
         
         item_idx = random.randint(0, len(mutated.schedule_items) - 1)
-        item = mutated.schedule_items[item_idx]
+        mutation_type = self._choose_mutation_type()
+        if mutation_type == CONFLICT_MUTATION:
+            weights = self._item_conflict_counts(mutated)
+            if any(weights):
+                item_idx = random.choices(range(len(weights)), weights=weights)[0]
+            else:
+                mutation_type = random.choice(MUTATION_TYPES)
+        item = mutated.item_for_write(item_idx)
         
-        mutation_type = random.choice(["time", "room", "day"])
+        if mutation_type == CONFLICT_MUTATION:
+            # A free timeslot first, unless the room itself is the problem
+            timeslot = None
+            if item.room_id in self.room_index[item.course_id].sufficient:
+                timeslot = self._find_alternative_timeslot(item, mutated)
+            if timeslot is not None:
+                item.day, item.start_time, item.end_time = timeslot.day, timeslot.start_time, timeslot.end_time
+            else:
+                alternative = self._find_alternative_room(item, mutated)
+                if alternative is not None:
+                    item.room_id, item.room_name = alternative.room_id, alternative.room_name
         
-        if mutation_type == "time":
+        elif mutation_type == "time":
             period = random.randint(1, PERIODS_PER_DAY)
             start_time, end_time = period_to_time(period)
             item.start_time = start_time
             item.end_time = end_time
         
         elif mutation_type == "room":
-            course = self.courses[item.course_id]
-            suitable_rooms = [r_id for r_id, r in self.rooms.items() 
-                            if r.capacity >= course.no_of_students]
+            suitable_rooms = self.room_index[item.course_id].sufficient
             if suitable_rooms:
                 item.room_id = random.choice(suitable_rooms)
                 item.room_name = self.rooms[item.room_id].room_name
@@ -1271,10 +3045,381 @@ class TimetableGenerator:
             item.lecturer_id = expected_lecturer
             item.lecturer_name = self.lecturers[expected_lecturer].lecturer_name
         
-        return mutated
+        return mutated, mutation_type
+    
+    def _mutate_array(self, chromosome: ArrayChromosome) -> Tuple[ArrayChromosome, str]:
+        """Change the time, room or day of one gene; returns (mutant, mutation type)"""
+        mutated = chromosome.copy()
+        if not len(mutated):
+            return mutated, None
+        
+        tables = self.genome_tables
+        gene = random.randrange(len(mutated))
+        mutation_type = self._choose_mutation_type()
+        if mutation_type == CONFLICT_MUTATION:
+            weights = self.gene_conflict_counts(mutated)
+            if weights.any():
+                gene = random.choices(range(len(weights)), weights=weights.tolist())[0]
+            else:
+                mutation_type = random.choice(MUTATION_TYPES)
+        room, day, period = mutated.room_idx[gene], mutated.day_idx[gene], mutated.period_idx[gene]
+        domain = self._course_domain(int(mutated.course_idx[gene]))
+        
+        if mutation_type == CONFLICT_MUTATION:
+            placement = self._free_array_placement(mutated, gene)
+            if placement is None:
+                placement = self._random_domain_placement(int(mutated.course_idx[gene]))
+            if placement is not None:
+                room, day, period = placement
+        elif domain is not None:
+            # Only values the pre-solve left; jump elsewhere in the domain when none is
+            if mutation_type == "time":
+                options = np.flatnonzero(domain[room, day])
+            elif mutation_type == "room":
+                options = np.flatnonzero(domain[:, day, period])
+            else:
+                options = np.flatnonzero(domain[room, :, period])
+            if len(options) == 0:
+                room, day, period = self._random_domain_placement(int(mutated.course_idx[gene]))
+            elif mutation_type == "time":
+                period = random.choice(options)
+            elif mutation_type == "room":
+                room = random.choice(options)
+            else:
+                day = random.choice(options)
+        elif mutation_type == "time":
+            period = random.randrange(PERIODS_PER_DAY)
+        elif mutation_type == "room":
+            suitable_rooms = tables.course_sufficient_rooms[mutated.course_idx[gene]]
+            if len(suitable_rooms):
+                room = random.choice(suitable_rooms)
+        elif mutation_type == "day":
+            day = random.randrange(5)  # Ensure no weekends
+        
+        if self.delta_evaluation:
+            self.move_gene(mutated, gene, room, day, period)
+        else:
+            mutated.room_idx[gene], mutated.day_idx[gene], mutated.period_idx[gene] = room, day, period
+        return mutated, mutation_type
+    
+    def move_gene(self, chromosome: ArrayChromosome, gene: int, room: int, day: int, period: int):
+        """
+        Reassign one gene in place and re-score the chromosome from its
+        FitnessState. Only the room, lecturer and student-group cells the gene
+        leaves and enters are recounted; the state is built on first use.
+        """
+        tables = self.genome_tables
+        if chromosome.state is None:
+            chromosome.state = build_fitness_state(tables, chromosome)
+        state = chromosome.state
+        course = int(chromosome.course_idx[gene])
+        old_room, old_day, old_period = int(chromosome.room_idx[gene]), int(chromosome.day_idx[gene]), int(chromosome.period_idx[gene])
+        room, day, period = int(room), int(day), int(period)
+        old_slot = old_day * PERIODS_PER_DAY + old_period
+        new_slot = day * PERIODS_PER_DAY + period
+        
+        state.flag_counts[:, course] -= _gene_flags(tables, course, old_room, old_day, old_period)
+        state.flag_counts[:, course] += _gene_flags(tables, course, room, day, period)
+        state.slot_counts[old_slot] -= 1
+        state.slot_counts[new_slot] += 1
+        
+        lecturer, group = int(tables.gene_lecturer[gene]), int(tables.gene_group[gene])
+        for cells, keys, old_cell, new_cell in zip(state.cells, state.overlap_keys,
+                                                   ((old_room, old_slot), (lecturer, old_slot), (group, old_slot)),
+                                                   ((room, new_slot), (lecturer, new_slot), (group, new_slot))):
+            if old_cell == new_cell:
+                continue
+            leaving = cells[old_cell]
+            _unkey_cell(keys, leaving)
+            del leaving[gene]
+            if leaving:
+                _key_cell(keys, leaving)
+            else:
+                del cells[old_cell]
+            entering = cells.setdefault(new_cell, {})
+            _unkey_cell(keys, entering)
+            entering[gene] = course
+            _key_cell(keys, entering)
+        
+        chromosome.room_idx[gene], chromosome.day_idx[gene], chromosome.period_idx[gene] = room, day, period
+        chromosome.fitness, chromosome.hard_violations, chromosome.soft_violations = score_fitness_state(state)
+        chromosome.conflicts = []
+    
+    def gene_conflict_counts(self, chromosome: ArrayChromosome) -> np.ndarray:
+        """
+        Number of hard violations each gene is involved in: its failed per-gene
+        hard checks (GENE_FLAGS) plus one per room, lecturer or student group
+        cell it shares with another course.
+        """
+        tables = self.genome_tables
+        course = chromosome.course_idx.astype(np.int64)
+        flags = _gene_flags(tables, course, chromosome.room_idx, chromosome.day_idx, chromosome.period_idx)
+        counts = flags[:len(GENE_FLAG_HARD_PENALTIES)].sum(axis=0, dtype=np.int64)
+        n_courses = len(tables.course_ids)
+        n_slots = len(DAYS) * PERIODS_PER_DAY
+        slot = chromosome.day_idx.astype(np.int64) * PERIODS_PER_DAY + chromosome.period_idx
+        for resource in (chromosome.room_idx, tables.gene_lecturer, tables.gene_group):
+            cell = resource.astype(np.int64) * n_slots + slot
+            cells, distinct_courses = np.unique(np.unique(cell * n_courses + course) // n_courses, return_counts=True)
+            counts += np.isin(cell, cells[distinct_courses > 1])
+        return counts
+
+    def conflicting_genes(self, chromosome: ArrayChromosome) -> np.ndarray:
+        """Indices of the genes involved in a hard violation (gene_conflict_counts)"""
+        return np.flatnonzero(self.gene_conflict_counts(chromosome))
+
+    def _free_array_placement(self, chromosome: ArrayChromosome, gene: int) -> Optional[Tuple[int, int, int]]:
+        """
+        Random (room, day, period) in a gene's domain, or among its sufficient
+        rooms and the valid slots without one, where the room, the lecturer and
+        the student group are free of the other genes and of other timetables.
+        None if no such placement is left.
+        """
+        tables = self.genome_tables
+        c_idx = int(chromosome.course_idx[gene])
+        lecturer = int(tables.gene_lecturer[gene])
+        domain = self._course_domain(c_idx)
+        if domain is None:
+            slot_ok = np.zeros((len(DAYS), PERIODS_PER_DAY), dtype=bool)
+            for day, period in tables.valid_slots:
+                slot_ok[day, period] = True
+            domain = np.zeros(tables.room_reserved.shape, dtype=bool)
+            domain[tables.course_sufficient_rooms[c_idx]] = slot_ok
+            domain &= ~tables.room_reserved & ~tables.lecturer_reserved[lecturer][None]
+        
+        # Occupancy of the other genes
+        others = np.arange(len(chromosome)) != gene
+        room_busy = np.zeros(domain.shape, dtype=bool)
+        room_busy[chromosome.room_idx[others], chromosome.day_idx[others], chromosome.period_idx[others]] = True
+        shared = others & ((tables.gene_lecturer == lecturer) | (tables.gene_group == tables.gene_group[gene]))
+        person_busy = np.zeros((len(DAYS), PERIODS_PER_DAY), dtype=bool)
+        person_busy[chromosome.day_idx[shared], chromosome.period_idx[shared]] = True
+        
+        free = np.flatnonzero(domain & ~room_busy & ~person_busy[None])
+        if not len(free):
+            return None
+        return tuple(int(i) for i in np.unravel_index(random.choice(free), domain.shape))
+
+    def _item_conflict_counts(self, chromosome: Chromosome) -> List[int]:
+        """
+        Number of hard violations each ScheduleItem is involved in, worked out
+        from the items themselves like gene_conflict_counts: its failed
+        per-item hard checks (HC3, HC4, HC7, HC13, reserved slots) plus one per
+        room, lecturer or student group it shares with another course at an
+        overlapping time. Needs no evaluation, so unevaluated crossover
+        children are guided too.
+        """
+        items = chromosome.schedule_items
+        spans = [schedule_span(item.day, item.start_time, item.end_time) for item in items]
+        counts = [0] * len(items)
+        bookings = defaultdict(list)  # {(resource kind, resource, day): [item index]}
+        for i, (item, span) in enumerate(zip(items, spans)):
+            course = self.courses.get(item.course_id)
+            if not course:
+                counts[i] += 1
+                continue
+            room = self.rooms.get(item.room_id)
+            counts[i] += bool(room and room.capacity < course.no_of_students)
+            counts[i] += "Lab" in course.course_name and getattr(room, 'room_type', '') != "LAB"
+            counts[i] += span_in_prayer_time(span)
+            expected_lecturer = self.course_lecturer_mapping.get(item.course_id)
+            counts[i] += bool(expected_lecturer and expected_lecturer != item.lecturer_id)
+            if self.reserved is not None:
+                counts[i] += span_hits_slots(span, self.reserved.rooms.get(item.room_id))
+                counts[i] += span_hits_slots(span, self.reserved.lecturers.get(item.lecturer_id))
+            bookings['room', item.room_id, item.day].append(i)
+            bookings['lecturer', item.lecturer_id, item.day].append(i)
+            bookings['group', getattr(course, 'student_group', item.course_id), item.day].append(i)
+        for booked in bookings.values():
+            for i in booked:
+                counts[i] += any(
+                    items[j].course_id != items[i].course_id and spans_overlap(spans[i], spans[j])
+                    for j in booked
+                )
+        return counts
+
+    def tabu_search(self, chromosome: ArrayChromosome, max_steps: int = 10, neighbours: int = 8,
+                    tabu_tenure: int = 7) -> ArrayChromosome:
+        """
+        Bounded tabu search on the genes in hard violations. Each step samples
+        ``neighbours`` moves (a conflicting gene to another suitable room and
+        slot) and swaps (a conflicting gene trading placements with any other
+        gene), all delta-evaluated through move_gene, and takes the best one
+        even if it is worse. Placements a gene left in the last ``tabu_tenure``
+        steps are tabu unless they beat the best schedule seen. Works on
+        ``chromosome`` in place and returns the best schedule visited.
+        """
+        tables = self.genome_tables
+        if chromosome.state is None:
+            chromosome.state = build_fitness_state(tables, chromosome)
+            chromosome.fitness, chromosome.hard_violations, chromosome.soft_violations = score_fitness_state(chromosome.state)
+        best = chromosome.copy()
+        tabu = deque(maxlen=tabu_tenure)
+        for _ in range(max_steps):
+            conflicting = self.conflicting_genes(chromosome)
+            if not len(conflicting):
+                break
+            best_step = None
+            best_step_fitness = -1.0
+            for _ in range(neighbours):
+                moves = self._sample_neighbour(chromosome, conflicting)
+                if moves is None:
+                    continue
+                undo = self._undo_moves(chromosome, moves)
+                for move in moves:
+                    self.move_gene(chromosome, *move)
+                fitness = chromosome.fitness
+                is_tabu = any(move in tabu for move in moves)
+                if fitness > best_step_fitness and (not is_tabu or fitness > best.fitness):
+                    best_step, best_step_fitness = (moves, undo), fitness
+                for move in reversed(undo):
+                    self.move_gene(chromosome, *move)
+            if best_step is None:
+                continue
+            moves, undo = best_step
+            for move in moves:
+                self.move_gene(chromosome, *move)
+            tabu.extend(undo)
+            if chromosome.fitness > best.fitness:
+                best = chromosome.copy()
+        return chromosome if chromosome.fitness >= best.fitness else best
+
+    def _sample_neighbour(self, chromosome: ArrayChromosome, genes) -> Optional[tuple]:
+        """
+        Random neighbour of a chromosome as (gene, room, day, period) moves:
+        one of ``genes`` to another suitable room and slot, or one of ``genes``
+        swapping placements with any gene. None for a swap within one course.
+        """
+        tables = self.genome_tables
+        room_idx, day_idx, period_idx = chromosome.room_idx, chromosome.day_idx, chromosome.period_idx
+        gene = int(random.choice(genes))
+        if random.random() < 0.5:
+            placement = self._random_domain_placement(int(chromosome.course_idx[gene]))
+            if placement is not None:
+                return ((gene,) + placement,)
+            rooms = tables.course_sufficient_rooms[chromosome.course_idx[gene]]
+            room = int(random.choice(rooms)) if len(rooms) else int(room_idx[gene])
+            return ((gene, room) + tuple(random.choice(tables.valid_slots)),)
+        other = random.randrange(len(chromosome))
+        if chromosome.course_idx[other] == chromosome.course_idx[gene]:
+            return None
+        return ((gene, int(room_idx[other]), int(day_idx[other]), int(period_idx[other])),
+                (other, int(room_idx[gene]), int(day_idx[gene]), int(period_idx[gene])))
+
+    @staticmethod
+    def _undo_moves(chromosome: ArrayChromosome, moves) -> List[tuple]:
+        """Moves restoring the current placement of the genes in ``moves``"""
+        return [(gene, int(chromosome.room_idx[gene]), int(chromosome.day_idx[gene]), int(chromosome.period_idx[gene]))
+                for gene, *_ in moves]
+
+    def _memetic_step(self):
+        """Replace the best memetic_elite chromosomes with their tabu_search results"""
+        ranked = sorted(range(len(self.population)), key=lambda i: self.population[i].fitness, reverse=True)
+        for i in ranked[:self.memetic_elite]:
+            improved = self.tabu_search(self.population[i], self.memetic_steps, self.memetic_neighbours,
+                                        self.tabu_tenure)
+            if not self.delta_evaluation:
+                # Without delta evaluation genes change without move_gene, which would leave the state stale
+                improved.state = None
+            self.population[i] = improved
+
+    def adapt(self):
+        """
+        Adaptive control after a generation has been evaluated: credit each
+        new chromosome's crossover and mutation type with whether it beat its
+        parent, re-weight the operators, and set the mutation rate and
+        tournament size from the population's diversity. A converged
+        population (few distinct fitness values) gets a growing mutation
+        rate and binary tournaments; once diversity is back both return
+        towards their configured values.
+        """
+        for chromosome in self.population:
+            if chromosome.origin is None:
+                continue
+            crossover_type, mutation_type, reference = chromosome.origin
+            improved = chromosome.fitness > reference
+            if crossover_type is not None:
+                self.crossover_operators.record(crossover_type, improved)
+            if mutation_type is not None:
+                self.mutation_operators.record(mutation_type, improved)
+            chromosome.origin = None
+        self.mutation_operators.update()
+        self.crossover_operators.update()
+        
+        if self.population_diversity() < DIVERSITY_FLOOR:
+            self.mutation_rate = min(MAX_ADAPTIVE_MUTATION_RATE, self.mutation_rate * 1.5)
+            self.tournament_size = 2
+        else:
+            self.mutation_rate = max(self.base_mutation_rate, self.mutation_rate * 0.9)
+            self.tournament_size = self.base_tournament_size
+    
+    def population_diversity(self) -> float:
+        """Share of distinct fitness values in the population, a cheap convergence signal"""
+        if not self.population:
+            return 0.0
+        return len({chromosome.fitness for chromosome in self.population}) / len(self.population)
+    
+    def _replace_duplicates(self, population: List[Chromosome]) -> int:
+        """
+        Replace every repeat of a genome met earlier in the population (so
+        the elites at its head are kept) with a mutant of it, retried up to
+        DUPLICATE_RETRIES times until the genome is new. Returns the number
+        of chromosomes replaced.
+        """
+        seen = set()
+        replaced = 0
+        for i, chromosome in enumerate(population):
+            key = chromosome.genome_key()
+            if key in seen:
+                for _ in range(DUPLICATE_RETRIES):
+                    chromosome = self._apply_mutation(chromosome)
+                    key = chromosome.genome_key()
+                    if key not in seen:
+                        break
+                population[i] = chromosome
+                replaced += 1
+            seen.add(key)
+        return replaced
+    
+    def _slot_matrix(self) -> np.ndarray:
+        """
+        (population, genes) matrix of slot ids: the day and period of every
+        gene of ArrayChromosomes. ScheduleItem chromosomes are laid out per
+        course with its sessions in slot order, -1 for a missing or off-grid one.
+        """
+        if isinstance(self.population[0], ArrayChromosome):
+            _, day_idx, period_idx = stack_population(self.population)
+            return day_idx.astype(np.int64) * PERIODS_PER_DAY + period_idx
+        course_ids = sorted(self.courses)
+        sessions = [getattr(self.courses[course_id], 'sessions_count', 1) for course_id in course_ids]
+        rows = []
+        for chromosome in self.population:
+            slots_by_course = defaultdict(list)
+            for item in chromosome.schedule_items:
+                slot_id = schedule_span(item.day, item.start_time, item.end_time)[0]
+                slots_by_course[item.course_id].append(-1 if slot_id is None else slot_id)
+            row = []
+            for course_id, n_sessions in zip(course_ids, sessions):
+                slots = sorted(slots_by_course[course_id])[:n_sessions]
+                row.extend(slots + [-1] * (n_sessions - len(slots)))
+            rows.append(row)
+        return np.array(rows, dtype=np.int64)
+    
+    def diversity_metrics(self) -> dict:
+        """Distinct genomes and mean pairwise Hamming distance of the slot matrix of the population"""
+        slots = self._slot_matrix()
+        return {
+            'unique_genomes': len({chromosome.genome_key() for chromosome in self.population}),
+            'population': len(self.population),
+            'mean_hamming_distance': mean_pairwise_hamming(slots),
+            'genes': slots.shape[1],
+            'duplicates_replaced': self.duplicates_replaced,
+        }
     
     def evolve(self):
         """Evolve the population for one generation"""
+        if self.memetic:
+            self._memetic_step()
         new_population = []
         
         # Apply elitism - keep the best chromosomes
@@ -1295,6 +3440,8 @@ class TimetableGenerator:
             if len(new_population) < self.population_size:
                 new_population.append(mutated_child2)
         
+        if self.deduplicate:
+            self.duplicates_replaced = self._replace_duplicates(new_population)
         self.population = new_population
     
     def run(self):
@@ -1303,32 +3450,73 @@ class TimetableGenerator:
             return Chromosome()
         
         print("Starting genetic algorithm optimization...")
+        self._presolve_if_used()
         
-        # Generate initial population with distributed timeslots
-        self.initialize_population()
-        for i, chromosome in enumerate(self.population):
-            self.population[i] = self._distribute_timeslots(chromosome)
+        try:
+            resume_state = None
+            if self.resume and self.checkpoint_path and os.path.exists(self.checkpoint_path):
+                resume_state = self.load_checkpoint(self.checkpoint_path)
+            if resume_state is None and self.islands == 1:
+                # Generate initial population with distributed timeslots; islands build their own
+                self.initialize_population()
+                self._distribute_population()
+            
+            best_chromosome = self._run_islands() if self.islands > 1 else self._run_evolution(resume_state)
+        finally:
+            # Long-lived callers such as worker.py run many generators, don't leave the processes behind
+            self.close_pool()
+        if self.checkpoint_path and os.path.exists(self.checkpoint_path):
+            # The run finished, there is nothing left to resume
+            os.remove(self.checkpoint_path)
         
-        best_chromosome = self._run_evolution()
+        if self.parallel_evaluation or self.islands > 1 or self.fitness_cache is not None:
+            # Workers and the fitness cache only return scores, rebuild the conflict list of the winner locally
+            best_chromosome.fitness = self.calculate_fitness(best_chromosome)
+        if self.fitness_cache is not None:
+            cache_stats = self.fitness_cache.stats()
+            print(f"Fitness cache: {cache_stats['hits']} hits in {cache_stats['hits'] + cache_stats['misses']} lookups "
+                  f"({cache_stats['hit_rate']:.1%}), {cache_stats['evictions']} evictions")
         
         # Ensure Friday prayer time is respected
+        if isinstance(best_chromosome, ArrayChromosome):
+            self._fix_array_prayer_slots(best_chromosome)
+            return best_chromosome
+        best_chromosome.own_items()
         for item in best_chromosome.schedule_items:
-            if item.day == "Friday":
-                prayer_start = time(12, 30)
-                prayer_end = time(14, 30)
-                if (item.start_time >= prayer_start and item.start_time < prayer_end) or \
-                (item.end_time > prayer_start and item.end_time <= prayer_end):
-                    # Reschedule this item
-                    new_timeslot = self._find_alternative_timeslot(item, best_chromosome, allow_weekends=False)
-                    if new_timeslot:
-                        item.day = new_timeslot.day
-                        item.start_time = new_timeslot.start_time
-                        item.end_time = new_timeslot.end_time
+            if span_in_prayer_time(schedule_span(item.day, item.start_time, item.end_time)):
+                # Reschedule this item
+                new_timeslot = self._find_alternative_timeslot(item, best_chromosome, allow_weekends=False)
+                if new_timeslot:
+                    item.day = new_timeslot.day
+                    item.start_time = new_timeslot.start_time
+                    item.end_time = new_timeslot.end_time
         
         return best_chromosome
+    def _distribute_population(self):
+        """
+        Spread the initial population over the periods of each day. Skipped when
+        slots are reserved by other timetables, since the initial schedules
+        were already placed around them and spreading would move classes into them.
+        Warm-started chromosomes are left as they are.
+        """
+        if self.reserved is not None:
+            return
+        for i in range(self.warm_start_count, len(self.population)):
+            self.population[i] = self._distribute_timeslots(self.population[i])
+
     def _distribute_timeslots(self, chromosome: Chromosome):
         """Evenly distribute timeslots across available periods"""
+        if isinstance(chromosome, ArrayChromosome):
+            # Same morning/afternoon alternation as below, on zero-based periods
+            periods = np.array(sorted(range(PERIODS_PER_DAY), key=lambda p: ((p + 1) % 2, p)), dtype=GENE_DTYPE)
+            for day in np.unique(chromosome.day_idx):
+                genes = np.flatnonzero(chromosome.day_idx == day)
+                chromosome.period_idx[genes] = periods[np.arange(len(genes)) % len(periods)]
+            chromosome.state = None
+            return chromosome
+        
         # Group schedule items by day
+        chromosome.own_items()
         by_day = defaultdict(list)
         for item in chromosome.schedule_items:
             by_day[item.day].append(item)
@@ -1352,16 +3540,35 @@ class TimetableGenerator:
                 item.end_time = end_time
         
         return chromosome
-    def _run_evolution(self):
+    def _run_evolution(self, resume_state: Optional[dict] = None):
         best_fitness = 0.0
         best_chromosome = None
         generations_without_improvement = 0
+        if resume_state is not None:
+            best_chromosome = resume_state['best']
+            best_fitness = best_chromosome.fitness if best_chromosome is not None else 0.0
+            generations_without_improvement = resume_state['generations_without_improvement']
+        self.evolution_started = perf_counter()
+        self.evolution_start_generation = self.generations_run
         
-        for generation in range(self.max_generations):
+        for generation in range(self.generations_run, self.max_generations):
             self.evolve()
             self.evaluate_population()
+            if self.adaptive:
+                self.adapt()
+            self.generations_run = generation + 1
             
             current_best = max(self.population, key=lambda c: c.fitness)
+            mean_fitness = sum(c.fitness for c in self.population) / len(self.population)
+            # Only measured when someone will see it: it keys every genome
+            log_diversity = self.generations_run % DIVERSITY_LOG_INTERVAL == 0
+            self.diversity = self.diversity_metrics() if log_diversity or self.progress_callback else None
+            if log_diversity:
+                print(f"Generation {self.generations_run}: best fitness {current_best.fitness:.4f}, "
+                      f"{self.diversity['unique_genomes']}/{self.diversity['population']} unique genomes, "
+                      f"mean Hamming distance {self.diversity['mean_hamming_distance']:.1f}/{self.diversity['genes']} genes"
+                      + (f", {self.duplicates_replaced} duplicates replaced" if self.deduplicate else ""))
+            self._report_progress(generation + 1, current_best, mean_fitness)
             if current_best.fitness > best_fitness:
                 best_fitness = current_best.fitness
                 best_chromosome = current_best.copy()
@@ -1371,30 +3578,254 @@ class TimetableGenerator:
                 
             if generations_without_improvement >= MAX_GENERATIONS_WITHOUT_IMPROVEMENT:
                 break
+            if self.checkpoint_path and self.generations_run % self.checkpoint_interval == 0:
+                self.save_checkpoint(self.checkpoint_path, best_chromosome, generations_without_improvement)
         
         return best_chromosome
+    def _run_islands(self):
+        """
+        Island-model evolution. Every migration_interval generations the
+        islands send their best migration_size chromosomes to their ring
+        successor, or to every other island with the 'full' topology.
+        Returns the best chromosome found on any island.
+        """
+        settings = dict(
+            population_size=self.population_size,
+            max_generations=self.max_generations,
+            crossover_rate=self.crossover_rate,
+            mutation_rate=self.mutation_rate,
+            elitism_count=self.elitism_count,
+            tournament_size=self.tournament_size,
+            genome_mode=self.genome_mode,
+            fitness_evaluator=self.fitness_evaluator,
+            delta_evaluation=self.delta_evaluation,
+            migration_size=self.migration_size,
+            warm_start=self.warm_start,
+            warm_start_fraction=self.warm_start_fraction,
+            warm_start_perturbation=self.warm_start_perturbation,
+            timeslots=[_snapshot_record(ts) for ts in self.timeslots] if self.warm_start else None,
+            memetic=self.memetic,
+            memetic_elite=self.memetic_elite,
+            memetic_steps=self.memetic_steps,
+            memetic_neighbours=self.memetic_neighbours,
+            tabu_tenure=self.tabu_tenure,
+            presolve=self.presolve,
+            adaptive=self.adaptive,
+            guided_mutation=self.guided_mutation,
+            crossover_type=self.crossover_type,
+            deduplicate=self.deduplicate,
+            fitness_cache_size=self.fitness_cache_size,
+            cache_conflicts=self.cache_conflicts
+        )
+        problem = self.problem_data()
+        inboxes = [multiprocessing.Queue() for _ in range(self.islands)]
+        outboxes = [multiprocessing.Queue() for _ in range(self.islands)]
+        processes = [
+            multiprocessing.Process(
+                target=_island_worker,
+                args=(problem, self.genome_tables, dict(settings), random.randrange(2**63), inboxes[i], outboxes[i])
+            )
+            for i in range(self.islands)
+        ]
+        print(f"Starting {self.islands} islands ({self.migration_topology} topology, "
+              f"migrating {self.migration_size} every {self.migration_interval} generations)")
+        for process in processes:
+            process.start()
+
+        best_chromosome = None
+        generations_without_improvement = 0
+        immigrants = [[] for _ in range(self.islands)]
+        self.evolution_started = perf_counter()
+        try:
+            while self.generations_run < self.max_generations:
+                epoch = min(self.migration_interval, self.max_generations - self.generations_run)
+                for i, inbox in enumerate(inboxes):
+                    inbox.put((epoch, immigrants[i]))
+                replies = [outbox.get() for outbox in outboxes]
+                self.generations_run = replies[0][2]
+
+                emigrants = [reply[0] for reply in replies]
+                immigrants = self._route_migrants(emigrants)
+
+                island_best = max((reply[1] for reply in replies), key=lambda c: c.fitness)
+                mean_fitness = sum(reply[3] for reply in replies) / len(replies)
+                self._report_progress(self.generations_run, island_best, mean_fitness)
+                if best_chromosome is None or island_best.fitness > best_chromosome.fitness:
+                    best_chromosome = island_best
+                    generations_without_improvement = 0
+                else:
+                    generations_without_improvement += epoch
+                if generations_without_improvement >= MAX_GENERATIONS_WITHOUT_IMPROVEMENT:
+                    break
+        finally:
+            for inbox in inboxes:
+                inbox.put(None)
+            for process in processes:
+                process.join()
+        return best_chromosome
+
+    def _route_migrants(self, emigrants: List[List[Chromosome]]) -> List[List[Chromosome]]:
+        """Immigrants per island for the configured topology"""
+        n = len(emigrants)
+        if self.migration_topology == "ring":
+            return [emigrants[(i - 1) % n] for i in range(n)]
+        immigrants = []
+        for i in range(n):
+            others = [c for j in range(n) if j != i for c in emigrants[j]]
+            others.sort(key=lambda c: c.fitness, reverse=True)
+            immigrants.append(others[:self.migration_size])
+        return immigrants
+
+    def accept_migrants(self, immigrants: List[Chromosome]):
+        """Replace the worst chromosomes of the population with copies of the immigrants"""
+        if not immigrants:
+            return
+        self.population.sort(key=lambda c: c.fitness, reverse=True)
+        keep = max(0, len(self.population) - len(immigrants))
+        self.population[keep:] = [c.copy() for c in immigrants[:len(self.population)]]
+
+    def _checkpoint_fingerprint(self) -> tuple:
+        """Identifies the problem a checkpoint belongs to, gene layout included"""
+        tables = self.genome_tables
+        return (self.semester, self.year, self.genome_mode, tuple(tables.course_ids),
+                tuple(tables.room_ids), tuple(tables.lecturer_ids), len(tables.gene_course))
+
+    def save_checkpoint(self, path: str, best_chromosome, generations_without_improvement: int):
+        """
+        Write the population, RNG states, generation counter and best
+        chromosome to a gzipped pickle. The file is replaced atomically, so
+        an interrupted write leaves the previous checkpoint intact. A new
+        checkpoint directory is created readable by its owner only.
+        """
+        state = {
+            'version': CHECKPOINT_VERSION,
+            'fingerprint': self._checkpoint_fingerprint(),
+            'generation': self.generations_run,
+            'generations_without_improvement': generations_without_improvement,
+            'population': [_checkpoint_chromosome(c) for c in self.population],
+            'best': _checkpoint_chromosome(best_chromosome) if best_chromosome is not None else None,
+            'random_state': random.getstate(),
+            'numpy_state': np.random.get_state(),
+            'adaptive': (self.mutation_rate, self.tournament_size, self.mutation_operators,
+                         self.crossover_operators) if self.adaptive else None,
+        }
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, mode=0o700, exist_ok=True)
+        temp_path = f"{path}.tmp"
+        with gzip.open(temp_path, 'wb', compresslevel=1) as f:
+            pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_path, path)
+
+    def load_checkpoint(self, path: str) -> dict:
+        """
+        Restore the population, RNG states and generation counter saved by
+        save_checkpoint and return the checkpoint for _run_evolution.
+
+        Unpickling runs arbitrary code: only load checkpoints from a
+        directory no one but this service can write to.
+        """
+        with gzip.open(path, 'rb') as f:
+            state = pickle.load(f)
+        if state.get('version') != CHECKPOINT_VERSION:
+            raise ValueError(f"Checkpoint {path} has unsupported version {state.get('version')}")
+        if state['fingerprint'] != self._checkpoint_fingerprint():
+            raise ValueError(f"Checkpoint {path} was saved for different courses, rooms or lecturers")
+        self.population = state['population']
+        self.generations_run = state['generation']
+        if state.get('adaptive') is not None:
+            self.mutation_rate, self.tournament_size, self.mutation_operators, self.crossover_operators = state['adaptive']
+        # Conflict lists and fitness states are not saved
+        self.evaluate_population()
+        if state['best'] is not None:
+            state['best'].fitness = self.calculate_fitness(state['best'])
+        random.setstate(state['random_state'])
+        np.random.set_state(state['numpy_state'])
+        print(f"Resumed from checkpoint {path} at generation {self.generations_run}")
+        return state
+
+    def _report_progress(self, generation: int, best, mean_fitness: float):
+        """
+        Pass the state of the finished generation to progress_callback, if
+        any. Raises GenerationStopped instead once stop_event is set.
+        """
+        if self.stop_event is not None and self.stop_event.is_set():
+            raise GenerationStopped(f"Generation for {self.semester} year {self.year} stopped")
+        if self.progress_callback is None:
+            return
+        elapsed = perf_counter() - self.evolution_started
+        done = generation - self.evolution_start_generation
+        self.progress_callback({
+            'generation': generation,
+            'max_generations': self.max_generations,
+            'fitness': best.fitness,
+            'mean_fitness': mean_fitness,
+            'hard_violations': best.hard_violations,
+            'soft_violations': best.soft_violations,
+            'feasible': best.fitness > 1.0,  # no hard constraint penalty
+            'elapsed_seconds': elapsed,
+            # Upper bound: the run stops early once it stops improving
+            'eta_seconds': elapsed / done * (self.max_generations - generation) if done else None,
+            'mutation_rate': self.mutation_rate,
+            'operators': {
+                'mutation': self.mutation_operators.summary(),
+                'crossover': self.crossover_operators.summary(),
+            } if self.adaptive else None,
+            # Single-population runs only; islands keep their populations to themselves
+            'diversity': self.diversity,
+            'fitness_cache': self.fitness_cache.stats() if self.fitness_cache is not None else None,
+        })
     def _is_friday_prayer_time(self, timeslot: TimeSlot) -> bool:
         """Check if a timeslot overlaps with Friday prayer time"""
         if timeslot.day != "Friday":
             return False
-            
-        prayer_start = time(12, 30)
-        prayer_end = time(14, 30)
+        return _in_band(
+            time_to_minutes(timeslot.start_time), time_to_minutes(timeslot.end_time),
+            (PRAYER_START_MINUTES, PRAYER_END_MINUTES)
+        )
+    def _fix_array_prayer_slots(self, chromosome: ArrayChromosome):
+        """Move genes out of Friday prayer time, in place"""
+        tables = self.genome_tables
+        in_prayer = tables.slot_is_prayer[chromosome.day_idx, chromosome.period_idx]
+        for gene in np.flatnonzero(in_prayer):
+            slot = self._find_alternative_array_slot(chromosome, gene)
+            if slot:
+                chromosome.day_idx[gene], chromosome.period_idx[gene] = slot
+                chromosome.state = None
+    
+    def _find_alternative_array_slot(self, chromosome: ArrayChromosome, gene: int) -> Optional[Tuple[int, int]]:
+        """Integer-encoded counterpart of _find_alternative_timeslot (weekdays only)"""
+        tables = self.genome_tables
+        c_idx = chromosome.course_idx[gene]
+        gene_lecturers = tables.course_lecturer[chromosome.course_idx]
+        gene_groups = tables.course_group[chromosome.course_idx]
+        other_course = chromosome.course_idx != c_idx
         
-        # Convert to minutes for easier comparison
-        def time_to_minutes(t):
-            return t.hour * 60 + t.minute
-            
-        slot_start = time_to_minutes(timeslot.start_time)
-        slot_end = time_to_minutes(timeslot.end_time)
-        prayer_start_min = time_to_minutes(prayer_start)
-        prayer_end_min = time_to_minutes(prayer_end)
+        blocking = (
+            ((gene_lecturers == tables.course_lecturer[c_idx]) & other_course) |
+            ((chromosome.room_idx == chromosome.room_idx[gene]) & other_course) |
+            (gene_groups == tables.course_group[c_idx])
+        )
+        blocking[gene] = False
+        busy = set(zip(chromosome.day_idx[blocking].tolist(), chromosome.period_idx[blocking].tolist()))
         
-        return (slot_start < prayer_end_min and slot_end > prayer_start_min)
+        # Least used days first, then periods from morning to afternoon
+        day_utilization = np.bincount(chromosome.day_idx, minlength=len(DAYS))
+        for day in sorted(range(5), key=lambda d: day_utilization[d]):
+            for period in range(PERIODS_PER_DAY):
+                if not tables.slot_is_prayer[day, period] and (day, period) not in busy \
+                        and not tables.lecturer_reserved[tables.course_lecturer[c_idx], day, period] \
+                        and not tables.room_reserved[chromosome.room_idx[gene], day, period]:
+                    return day, period
+        
+        return None
+    
     # In GA.py, update the auto_resolve_conflicts function
     def auto_resolve_conflicts(self, chromosome: Chromosome) -> Chromosome:
         print("Starting enhanced auto-resolve process with hard constraint priority...")
         resolved_chromosome = chromosome.copy()
+        # Conflicts below edit items through their references, so nothing may be shared
+        resolved_chromosome.own_items()
         max_attempts = 50  # Increased attempts for hard constraints
         resolved_conflicts = 0
         
@@ -1437,12 +3868,7 @@ class TimetableGenerator:
                 elif conflict.type == "LAB_COURSE_IN_NON_LAB_ROOM":
                     # Ensure lab courses are in lab rooms
                     for item in conflict.items:
-                        course = self.courses[item.course_id]
-                        lab_rooms = [
-                            r_id for r_id, r in self.rooms.items()
-                            if hasattr(r, 'room_type') and r.room_type == "LAB"
-                            and r.capacity >= course.no_of_students
-                        ]
+                        lab_rooms = self.room_index[item.course_id].lab
                         if lab_rooms:
                             item.room_id = random.choice(lab_rooms)
                             item.room_name = self.rooms[item.room_id].room_name
@@ -1497,65 +3923,41 @@ class TimetableGenerator:
                 day_utilization[existing_item.day] += 1
         days_sorted = sorted(days, key=lambda d: day_utilization[d])
         
+        # Collect the slots blocked by the lecturer, the room and the student group once
+        student_group = getattr(course, 'student_group', item.course_id)
+        blocked_slots = set()
+        blocked_offgrid = []
+        for existing_item in chromosome.schedule_items:
+            if existing_item.course_id != item.course_id and (
+                existing_item.lecturer_id == item.lecturer_id or existing_item.room_id == item.room_id
+            ):
+                blocking = True
+            else:
+                existing_course = self.courses.get(existing_item.course_id)
+                blocking = bool(existing_course) and getattr(existing_course, 'student_group', existing_item.course_id) == student_group
+            if blocking:
+                span = schedule_span(existing_item.day, existing_item.start_time, existing_item.end_time)
+                if span[0] is not None:
+                    blocked_slots.add(span[0])
+                else:
+                    blocked_offgrid.append(span)
+        if self.reserved is not None:
+            blocked_slots |= self.reserved.lecturers.get(item.lecturer_id, set())
+            blocked_slots |= self.reserved.rooms.get(item.room_id, set())
+        
         for day in days_sorted:
             # Try periods in order from morning to afternoon
-            for period in range(1, PERIODS_PER_DAY + 1):
-                start_time, end_time = period_to_time(period)
-                candidate_slot = TimeSlot(day=day, start_time=start_time, end_time=end_time)
+            for period in range(PERIODS_PER_DAY):
+                slot = SLOT_TABLE[DAY_INDEX[day] * PERIODS_PER_DAY + period]
                 
                 # Skip Friday prayer time (12:30-14:30)
-                if day == "Friday":
-                    prayer_start = time(12, 30)
-                    prayer_end = time(14, 30)
-                    if (start_time >= prayer_start and start_time < prayer_end) or \
-                    (end_time > prayer_start and end_time <= prayer_end):
-                        continue
-                
-                # Check for conflicts with lecturer, room, and students
-                has_conflict = False
-                
-                # Check lecturer availability
-                for existing_item in chromosome.schedule_items:
-                    if existing_item.lecturer_id == item.lecturer_id and existing_item.course_id != item.course_id:
-                        existing_slot = TimeSlot(
-                            day=existing_item.day,
-                            start_time=existing_item.start_time,
-                            end_time=existing_item.end_time
-                        )
-                        if timeslots_overlap(candidate_slot, existing_slot):
-                            has_conflict = True
-                            break
-                
-                # Check room availability
-                if not has_conflict:
-                    for existing_item in chromosome.schedule_items:
-                        if existing_item.room_id == item.room_id and existing_item.course_id != item.course_id:
-                            existing_slot = TimeSlot(
-                                day=existing_item.day,
-                                start_time=existing_item.start_time,
-                                end_time=existing_item.end_time
-                            )
-                            if timeslots_overlap(candidate_slot, existing_slot):
-                                has_conflict = True
-                                break
-                
-                # Check student group availability
-                if not has_conflict:
-                    student_group = getattr(course, 'student_group', item.course_id)
-                    for existing_item in chromosome.schedule_items:
-                        existing_course = self.courses.get(existing_item.course_id)
-                        if existing_course and getattr(existing_course, 'student_group', existing_item.course_id) == student_group:
-                            existing_slot = TimeSlot(
-                                day=existing_item.day,
-                                start_time=existing_item.start_time,
-                                end_time=existing_item.end_time
-                            )
-                            if timeslots_overlap(candidate_slot, existing_slot):
-                                has_conflict = True
-                                break
+                if slot.is_prayer or slot.slot_id in blocked_slots:
+                    continue
+                candidate_span = (slot.slot_id, day, slot.start_minutes, slot.end_minutes)
+                if any(spans_overlap(candidate_span, span) for span in blocked_offgrid):
+                    continue
                 
-                if not has_conflict:
-                    return candidate_slot
+                return TimeSlot(day=day, start_time=slot.start_time, end_time=slot.end_time)
         
         return None
     def _find_alternative_room(self, item: ScheduleItem, chromosome: Chromosome) -> Optional[ScheduleItem]:
@@ -1563,44 +3965,20 @@ class TimetableGenerator:
         if not course:
             return None
         
-        # Get all suitable rooms
-        is_lab_course = "Lab" in course.course_name
-        suitable_rooms = []
-        
-        for room_id, room in self.rooms.items():
-            # Check capacity
-            if room.capacity < course.no_of_students:
-                continue
-            
-            # Check room type for lab courses
-            if is_lab_course and getattr(room, 'room_type', '') != "LAB":
-                continue
-            
-            # Check if room is available at this timeslot
-            room_available = True
-            for existing_item in chromosome.schedule_items:
-                if existing_item.room_id == room_id and existing_item.course_id != item.course_id:
-                    existing_slot = TimeSlot(
-                        day=existing_item.day,
-                        start_time=existing_item.start_time,
-                        end_time=existing_item.end_time
-                    )
-                    new_slot = TimeSlot(
-                        day=item.day,
-                        start_time=item.start_time,
-                        end_time=item.end_time
-                    )
-                    if timeslots_overlap(existing_slot, new_slot):
-                        room_available = False
-                        break
-            
-            if room_available:
-                suitable_rooms.append(room)
+        item_span = schedule_span(item.day, item.start_time, item.end_time)
+        busy_rooms = {
+            existing_item.room_id for existing_item in chromosome.schedule_items
+            if existing_item.course_id != item.course_id and spans_overlap(
+                item_span, schedule_span(existing_item.day, existing_item.start_time, existing_item.end_time)
+            )
+        }
+        if self.reserved is not None:
+            busy_rooms |= {r_id for r_id, slot_ids in self.reserved.rooms.items() if span_hits_slots(item_span, slot_ids)}
         
-        if suitable_rooms:
-            # Prefer rooms with similar capacity to avoid wasting space
-            suitable_rooms.sort(key=lambda r: abs(r.capacity - course.no_of_students))
-            selected_room = suitable_rooms[0]
+        # Suitable rooms are already ordered by similar capacity to avoid wasting space
+        room_id = next((r_id for r_id in self.room_index[item.course_id].fitting if r_id not in busy_rooms), None)
+        if room_id is not None:
+            selected_room = self.rooms[room_id]
             
             # Create a new schedule item with the alternative room
             new_item = ScheduleItem(
@@ -1630,6 +4008,11 @@ class TimetableGenerator:
         Returns:
             dict: Timetable data structure with schedule, conflicts, and stats
         """
+        # Integer-encoded chromosomes are only turned into ScheduleItems here
+        if isinstance(chromosome, ArrayChromosome):
+            chromosome = self.decode_chromosome(chromosome)
+            chromosome.fitness = self.calculate_fitness(chromosome)
+        
         # Save to database
         self._save_to_database(chromosome)
         
@@ -1704,7 +4087,9 @@ class TimetableGenerator:
                 'fitness': chromosome.fitness,
                 'hard_violations': chromosome.hard_violations,
                 'soft_violations': chromosome.soft_violations,
-                'total_conflicts': len(chromosome.conflicts)
+                'total_conflicts': len(chromosome.conflicts),
+                'infeasibilities': list(self.infeasibilities),
+                'fitness_cache': self.fitness_cache.stats() if self.fitness_cache is not None else None
             }
         }
         
@@ -1820,64 +4205,505 @@ class TimetableGenerator:
         except Exception as e:
             print(f"Error saving timetable to file: {e}")
             raise
-def generate_timetable(db: Session, semester: str, year=None, parameters: dict = None, output_file=None):
-    print(f"Generating timetable for semester {semester}" + (f" and year {year}" if year else ""))
+def fitness_energy(fitness: float) -> float:
+    """
+    Penalty behind a fitness value: the hard constraint penalty while there
+    is one, otherwise the soft penalty. Lower is better; used as the energy
+    of simulated annealing.
+    """
+    if fitness > 1:
+        return 1 / (fitness - 1) - 1
+    return 1 / fitness - 1
+
+class SimulatedAnnealing(TimetableGenerator):
+    """
+    Single-trajectory alternative to the GA on the same problem model: the
+    loaded courses, rooms, lecturer mapping and constraints, the array
+    genome and the delta evaluation of move_gene. Each move is a neighbour
+    as in tabu_search, focused on genes in hard violations while there are
+    any, and accepted with the Metropolis rule on fitness_energy. The
+    temperature falls geometrically from initial_temperature (sampled from
+    the start when None) to final_temperature over annealing_iterations
+    moves. After reheat_after moves without a new best the search restarts
+    from the best schedule at reheat_temperature times the initial
+    temperature; it stops early after max_reheats reheats in a row that
+    found nothing better. Runs are not checkpointed.
+    """
+    def __init__(self, db: Session, semester: str, year=None, annealing_iterations=20000,
+                 initial_temperature=None, final_temperature=0.05, reheat_after=1000,
+                 reheat_temperature=0.5, max_reheats=3, **kwargs):
+        if kwargs.get('islands', 1) > 1:
+            raise ValueError("simulated annealing does not support islands")
+        # Moves are scored by move_gene, there is no population to look up in a fitness cache
+        kwargs.update(genome_mode="array", delta_evaluation=True, memetic=False, fitness_cache_size=0)
+        super().__init__(db, semester, year, **kwargs)
+        self.annealing_iterations = annealing_iterations
+        self.initial_temperature = initial_temperature
+        self.final_temperature = final_temperature
+        self.reheat_after = reheat_after
+        self.reheat_temperature = reheat_temperature
+        self.max_reheats = max_reheats
+        self.max_generations = -(-annealing_iterations // SA_MOVES_PER_GENERATION)
+        self.reheats = 0
+
+    def _sample_initial_temperature(self, chromosome: ArrayChromosome, samples: int = 100) -> float:
+        """Temperature accepting an average uphill move from ``chromosome`` with probability 0.8"""
+        genes = np.arange(len(chromosome))
+        uphill = []
+        for _ in range(samples):
+            moves = self._sample_neighbour(chromosome, genes)
+            if moves is None:
+                continue
+            energy = fitness_energy(chromosome.fitness)
+            undo = self._undo_moves(chromosome, moves)
+            for move in moves:
+                self.move_gene(chromosome, *move)
+            delta = fitness_energy(chromosome.fitness) - energy
+            for move in reversed(undo):
+                self.move_gene(chromosome, *move)
+            if delta > 0:
+                uphill.append(delta)
+        return -np.mean(uphill) / math.log(0.8) if uphill else 1.0
+
+    def run(self):
+        if not self.courses:
+            print("No courses loaded. Terminating timetable generation.")
+            return Chromosome()
+        
+        print("Starting simulated annealing...")
+        self._presolve_if_used()
+        if self.warm_start and self.timeslots:
+            current, _ = self.timeslots_to_array_chromosome(self.timeslots)
+        else:
+            current = self.create_random_array_chromosome()
+        current.state = build_fitness_state(self.genome_tables, current)
+        current.fitness, current.hard_violations, current.soft_violations = score_fitness_state(current.state)
+        best = current.copy()
+        
+        start_temperature = self.initial_temperature or self._sample_initial_temperature(current)
+        final_temperature = min(self.final_temperature, start_temperature)
+        cooling = (final_temperature / start_temperature) ** (1 / max(1, self.annealing_iterations))
+        temperature = best_temperature = start_temperature
+        all_genes = np.arange(len(current))
+        conflicting = self.conflicting_genes(current)
+        moves_without_improvement = 0
+        reheats_without_improvement = 0
+        self.evolution_started = perf_counter()
+        self.evolution_start_generation = 0
+        
+        for iteration in range(1, self.annealing_iterations + 1):
+            moves = self._sample_neighbour(current, conflicting if len(conflicting) else all_genes)
+            if moves is not None:
+                energy = fitness_energy(current.fitness)
+                undo = self._undo_moves(current, moves)
+                for move in moves:
+                    self.move_gene(current, *move)
+                delta = fitness_energy(current.fitness) - energy
+                if delta <= 0 or random.random() < math.exp(-delta / temperature):
+                    if current.hard_violations:
+                        conflicting = self.conflicting_genes(current)
+                    elif len(conflicting):
+                        conflicting = all_genes[:0]
+                else:
+                    for move in reversed(undo):
+                        self.move_gene(current, *move)
+            
+            if current.fitness > best.fitness:
+                best = current.copy()
+                best_temperature = temperature
+                moves_without_improvement = 0
+                reheats_without_improvement = 0
+            else:
+                moves_without_improvement += 1
+            temperature *= cooling
+            
+            if iteration % SA_MOVES_PER_GENERATION == 0:
+                self.generations_run = iteration // SA_MOVES_PER_GENERATION
+                # A population of one: the current schedule stands in for the mean
+                self._report_progress(self.generations_run, best, current.fitness)
+            if moves_without_improvement >= self.reheat_after:
+                if reheats_without_improvement >= self.max_reheats:
+                    break
+                current = best.copy()
+                conflicting = self.conflicting_genes(current)
+                temperature = best_temperature * self.reheat_temperature
+                self.reheats += 1
+                reheats_without_improvement += 1
+                moves_without_improvement = 0
+        
+        self.generations_run = -(-iteration // SA_MOVES_PER_GENERATION)
+        print(f"Simulated annealing finished after {iteration} moves and {self.reheats} reheats, "
+              f"best fitness {best.fitness:.6g} ({best.hard_violations} hard violations)")
+        self._fix_array_prayer_slots(best)
+        return best
+
+# Solver engines selectable through the 'engine' parameter
+ENGINES = {'ga': TimetableGenerator, 'sa': SimulatedAnnealing}
+
+def _parameter_error(spec: ParameterSpec) -> str:
+    if spec.kind is bool:
+        return f"{spec.name} must be true or false"
+    if isinstance(spec.kind, tuple):
+        return f"{spec.name} must be one of {', '.join(repr(v) for v in spec.kind)}"
+    bounds = []
+    if spec.minimum is not None:
+        bounds.append(f"{'above' if spec.exclusive_minimum else 'at least'} {spec.minimum}")
+    if spec.maximum is not None:
+        bounds.append(f"at most {spec.maximum}")
+    return f"{spec.name} must be {'an integer' if spec.kind is int else 'a number'} {' and '.join(bounds)}"
+
+def validate_parameters(parameters: dict, specs) -> dict:
+    """Fill in the defaults of ``specs`` and check each value's type and range, raising ValueError"""
     parameters = parameters or {}
+    validated_parameters = {}
+    for spec in specs:
+        value = parameters.get(spec.name, spec.default)
+        validated_parameters[spec.name] = value
+        if value is None and spec.default is None:
+            continue
+        if isinstance(spec.kind, tuple):
+            valid = value in spec.kind
+        elif spec.kind is bool:
+            valid = isinstance(value, bool)
+        else:
+            valid = (isinstance(value, int if spec.kind is int else (int, float)) and not isinstance(value, bool)
+                     and (spec.minimum is None or value > spec.minimum
+                          or (value == spec.minimum and not spec.exclusive_minimum))
+                     and (spec.maximum is None or value <= spec.maximum))
+        if not valid:
+            raise ValueError(_parameter_error(spec))
+    return validated_parameters
+
+def validate_generation_parameters(parameters: dict = None) -> dict:
+    """Fill in defaults for the GA parameters sent by the frontend and check their ranges"""
+    validated_parameters = validate_parameters(parameters, GENERATION_PARAMETERS)
     
-    # Validate parameters
-    validated_parameters = {
-        'populationSize': parameters.get('populationSize', 50),
-        'generations': parameters.get('generations', 50),
-        'crossoverRate': parameters.get('crossoverRate', 0.8),
-        'mutationRate': parameters.get('mutationRate', 0.05),
-        'elitismCount': parameters.get('elitismCount', 5),
-        'tournamentSize': parameters.get('tournamentSize', 5),
-    }
-    
-    # Check parameter ranges and types
-    if not isinstance(validated_parameters['populationSize'], (int, float)) or validated_parameters['populationSize'] < 50 or validated_parameters['populationSize'] > 200:
-        raise ValueError("populationSize must be a number between 50 and 200")
-    if not isinstance(validated_parameters['generations'], (int, float)) or validated_parameters['generations'] < 50 or validated_parameters['generations'] > 2000:
-        raise ValueError("generations must be a number between 50 and 2000")
-    if not isinstance(validated_parameters['crossoverRate'], (int, float)) or validated_parameters['crossoverRate'] < 0.7 or validated_parameters['crossoverRate'] > 0.9:
-        raise ValueError("crossoverRate must be a number between 0.7 and 0.9")
-    if not isinstance(validated_parameters['mutationRate'], (int, float)) or validated_parameters['mutationRate'] < 0.01 or validated_parameters['mutationRate'] > 0.1:
-        raise ValueError("mutationRate must be a number between 0.01 and 0.1")
-    if not isinstance(validated_parameters['elitismCount'], (int, float)) or validated_parameters['elitismCount'] < 1 or validated_parameters['elitismCount'] > 10:
-        raise ValueError("elitismCount must be a number between 1 and 10")
-    if not isinstance(validated_parameters['tournamentSize'], (int, float)) or validated_parameters['tournamentSize'] < 2 or validated_parameters['tournamentSize'] > 5:
-        raise ValueError("tournamentSize must be a number between 2 and 5")
+    # Checks that involve more than one parameter
+    if validated_parameters['deltaEvaluation'] and validated_parameters['genomeMode'] != 'array':
+        raise ValueError("deltaEvaluation requires genomeMode 'array'")
+    if validated_parameters['migrationSize'] >= validated_parameters['populationSize']:
+        raise ValueError("migrationSize must be a non-negative integer below populationSize")
+    if validated_parameters['memetic'] and validated_parameters['genomeMode'] != 'array':
+        raise ValueError("memetic requires genomeMode 'array'")
+    if validated_parameters['engine'] == 'sa' and validated_parameters['islands'] > 1:
+        raise ValueError("islands require engine 'ga'")
     
+    return validated_parameters
+
+def generator_settings(validated_parameters: dict) -> dict:
+    """Keyword arguments of the validated parameters' engine class (ENGINES)"""
+    settings = dict(
+        population_size=int(validated_parameters['populationSize']),
+        max_generations=int(validated_parameters['generations']),
+        crossover_rate=float(validated_parameters['crossoverRate']),
+        mutation_rate=float(validated_parameters['mutationRate']),
+        elitism_count=int(validated_parameters['elitismCount']),
+        tournament_size=int(validated_parameters['tournamentSize']),
+        genome_mode=validated_parameters['genomeMode'],
+        fitness_evaluator=validated_parameters['fitnessEvaluator'],
+        parallel_evaluation=validated_parameters['parallelEvaluation'],
+        n_workers=validated_parameters['workers'],
+        delta_evaluation=validated_parameters['deltaEvaluation'],
+        islands=validated_parameters['islands'],
+        migration_interval=validated_parameters['migrationInterval'],
+        migration_size=validated_parameters['migrationSize'],
+        migration_topology=validated_parameters['migrationTopology'],
+        checkpoint_interval=validated_parameters['checkpointInterval'],
+        warm_start=validated_parameters['warmStart'],
+        warm_start_fraction=float(validated_parameters['warmStartFraction']),
+        warm_start_perturbation=float(validated_parameters['warmStartPerturbation']),
+        memetic=validated_parameters['memetic'],
+        memetic_elite=validated_parameters['memeticElite'],
+        memetic_steps=validated_parameters['memeticSteps'],
+        memetic_neighbours=validated_parameters['memeticNeighbours'],
+        tabu_tenure=validated_parameters['tabuTenure'],
+        presolve=validated_parameters['presolve'],
+        adaptive=validated_parameters['adaptive'],
+        guided_mutation=validated_parameters['guidedMutation'],
+        crossover_type=validated_parameters['crossoverType'],
+        deduplicate=validated_parameters['deduplicate'],
+        fitness_cache_size=validated_parameters['fitnessCacheSize'],
+        cache_conflicts=validated_parameters['cacheConflicts']
+    )
+    if validated_parameters['engine'] == 'sa':
+        settings.update(
+            annealing_iterations=validated_parameters['annealingIterations'],
+            initial_temperature=validated_parameters['initialTemperature'],
+            final_temperature=float(validated_parameters['finalTemperature']),
+            reheat_after=validated_parameters['reheatAfter'],
+            reheat_temperature=float(validated_parameters['reheatTemperature']),
+            max_reheats=validated_parameters['maxReheats']
+        )
+    return settings
+
+def generate_timetable(db: Session, semester: str, year=None, parameters: dict = None, output_file=None,
+                       progress_callback: Optional[Callable[[dict], None]] = None,
+                       checkpoint_path: Optional[str] = None, resume: bool = False):
+    """
+    Run the GA, or the engine chosen by parameters['engine'], for a
+    semester/year and save the best timetable. With checkpoint_path GA runs
+    are checkpointed every checkpointInterval generations; resume=True
+    continues from that checkpoint if it exists.
+    """
+    print(f"Generating timetable for semester {semester}" + (f" and year {year}" if year else ""))
+    validated_parameters = validate_generation_parameters(parameters)
     print(f"Running with parameters: {validated_parameters}")
     
     # Note: Frontend sends 'constraints' (e.g., weightTeacherPreference), but it's not used yet.
     # To use constraints, extend TimetableGenerator to accept and apply them (e.g., in calculate_fitness).
     
-    generator = TimetableGenerator(
+    generator = ENGINES[validated_parameters['engine']](
         db=db,
         semester=semester,
         year=year,
-        population_size=int(validated_parameters['populationSize']),
-        max_generations=int(validated_parameters['generations']),
-        crossover_rate=float(validated_parameters['crossoverRate']),
-        mutation_rate=float(validated_parameters['mutationRate']),
-        elitism_count=int(validated_parameters['elitismCount']),
-        tournament_size=int(validated_parameters['tournamentSize'])
+        progress_callback=progress_callback,
+        checkpoint_path=checkpoint_path,
+        resume=resume,
+        **generator_settings(validated_parameters)
     )
     best_chromosome = generator.run()
     timetable = generator.save_timetable(best_chromosome, output_file)
     return timetable
 
+def _apportion(n_items: int, weights: Dict[int, float]) -> List[int]:
+    """Owner of each of n_items, handed out in turn in proportion to the weights"""
+    total = sum(weights.values())
+    assigned = dict.fromkeys(weights, 0)
+    owners = []
+    for i in range(n_items):
+        owner = max(weights, key=lambda key: weights[key] * (i + 1) / total - assigned[key])
+        assigned[owner] += 1
+        owners.append(owner)
+    return owners
+
+def partition_shared_resources(problems: Dict[int, ProblemData]) -> Dict[int, ReservedSlots]:
+    """
+    Split the weekly slots of rooms and of lecturers teaching in several years
+    between the years of a semester, in proportion to each year's sessions.
+    Each year gets the slots it does not own as ReservedSlots, so years that
+    keep to their share cannot clash with each other. Only TEACHING_SLOTS are
+    split; weekend and prayer slots are penalised in every year anyway.
+    """
+    reserved = {year: ReservedSlots() for year in problems}
+    sessions = {
+        year: {c_id: getattr(c, 'sessions_count', 1) for c_id, c in problem.courses.items()}
+        for year, problem in problems.items()
+    }
+    
+    # Rooms: lab rooms follow lab sessions, other rooms all sessions. Within a
+    # slot rooms go largest first, so every year gets a mix of capacities.
+    rooms = {}
+    for problem in problems.values():
+        rooms.update(problem.rooms)
+    for lab in (True, False):
+        room_ids = sorted(
+            (r_id for r_id, r in rooms.items() if (getattr(r, 'room_type', '') == "LAB") == lab),
+            key=lambda r_id: -(rooms[r_id].capacity or 0)
+        )
+        weights = {
+            year: sum(n for c_id, n in sessions[year].items()
+                      if not lab or "Lab" in (problems[year].courses[c_id].course_name or ""))
+            for year in problems
+        }
+        if not room_ids or not any(weights.values()):
+            weights = {year: sum(sessions[year].values()) or 1 for year in problems}
+        cells = [(slot_id, r_id) for slot_id in TEACHING_SLOTS for r_id in room_ids]
+        for (slot_id, r_id), owner in zip(cells, _apportion(len(cells), weights)):
+            for year in problems:
+                if year != owner:
+                    reserved[year].rooms.setdefault(r_id, set()).add(slot_id)
+    
+    # Lecturers: only those teaching in more than one year need splitting
+    lecturer_sessions = defaultdict(Counter)
+    for year, problem in problems.items():
+        for c_id, l_id in problem.course_lecturer_mapping.items():
+            if c_id in sessions[year]:
+                lecturer_sessions[l_id][year] += sessions[year][c_id]
+    for l_id, per_year in lecturer_sessions.items():
+        if len(per_year) < 2:
+            continue
+        for slot_id, owner in zip(TEACHING_SLOTS, _apportion(len(TEACHING_SLOTS), dict(per_year))):
+            for year in per_year:
+                if year != owner:
+                    reserved[year].lecturers.setdefault(l_id, set()).add(slot_id)
+    return reserved
+
+# Set by generate_semester_timetables to stop the years still running, see _init_year_worker
+_semester_stop_event = None
+
+def _init_year_worker(stop_event):
+    """Process-pool initializer: receive the event that stops the semester's runs"""
+    global _semester_stop_event
+    _semester_stop_event = stop_event
+
+def _generate_year(problem: ProblemData, genome_tables: GenomeTables, settings: dict, seed: int,
+                   engine: str = 'ga'):
+    """Process-pool task: run the engine for one year and return (year, best chromosome)"""
+    random.seed(seed)
+    np.random.seed(seed % 2**32)
+    # Same gene indices as the parent's generator, which decodes and saves the result
+    generator = ENGINES[engine](db=None, semester=problem.semester, year=problem.year,
+                                problem=problem, genome_tables=genome_tables, **settings)
+    generator.stop_event = _semester_stop_event
+    return problem.year, generator.run()
+
+def generate_semester_timetables(db: Session, semester: str, years: Optional[List[int]] = None,
+                                 parameters: dict = None, max_workers: Optional[int] = None,
+                                 on_year_done: Optional[Callable[[int, dict], None]] = None,
+                                 heartbeat: Optional[Callable[[], None]] = None) -> Dict[int, dict]:
+    """
+    Generate the timetables of every year of a semester concurrently, one
+    process per year. Rooms and lecturers are shared between years through
+    partition_shared_resources, so the combined timetable has no cross-year
+    room or lecturer clashes as long as each year keeps its hard constraints.
+    Each year is saved and passed to on_year_done(year, timetable) as soon as
+    it finishes. heartbeat() is called about every SEMESTER_HEARTBEAT_SECONDS
+    while years are running. An exception from either callback cancels the
+    years not started yet, stops the running ones after their current
+    generation and is raised once they have exited, unsaved.
+    Returns {year: timetable}.
+    """
+    validated_parameters = validate_generation_parameters(parameters)
+    settings = generator_settings(validated_parameters)
+    if years is None:
+        years = sorted(row.year for row in db.query(Course.year).filter(Course.semester == semester).distinct()
+                       if row.year is not None)
+    if not years:
+        print(f"WARNING: No courses found for semester {semester}")
+        return {}
+    print(f"Generating timetables for semester {semester}, years {years}")
+    
+    engine = validated_parameters['engine']
+    generators = {year: ENGINES[engine](db=db, semester=semester, year=year, **settings) for year in years}
+    reserved = partition_shared_resources({year: g.problem_data() for year, g in generators.items()})
+    for year, generator in generators.items():
+        generator.reserve_slots(reserved[year])
+        # Here rather than in each year's process, so the saved stats carry the infeasibilities
+        generator._presolve_if_used()
+    
+    timetables = {}
+    stop_event = multiprocessing.Event()
+    with ProcessPoolExecutor(max_workers=max_workers or min(len(years), multiprocessing.cpu_count()),
+                             initializer=_init_year_worker, initargs=(stop_event,)) as executor:
+        pending = {
+            executor.submit(_generate_year, generator.problem_data(), generator.genome_tables,
+                            dict(settings, timeslots=generator.timeslots), random.randrange(2**63), engine)
+            for generator in generators.values()
+        }
+        try:
+            while pending:
+                done, pending = wait(pending, timeout=SEMESTER_HEARTBEAT_SECONDS, return_when=FIRST_COMPLETED)
+                for future in done:
+                    year, best_chromosome = future.result()
+                    generator = generators[year]
+                    # Rebuild the conflict list locally before saving
+                    best_chromosome.fitness = generator.calculate_fitness(best_chromosome)
+                    timetables[year] = generator.save_timetable(best_chromosome)
+                    print(f"Year {year} finished: {timetables[year]['stats']}")
+                    if on_year_done:
+                        on_year_done(year, timetables[year])
+                if heartbeat and pending:
+                    heartbeat()
+        except BaseException:
+            stop_event.set()
+            executor.shutdown(wait=True, cancel_futures=True)
+            raise
+    return timetables
+
+def _stored_reservations(timeslots) -> ReservedSlots:
+    """The room and lecturer slots taken by stored timeslots"""
+    reserved = ReservedSlots()
+    for ts in timeslots:
+        slot_id = schedule_span(ts.day_of_the_week, ts.start_time, ts.end_time)[0]
+        if slot_id is None:
+            continue
+        reserved.rooms.setdefault(ts.room_id, set()).add(slot_id)
+        reserved.lecturers.setdefault(ts.lecturer_id, set()).add(slot_id)
+    return reserved
+
+def replan_timetable(db: Session, semester: str, course_ids=(), room_ids=(), lecturer_ids=(),
+                     years: Optional[List[int]] = None, apply: bool = True,
+                     time_limit: float = 5.0) -> Dict[int, dict]:
+    """
+    Re-place only the sessions affected by edits to the given courses, rooms
+    and lecturers, keeping the rest of the stored timetable fixed. The other
+    years of the semester are held as ReservedSlots, so the changes cannot
+    clash with them. Each year with affected sessions is repaired with
+    local_search_genes and saved when apply is set; time_limit is the search
+    time of all years together. Returns
+    {year: {'changes': diff, 'freed': n, 'stats': {...}}}.
+    """
+    course_ids, room_ids, lecturer_ids = set(course_ids), set(room_ids), set(lecturer_ids)
+    rows = [_snapshot_record(ts) for ts in db.query(Timeslot).filter(Timeslot.semester == semester).all()]
+    # Years that can be touched: those holding the entities, or teaching the changed courses
+    course_ids_of_lecturers = {l.course_id for l in db.query(Lecturer).filter(Lecturer.lecturer_id.in_(lecturer_ids))}
+    touched_courses = course_ids | course_ids_of_lecturers
+    candidate_years = {c.year for c in db.query(Course).filter(Course.course_id.in_(touched_courses),
+                                                               Course.semester == semester)}
+    candidate_years |= {ts.year for ts in rows
+                        if ts.course_id in touched_courses or ts.room_id in room_ids or ts.lecturer_id in lecturer_ids}
+    candidate_years.discard(None)
+    if years is not None:
+        candidate_years &= set(years)
+
+    results = {}
+    deadline = perf_counter() + time_limit
+    for year in sorted(candidate_years):
+        started = perf_counter()
+        own = [ts for ts in rows if ts.year == year]
+        generator = TimetableGenerator(db=db, semester=semester, year=year, timeslots=own,
+                                       genome_mode="array", delta_evaluation=True)
+        if not generator.courses:
+            continue
+        generator.reserve_slots(_stored_reservations([ts for ts in rows if ts.year != year]))
+        generator._presolve_if_used()
+        chromosome, sources = generator.timeslots_to_array_chromosome(own)
+        affected = generator.affected_genes(chromosome, sources, course_ids, room_ids, lecturer_ids)
+        generator.local_search_genes(chromosome, affected, time_limit=max(0.0, deadline - perf_counter()))
+        changes = generator.schedule_diff(chromosome, sources, own)
+
+        if apply and changes:
+            stats = generator.save_timetable(chromosome)['stats']
+        else:
+            decoded = generator.decode_chromosome(chromosome)
+            decoded.fitness = generator.calculate_fitness(decoded)
+            stats = {'fitness': decoded.fitness, 'hard_violations': decoded.hard_violations,
+                     'soft_violations': decoded.soft_violations, 'total_conflicts': len(decoded.conflicts)}
+        print(f"Re-planned {semester} year {year}: {len(affected)} sessions freed, {len(changes)} changes "
+              f"in {perf_counter() - started:.2f}s")
+        results[year] = {'changes': changes, 'freed': len(affected), 'stats': stats}
+
+        # Later years must keep clear of this year's new placement
+        tables = generator.genome_tables
+        rows = [ts for ts in rows if ts.year != year] + [
+            SimpleNamespace(year=year, room_id=tables.room_ids[r], lecturer_id=tables.lecturer_ids[tables.course_lecturer[c]],
+                            day_of_the_week=DAYS[d], start_time=period_to_time(p + 1)[0], end_time=period_to_time(p + 1)[1],
+                            course_id=tables.course_ids[c])
+            for c, r, d, p in zip(chromosome.course_idx.tolist(), chromosome.room_idx.tolist(),
+                                  chromosome.day_idx.tolist(), chromosome.period_idx.tolist())
+        ]
+    return results
+
 if __name__ == "__main__":
     import argparse
     parser = argparse.ArgumentParser(description='Generate optimized timetable')
     parser.add_argument('--semester', required=True, help='Semester (e.g., "Fall", "Spring")')
     parser.add_argument('--year', type=int, help='Academic year')
     parser.add_argument('--output', help='Output file path for CSV')
+    parser.add_argument('--checkpoint', help='Checkpoint file, written during the run and removed when it finishes')
+    parser.add_argument('--checkpoint-interval', type=int, default=25, help='Generations between checkpoints')
+    parser.add_argument('--resume', action='store_true', help='Continue from --checkpoint if it exists')
+    parser.add_argument('--warm-start', action='store_true', help='Seed the population from the stored timetable')
+    parser.add_argument('--engine', choices=sorted(ENGINES), default='ga',
+                        help='Solver: genetic algorithm or simulated annealing')
     args = parser.parse_args()
+    if args.resume and not args.checkpoint:
+        parser.error('--resume requires --checkpoint')
     db = next(get_db())
     try:
-        generate_timetable(db, args.semester, args.year, output_file=args.output)
+        parameters = {'checkpointInterval': args.checkpoint_interval, 'warmStart': args.warm_start, 'engine': args.engine}
+        generate_timetable(db, args.semester, args.year, parameters,
+                           output_file=args.output, checkpoint_path=args.checkpoint, resume=args.resume)
     finally:
         db.close()
 
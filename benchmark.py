@@ -0,0 +1,359 @@
+"""
+Benchmarks for TimetableGenerator, and the other engines of GA.ENGINES, on
+synthetic problems, no database needed.
+
+Each case runs in its own process so peak RSS is measured per case. Results
+are printed as a table and can be written as JSON to compare across commits:
+
+    python benchmark.py --sizes small,medium --output before.json
+    python benchmark.py --sizes small,medium --compare before.json
+
+Engines run head-to-head on the same problems with --engines ga,sa.
+"""
+import argparse
+import contextlib
+import io
+import json
+import math
+import multiprocessing
+import platform
+import random
+import subprocess
+import sys
+from datetime import datetime
+from time import perf_counter
+from types import SimpleNamespace
+
+import numpy as np
+
+from GA import ENGINES, FITNESS_CACHE_SIZE, ProblemData
+
+try:
+    import resource  # Not available on Windows
+except ImportError:
+    resource = None
+
+# Problem sizes: courses, rooms, lecturers, constraint rows and share of lab courses
+BENCHMARK_SIZES = {
+    'small': dict(n_courses=40, n_rooms=12, n_lecturers=15, n_constraints=4, lab_ratio=0.15),
+    'medium': dict(n_courses=120, n_rooms=30, n_lecturers=40, n_constraints=10, lab_ratio=0.15),
+    'large': dict(n_courses=300, n_rooms=70, n_lecturers=100, n_constraints=20, lab_ratio=0.15),
+}
+
+# (constraint_id prefix, constraint_type, constraint_value) cycled through by make_synthetic_problem
+SYNTHETIC_CONSTRAINTS = [
+    ("HC", "PRAYER_TIME_FRIDAY", "12:30-14:30"),
+    ("SC", "AVOID_EARLY_MORNING_CLASS", "08:30-10:00"),
+    ("SC", "AVOID_LATE_NIGHT_CLASS", "16:00-18:30"),
+    ("SC", "NO_WEEKEND_CLASSES", "Saturday&Sunday"),
+    ("SC", "AVOID_CONSECUTIVE_LECTURES", "30"),
+    ("SC", "EVENING_LECTURES_IN_AC_ROOMS", "16:00-18:30"),
+]
+
+def make_synthetic_problem(n_courses: int, n_rooms: int, n_lecturers: int, n_constraints: int = 0,
+                           lab_ratio: float = 0.15, seed: int = 0,
+                           semester: str = "Benchmark", year: int = 1) -> ProblemData:
+    """
+    Build a random ProblemData with records shaped like the ORM objects.
+    Lab rooms are sized so every lab course has at least one LAB room that fits.
+    """
+    rnd = random.Random(seed)
+    n_lab_rooms = min(n_rooms, max(1, math.ceil(n_rooms * lab_ratio) + 1))
+
+    rooms = {}
+    for i in range(n_rooms):
+        is_lab = i < n_lab_rooms
+        room_id = f"R{i:03d}"
+        rooms[room_id] = SimpleNamespace(
+            room_id=room_id,
+            room_name=f"{'Lab' if is_lab else 'Hall'} {i}",
+            building=f"B{i % 4}",
+            capacity=rnd.choice([40, 60] if is_lab else [40, 60, 80, 120, 200]),
+            room_type="LAB" if is_lab else "LECTURE",
+            has_ac=rnd.random() < 0.5
+        )
+
+    lecturers = {}
+    for i in range(n_lecturers):
+        lecturer_id = f"L{i:03d}"
+        lecturers[lecturer_id] = SimpleNamespace(
+            lecturer_id=lecturer_id,
+            course_id=None,
+            lecturer_name=f"Lecturer {i}",
+            department_id="D1",
+            hire_date=None,
+            office_location=None,
+            phone_number=None,
+            courses=[]
+        )
+
+    courses = {}
+    course_lecturer_mapping = {}
+    lecturer_ids = list(lecturers.keys())
+    for i in range(n_courses):
+        course_id = f"C{i:03d}"
+        is_lab = rnd.random() < lab_ratio
+        name = f"Course {i}" + (" Lab" if is_lab else "") + (" A" if rnd.random() < 0.1 else "")
+        credit = rnd.choice([2, 3, 4])
+        lecturer_id = lecturer_ids[i % n_lecturers]
+        courses[course_id] = SimpleNamespace(
+            course_id=course_id,
+            course_name=name,
+            course_code=f"BM{i:03d}",
+            year=year,
+            semester=semester,
+            no_of_students=rnd.randint(15, 36) if is_lab else rnd.randint(20, 150),
+            credit=credit,
+            department_id="D1",
+            sessions_count=max(1, credit // 2),
+            lecturer_id=lecturer_id
+        )
+        lecturers[lecturer_id].courses.append(course_id)
+        course_lecturer_mapping[course_id] = lecturer_id
+
+    constraints = []
+    course_ids = list(courses.keys())
+    for i in range(n_constraints):
+        prefix, constraint_type, constraint_value = SYNTHETIC_CONSTRAINTS[i % len(SYNTHETIC_CONSTRAINTS)]
+        # The first round applies to everything, later rounds are scoped to one course or lecturer
+        scoped = i >= len(SYNTHETIC_CONSTRAINTS)
+        constraints.append(SimpleNamespace(
+            constraint_id=f"{prefix}{100 + i}",
+            constraint_type=constraint_type,
+            constraint_value=constraint_value,
+            course_id=rnd.choice(course_ids) if scoped and i % 2 == 0 else None,
+            lecturer_id=rnd.choice(lecturer_ids) if scoped and i % 2 == 1 else None,
+            room_id=None
+        ))
+
+    return ProblemData(
+        semester=semester,
+        year=year,
+        lecturers=lecturers,
+        courses=courses,
+        rooms=rooms,
+        constraints=constraints,
+        course_lecturer_mapping=course_lecturer_mapping
+    )
+
+def peak_rss_mb():
+    """
+    Peak resident set size in MB of this process or its largest finished child
+    (island and evaluation workers), or None where unsupported
+    """
+    if resource is None:
+        return None
+    peak = max(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+               resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss)
+    # Linux reports kilobytes, macOS bytes
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+def run_case(size: str, problem_spec: dict, generator_kwargs: dict, seed: int, verbose: bool = False,
+             engine: str = 'ga') -> dict:
+    """Generate one synthetic problem, run an engine on it and return its metrics"""
+    random.seed(seed)
+    np.random.seed(seed)
+    problem = make_synthetic_problem(seed=seed, **problem_spec)
+    progress = {'first_feasible_seconds': None, 'first_feasible_generation': None,
+                'first_generation_at': None, 'last_generation_at': None}
+    start = None
+
+    def on_generation(report):
+        now = perf_counter()
+        if progress['first_generation_at'] is None:
+            progress['first_generation_at'] = now
+        progress['last_generation_at'] = now
+        if report['feasible'] and progress['first_feasible_seconds'] is None:
+            progress['first_feasible_seconds'] = now - start
+            progress['first_feasible_generation'] = report['generation']
+
+    output = contextlib.nullcontext() if verbose else contextlib.redirect_stdout(io.StringIO())
+    with output:
+        setup_start = perf_counter()
+        generator = ENGINES[engine](
+            db=None,
+            semester=problem.semester,
+            year=problem.year,
+            problem=problem,
+            progress_callback=on_generation,
+            **generator_kwargs
+        )
+        setup_seconds = perf_counter() - setup_start
+        start = perf_counter()
+        best = generator.run()
+        run_seconds = perf_counter() - start
+        fitness = generator.calculate_fitness(best)
+
+    # Steady-state rate between the first and last generation, excluding population setup
+    generations = generator.generations_run
+    if generations > 1 and progress['last_generation_at'] > progress['first_generation_at']:
+        generations_per_second = (generations - 1) / (progress['last_generation_at'] - progress['first_generation_at'])
+    else:
+        generations_per_second = generations / run_seconds if run_seconds else None
+
+    return {
+        'size': size,
+        'engine': engine,
+        'seed': seed,
+        'problem': problem_spec,
+        'generator': {key: value for key, value in generator_kwargs.items() if key != 'progress_callback'},
+        'setup_seconds': round(setup_seconds, 4),
+        'run_seconds': round(run_seconds, 4),
+        'generations': generations,
+        'generations_per_second': round(generations_per_second, 3) if generations_per_second else None,
+        'first_feasible_seconds': progress['first_feasible_seconds'],
+        'first_feasible_generation': progress['first_feasible_generation'],
+        'final_fitness': fitness,
+        'hard_violations': best.hard_violations,
+        'soft_violations': best.soft_violations,
+        'peak_rss_mb': peak_rss_mb(),
+        'fitness_cache': generator.fitness_cache.stats() if generator.fitness_cache is not None else None,
+    }
+
+def _run_case_in_child(queue, *args):
+    try:
+        queue.put(run_case(*args))
+    except Exception as e:
+        queue.put({'error': f"{type(e).__name__}: {e}"})
+
+def run_case_isolated(*args) -> dict:
+    """run_case in a fresh process, so peak_rss_mb is not inflated by earlier cases"""
+    queue = multiprocessing.Queue()
+    process = multiprocessing.Process(target=_run_case_in_child, args=(queue,) + args)
+    process.start()
+    result = queue.get()
+    process.join()
+    if 'error' in result:
+        raise RuntimeError(f"Benchmark case {args[0]} failed: {result['error']}")
+    return result
+
+def case_key(result: dict) -> str:
+    """Baseline matching key: size, engine, seed and every generator setting run_case recorded"""
+    return (f"{result['size']}/{result.get('engine', 'ga')}/seed{result['seed']}/"
+            f"{json.dumps(result['generator'], sort_keys=True)}")
+
+def case_label(result: dict) -> str:
+    generator = result['generator']
+    islands = generator.get('islands', 1)
+    if result.get('engine', 'ga') != 'ga':
+        return f"{result['size']}/{result['engine']}/seed{result['seed']}"
+    return (f"{result['size']}/{generator.get('genome_mode', 'object')}/"
+            f"{generator.get('fitness_evaluator', 'loop')}/"
+            f"{f'islands{islands}/' if islands > 1 else ''}seed{result['seed']}")
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def print_results(results, baseline=None):
+    baseline = {case_key(r): r for r in (baseline or {}).get('results', [])}
+    print(f"{'case':<40} {'gen/s':>9} {'feasible@s':>11} {'rss MB':>8} {'fitness':>12} {'hard':>5}")
+    for result in results:
+        feasible = result['first_feasible_seconds']
+        rss = result['peak_rss_mb']
+        print(f"{case_label(result):<40} {result['generations_per_second'] or 0:>9.2f} "
+              f"{feasible if feasible is not None else float('nan'):>11.2f} "
+              f"{rss if rss is not None else float('nan'):>8.1f} "
+              f"{result['final_fitness']:>12.6g} {result['hard_violations']:>5}")
+        before = baseline.get(case_key(result))
+        if before and before.get('generations_per_second') and result['generations_per_second']:
+            speedup = result['generations_per_second'] / before['generations_per_second']
+            print(f"{'  vs baseline':<40} {speedup:>8.2f}x {'':>11} {'':>8} "
+                  f"{result['final_fitness'] - before['final_fitness']:>+12.6g}")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark the timetable GA on synthetic problems')
+    parser.add_argument('--sizes', default='small,medium',
+                        help=f"Comma-separated presets ({', '.join(BENCHMARK_SIZES)}) or 'custom'")
+    parser.add_argument('--courses', type=int, default=80, help='Courses for the custom size')
+    parser.add_argument('--rooms', type=int, default=20, help='Rooms for the custom size')
+    parser.add_argument('--lecturers', type=int, default=25, help='Lecturers for the custom size')
+    parser.add_argument('--constraints', type=int, default=6, help='Constraint rows for the custom size')
+    parser.add_argument('--lab-ratio', type=float, default=0.15, help='Share of lab courses for the custom size')
+    parser.add_argument('--seeds', default='0', help='Comma-separated seeds, one run per seed and size')
+    parser.add_argument('--population', type=int, default=50)
+    parser.add_argument('--generations', type=int, default=100)
+    parser.add_argument('--genome-mode', choices=['object', 'array'], default='object')
+    parser.add_argument('--fitness-evaluator', choices=['loop', 'vectorized'], default='loop')
+    parser.add_argument('--parallel', action='store_true', help='Evaluate on a process pool')
+    parser.add_argument('--workers', type=int, help='Pool size for --parallel')
+    parser.add_argument('--delta', action='store_true', help='Delta evaluation (array genome only)')
+    parser.add_argument('--islands', type=int, default=1, help='Island-model subpopulations, one process each')
+    parser.add_argument('--migration-interval', type=int, default=10)
+    parser.add_argument('--migration-size', type=int, default=2)
+    parser.add_argument('--migration-topology', choices=['ring', 'full'], default='ring')
+    parser.add_argument('--memetic', action='store_true', help='Tabu search on the elite every generation (array genome only)')
+    parser.add_argument('--fitness-cache-size', type=int, default=FITNESS_CACHE_SIZE,
+                        help='Genomes kept in the fitness cache, 0 to evaluate every chromosome')
+    parser.add_argument('--engines', default='ga', help=f"Comma-separated engines to compare ({', '.join(ENGINES)})")
+    parser.add_argument('--annealing-iterations', type=int, default=20000, help='Moves per simulated annealing run')
+    parser.add_argument('--output', help='Write results as JSON to this path')
+    parser.add_argument('--compare', help='JSON from an earlier run to compare against')
+    parser.add_argument('--verbose', action='store_true', help="Show the generator's own output")
+    args = parser.parse_args(argv)
+
+    sizes = {}
+    for size in args.sizes.split(','):
+        if size == 'custom':
+            sizes[size] = dict(n_courses=args.courses, n_rooms=args.rooms, n_lecturers=args.lecturers,
+                               n_constraints=args.constraints, lab_ratio=args.lab_ratio)
+        elif size in BENCHMARK_SIZES:
+            sizes[size] = BENCHMARK_SIZES[size]
+        else:
+            parser.error(f"unknown size '{size}'")
+
+    engines = args.engines.split(',')
+    for engine in engines:
+        if engine not in ENGINES:
+            parser.error(f"unknown engine '{engine}'")
+
+    generator_kwargs = dict(
+        population_size=args.population,
+        max_generations=args.generations,
+        genome_mode=args.genome_mode,
+        fitness_evaluator=args.fitness_evaluator,
+        parallel_evaluation=args.parallel,
+        n_workers=args.workers,
+        delta_evaluation=args.delta,
+        islands=args.islands,
+        migration_interval=args.migration_interval,
+        migration_size=args.migration_size,
+        migration_topology=args.migration_topology,
+        memetic=args.memetic,
+        fitness_cache_size=args.fitness_cache_size,
+    )
+    # Annealing always runs on array genomes with delta evaluation, on one trajectory
+    engine_kwargs = {
+        'ga': generator_kwargs,
+        'sa': dict(generator_kwargs, islands=1, memetic=False, annealing_iterations=args.annealing_iterations),
+    }
+
+    results = []
+    for size, problem_spec in sizes.items():
+        for seed in (int(s) for s in args.seeds.split(',')):
+            for engine in engines:
+                results.append(run_case_isolated(size, problem_spec, engine_kwargs[engine], seed, args.verbose, engine))
+
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+    print_results(results, baseline)
+
+    if args.output:
+        report = {
+            'commit': git_commit(),
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'results': results,
+        }
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"Results written to {args.output}")
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,4 @@
-import React, { useState } from 'react';
+import React, { useState, useRef } from 'react';
 import { 
   Box, Typography, Slider, FormControl, InputLabel, 
   Select, MenuItem, Button, Paper, CircularProgress,
@@ -54,6 +54,45 @@ const ProgressInfo = styled(Box)(({ theme }) => ({
   flex: 1,
 }));
 
+// Read the Server-Sent Events of a generation job, calling onEvent(event, data) for each.
+// fetch is used instead of EventSource so the Authorization header can be sent.
+const streamJobEvents = async (jobId, token, onEvent, signal) => {
+  const response = await fetch(`${axiosInstance.defaults.baseURL || ''}/generation-jobs/${jobId}/events`, {
+    headers: { Authorization: `Bearer ${token}`, Accept: 'text/event-stream' },
+    signal,
+  });
+  if (!response.ok) {
+    throw new Error(`Progress stream failed with status ${response.status}`);
+  }
+  const reader = response.body.getReader();
+  const decoder = new TextDecoder();
+  let buffer = '';
+  for (;;) {
+    const { value, done } = await reader.read();
+    if (done) break;
+    buffer += decoder.decode(value, { stream: true });
+    let boundary;
+    while ((boundary = buffer.indexOf('\n\n')) !== -1) {
+      const block = buffer.slice(0, boundary);
+      buffer = buffer.slice(boundary + 2);
+      let event = 'message';
+      const data = [];
+      block.split('\n').forEach((line) => {
+        if (line.startsWith('event:')) event = line.slice(6).trim();
+        else if (line.startsWith('data:')) data.push(line.slice(5).trim());
+      });
+      if (data.length) {
+        await onEvent(event, JSON.parse(data.join('\n')));
+      }
+    }
+  }
+};
+
+const formatDuration = (seconds) => {
+  const total = Math.round(seconds);
+  return total >= 60 ? `${Math.floor(total / 60)}m ${total % 60}s` : `${total}s`;
+};
+
 const AlgorithmControl = ({ onTimetableGenerated }) => {
   const { token } = useAuth();
   const [parameters, setParameters] = useState({
@@ -63,6 +102,11 @@ const AlgorithmControl = ({ onTimetableGenerated }) => {
     mutationRate: 0.05,
     elitismCount: 5,
     tournamentSize: 3,
+    warmStart: false,
+    adaptive: false,
+    guidedMutation: false,
+    crossoverType: 'block',
+    deduplicate: false,
   });
   
   const [constraints, setConstraints] = useState({
@@ -78,6 +122,9 @@ const AlgorithmControl = ({ onTimetableGenerated }) => {
   const [progress, setProgress] = useState(0);
   const [generation, setGeneration] = useState(0);
   const [fitness, setFitness] = useState(0);
+  const [runStats, setRunStats] = useState(null);
+  const [jobId, setJobId] = useState(null);
+  const streamRef = useRef(null);
   const [successMessage, setSuccessMessage] = useState('');
   const [errorMessage, setErrorMessage] = useState('');
   const [semester, setSemester] = useState('');
@@ -134,6 +181,11 @@ const AlgorithmControl = ({ onTimetableGenerated }) => {
       mutationRate: Number(parameters.mutationRate),
       elitismCount: Number(parameters.elitismCount),
       tournamentSize: Number(parameters.tournamentSize),
+      warmStart: Boolean(parameters.warmStart),
+      adaptive: Boolean(parameters.adaptive),
+      guidedMutation: Boolean(parameters.guidedMutation),
+      crossoverType: parameters.crossoverType,
+      deduplicate: Boolean(parameters.deduplicate),
     };
 
     if (
@@ -160,6 +212,7 @@ const AlgorithmControl = ({ onTimetableGenerated }) => {
     setProgress(0);
     setGeneration(0);
     setFitness(0);
+    setRunStats(null);
 
     try {
       // Fetch mapping data once before running the algorithm
@@ -173,8 +226,8 @@ const AlgorithmControl = ({ onTimetableGenerated }) => {
       const rooms = roomsRes.data;
       const lecturers = lecturersRes.data;
 
-      // Start the algorithm - ensure yearValue is sent as a number
-      await axiosInstance.post(
+      // Queue the job - ensure yearValue is sent as a number
+      const jobRes = await axiosInstance.post(
         '/generate-timetable/',
         {
           semester,
@@ -185,72 +238,70 @@ const AlgorithmControl = ({ onTimetableGenerated }) => {
           headers: { Authorization: `Bearer ${token}` },
         }
       );
+      const queuedJobId = jobRes.data.job_id;
+      setJobId(queuedJobId);
 
-      // Poll for timetable results with status check
-      let pollAttempts = 0;
-      const maxPollAttempts = 80; // 2 minutes / 3 seconds per poll = ~40 attempts
-      const pollTimetable = setInterval(async () => {
-        pollAttempts++;
-        try {
-          const statusRes = await axiosInstance.get(`/timetable-status/?semester=${semester}&year=${yearValue}`, {
-            headers: { Authorization: `Bearer ${token}` },
-          });
-
-          // Update progress based on status
-          setProgress(Math.min((pollAttempts / maxPollAttempts) * 100, 90));
-
-          if (statusRes.data.status === 'complete' && statusRes.data.timeslot_count > 0) {
-            const timetableRes = await axiosInstance.get(`/timetables/?year=${yearValue}&semester=${semester}`, {
-              headers: { Authorization: `Bearer ${token}` },
-            });
+      // Follow the job's progress until the worker reports a result
+      const controller = new AbortController();
+      streamRef.current = controller;
+      try {
+        await streamJobEvents(queuedJobId, token, async (event, data) => {
+          if (event === 'progress') {
+            setGeneration(data.generation);
+            setFitness(data.fitness.toFixed(4));
+            setRunStats(data);
+            setProgress(Math.min((data.generation / data.max_generations) * 100, 99));
+          } else if (event === 'result') {
+            if (data.status === 'completed') {
+              const timetableRes = await axiosInstance.get(`/timetables/?year=${yearValue}&semester=${semester}`, {
+                headers: { Authorization: `Bearer ${token}` },
+              });
 
-            if (timetableRes.data.length > 0) {
-              const formattedTimetable = timetableRes.data.map(item => {
-                const course = courses.find(c => c.course_id === item.course_id);
-                const room = rooms.find(r => r.room_id === item.room_id);
-                const lecturer = lecturers.find(l => l.lecturer_id === item.lecturer_id);
+              if (timetableRes.data.length > 0) {
+                const formattedTimetable = timetableRes.data.map(item => {
+                  const course = courses.find(c => c.course_id === item.course_id);
+                  const room = rooms.find(r => r.room_id === item.room_id);
+                  const lecturer = lecturers.find(l => l.lecturer_id === item.lecturer_id);
 
-                return {
-                  id: item.timeslot_id || item.id,
-                  day: item.day_of_the_week,
-                  startTime: item.start_time,
-                  endTime: item.end_time,
-                  course: course?.course_name || item.course_name || `Course-${item.course_id}`,
-                  room: room?.room_name || item.room_name || `Room-${item.room_id}`,
-                  lecturer: lecturer?.lecturer_name || item.lecturer_name || `Lecturer-${item.lecturer_id}`,
-                  courseType: (item.course_name || course?.course_name || '').toLowerCase().includes('lab') ? 'lab' : 'lecture',
-                  class: item.year ? `Year ${item.year}` : (course?.year ? `Year ${course.year}` : 'N/A'),
-                  year: item.year || course?.year || yearValue,
-                  semester: item.semester || semester,
-                };
-              });
+                  return {
+                    id: item.timeslot_id || item.id,
+                    day: item.day_of_the_week,
+                    startTime: item.start_time,
+                    endTime: item.end_time,
+                    course: course?.course_name || item.course_name || `Course-${item.course_id}`,
+                    room: room?.room_name || item.room_name || `Room-${item.room_id}`,
+                    lecturer: lecturer?.lecturer_name || item.lecturer_name || `Lecturer-${item.lecturer_id}`,
+                    courseType: (item.course_name || course?.course_name || '').toLowerCase().includes('lab') ? 'lab' : 'lecture',
+                    class: item.year ? `Year ${item.year}` : (course?.year ? `Year ${course.year}` : 'N/A'),
+                    year: item.year || course?.year || yearValue,
+                    semester: item.semester || semester,
+                  };
+                });
 
-              setProgress(100);
-              setTimetableData(formattedTimetable);
-              if (onTimetableGenerated) {
-                onTimetableGenerated(formattedTimetable, yearValue, semester);
+                setProgress(100);
+                setTimetableData(formattedTimetable);
+                if (onTimetableGenerated) {
+                  onTimetableGenerated(formattedTimetable, yearValue, semester);
+                }
+                setSuccessMessage('Timetable generated successfully!');
               }
-              setSuccessMessage('Timetable generated successfully!');
-              setIsRunning(false);
-              clearInterval(pollTimetable);
+            } else if (data.status === 'failed') {
+              setErrorMessage(`Timetable generation failed on the server: ${data.error || 'unknown error'}`);
+            } else if (data.status === 'cancelled') {
+              setErrorMessage('Timetable generation was cancelled.');
+              setProgress(0);
             }
-          } else if (statusRes.data.status === 'failed') {
-            setErrorMessage('Timetable generation failed on the server.');
-            setIsRunning(false);
-            clearInterval(pollTimetable);
           }
-        } catch (err) {
-          setErrorMessage('Failed to fetch timetable status. Please try again.');
-          setIsRunning(false);
-          clearInterval(pollTimetable);
+        }, controller.signal);
+      } catch (err) {
+        if (err.name !== 'AbortError') {
+          setErrorMessage('Lost the timetable generation progress stream. Please try again.');
         }
-
-        if (pollAttempts >= maxPollAttempts) {
-          setErrorMessage('Timetable generation timed out. Please try again.');
-          setIsRunning(false);
-          clearInterval(pollTimetable);
-        }
-      }, 3000); // Reduced polling interval to 3 seconds
+      } finally {
+        streamRef.current = null;
+        setIsRunning(false);
+        setJobId(null);
+      }
 
     } catch (error) {
       setErrorMessage(error.response?.data?.detail || 'Failed to generate timetable');
@@ -260,10 +311,20 @@ const AlgorithmControl = ({ onTimetableGenerated }) => {
   };
     
   const handleStopAlgorithm = async () => {
-    // Note: Stopping the algorithm requires backend support (e.g., WebSocket or a cancel endpoint)
-    setErrorMessage('Stopping algorithm is not implemented yet.');
-    setIsRunning(false);
-    setProgress(0);
+    if (!jobId) {
+      if (streamRef.current) streamRef.current.abort();
+      setIsRunning(false);
+      setProgress(0);
+      return;
+    }
+    try {
+      // The worker stops at its next progress report; the stream then ends with a cancelled result
+      await axiosInstance.post(`/generation-jobs/${jobId}/cancel`, {}, {
+        headers: { Authorization: `Bearer ${token}` },
+      });
+    } catch (error) {
+      setErrorMessage(error.response?.data?.detail || 'Failed to cancel timetable generation');
+    }
   };
   
   const handleSaveParameters = () => {
@@ -343,6 +404,15 @@ const AlgorithmControl = ({ onTimetableGenerated }) => {
             <ProgressInfo>
               <Typography variant="body1">Generating timetable...</Typography>
               <Typography variant="body2">Generation: {generation}, Fitness: {fitness}</Typography>
+              {runStats && (
+                <Typography variant="body2">
+                  Mean fitness: {runStats.mean_fitness.toFixed(4)}, Hard violations: {runStats.hard_violations},
+                  {' '}Soft violations: {runStats.soft_violations}, ETA: {runStats.eta_seconds != null ? formatDuration(runStats.eta_seconds) : '-'}
+                  {runStats.operators && `, Mutation rate: ${runStats.mutation_rate.toFixed(3)}`}
+                  {runStats.diversity && `, Unique genomes: ${runStats.diversity.unique_genomes}/${runStats.diversity.population}`}
+                  {runStats.fitness_cache && `, Cache hits: ${(runStats.fitness_cache.hit_rate * 100).toFixed(0)}%`}
+                </Typography>
+              )}
             </ProgressInfo>
           </ProgressContainer>
         )}
@@ -409,6 +479,21 @@ const AlgorithmControl = ({ onTimetableGenerated }) => {
                     disabled={isRunning}
                   />
                 </ParameterGroup>
+                <ParameterGroup>
+                  <FormControl fullWidth size="small">
+                    <InputLabel>Crossover</InputLabel>
+                    <Select
+                      value={parameters.crossoverType}
+                      onChange={(e) => setParameters({ ...parameters, crossoverType: e.target.value })}
+                      label="Crossover"
+                      disabled={isRunning}
+                    >
+                      <MenuItem value="block">Uniform over courses</MenuItem>
+                      <MenuItem value="day">Day-based</MenuItem>
+                      <MenuItem value="resource">Resource-aware</MenuItem>
+                    </Select>
+                  </FormControl>
+                </ParameterGroup>
                 <ParameterGroup>
                   <Typography gutterBottom>Mutation Rate: {parameters.mutationRate}</Typography>
                   <Slider
@@ -435,6 +520,48 @@ const AlgorithmControl = ({ onTimetableGenerated }) => {
                     disabled={isRunning}
                   />
                 </ParameterGroup>
+                <ParameterGroup>
+                  <FormControlLabel
+                    control={
+                      <Switch
+                        checked={parameters.warmStart}
+                        onChange={(e) => setParameters({ ...parameters, warmStart: e.target.checked })}
+                        disabled={isRunning}
+                      />
+                    }
+                    label="Warm start from the stored timetable"
+                  />
+                  <FormControlLabel
+                    control={
+                      <Switch
+                        checked={parameters.adaptive}
+                        onChange={(e) => setParameters({ ...parameters, adaptive: e.target.checked })}
+                        disabled={isRunning}
+                      />
+                    }
+                    label="Adapt operators and mutation rate during the run"
+                  />
+                  <FormControlLabel
+                    control={
+                      <Switch
+                        checked={parameters.guidedMutation}
+                        onChange={(e) => setParameters({ ...parameters, guidedMutation: e.target.checked })}
+                        disabled={isRunning}
+                      />
+                    }
+                    label="Direct mutation at conflicting sessions"
+                  />
+                  <FormControlLabel
+                    control={
+                      <Switch
+                        checked={parameters.deduplicate}
+                        onChange={(e) => setParameters({ ...parameters, deduplicate: e.target.checked })}
+                        disabled={isRunning}
+                      />
+                    }
+                    label="Replace duplicate timetables in the population"
+                  />
+                </ParameterGroup>
               </Grid>
             </Grid>
           </AccordionDetails>
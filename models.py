@@ -1,5 +1,5 @@
 from database import Base  # Import Base explicitly to satisfy PyLance
-from sqlalchemy import Column, String, Date, Time, Integer, ForeignKey
+from sqlalchemy import Column, String, Date, Time, Integer, ForeignKey, Text, Boolean
 from sqlalchemy.orm import relationship
 from passlib.context import CryptContext
 from passlib.hash import bcrypt
@@ -132,3 +132,23 @@ class Timetable(Base):
     day = Column(String(20))
     created_at = Column(DateTime, default=datetime.utcnow)
 
+class GenerationJob(Base):
+    __tablename__ = "generation_jobs"
+
+    job_id = Column(String(36), primary_key=True, index=True)
+    semester = Column(String(20), nullable=False, index=True)
+    year = Column(Integer, nullable=True, index=True)  # None for a semester-wide job
+    years = Column(Text)  # JSON list of the years of a semester-wide job, null for every year
+    parameters = Column(Text)  # JSON of the GA parameters sent by the frontend
+    status = Column(String(20), nullable=False, default="queued", index=True)  # queued, running, completed, failed, cancelled
+    cancel_requested = Column(Boolean, nullable=False, default=False)
+    progress = Column(Text)  # JSON of the last progress report of the GA
+    result = Column(Text)  # JSON of the timetable stats once completed
+    error = Column(Text)
+    attempts = Column(Integer, nullable=False, default=0)
+    worker_id = Column(String(100))
+    requested_by = Column(String(20))
+    created_at = Column(DateTime, default=datetime.utcnow)
+    started_at = Column(DateTime, nullable=True)
+    heartbeat_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
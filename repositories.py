@@ -1,5 +1,7 @@
 from sqlalchemy.orm import Session
-from models import Lecturer, Course, Department, Room, Timeslot, Constraint, User
+from sqlalchemy import or_
+from datetime import datetime, timedelta
+from models import Lecturer, Course, Department, Room, Timeslot, Constraint, User, GenerationJob
 
 class BaseRepository:
     def __init__(self, model, db: Session):
@@ -14,6 +16,7 @@ class BaseRepository:
             Timeslot: "timeslot_id",
             Constraint: "constraint_id",
             User: "user_id",
+            GenerationJob: "job_id",
         }.get(model, "id")  # Default to "id" if not specified
 
     def get(self, id: str):
@@ -155,4 +158,114 @@ class UserRepository(BaseRepository):
     def get_by_username(self, username: str):
         return self.db.query(self.model).filter(
             self.model.username == username
-        ).first()
\ No newline at end of file
+        ).first()
+
+class GenerationJobRepository(BaseRepository):
+    ACTIVE_STATUSES = ("queued", "running")
+
+    def __init__(self, db: Session):
+        super().__init__(GenerationJob, db)
+
+    def get_all(self, skip: int = 0, limit: int = 100):
+        return self.db.query(self.model).order_by(
+            self.model.created_at.desc()
+        ).offset(skip).limit(limit).all()
+
+    def get_by_semester(self, semester: str, year: int = None, skip: int = 0, limit: int = 100):
+        query = self.db.query(self.model).filter(self.model.semester == semester)
+        if year is not None:
+            query = query.filter(self.model.year == year)
+        return query.order_by(self.model.created_at.desc()).offset(skip).limit(limit).all()
+
+    def _overlapping(self, semester: str, year=None):
+        """
+        Jobs a run for semester/year would collide with: those for the same
+        year and semester-wide ones (year None). A semester-wide run
+        (year=None) collides with every job of the semester.
+        """
+        query = self.db.query(self.model).filter(self.model.semester == semester)
+        if year is not None:
+            query = query.filter(or_(self.model.year == year, self.model.year.is_(None)))
+        return query
+
+    def get_active(self, semester: str, year=None):
+        return self._overlapping(semester, year).filter(
+            self.model.status.in_(self.ACTIVE_STATUSES)
+        ).first()
+
+    def claim_next(self, worker_id: str):
+        """
+        Mark the oldest queued job whose semester/year has no running job as
+        running for worker_id and return it, or None if there is nothing to do.
+        The conditional update makes the claim safe between worker processes.
+        """
+        candidates = self.db.query(self.model).filter(
+            self.model.status == "queued"
+        ).order_by(self.model.created_at).all()
+        for job in candidates:
+            busy = self._overlapping(job.semester, job.year).filter(
+                self.model.status == "running"
+            ).first()
+            if busy:
+                continue
+            now = datetime.utcnow()
+            claimed = self.db.query(self.model).filter(
+                self.model.job_id == job.job_id,
+                self.model.status == "queued"
+            ).update({
+                "status": "running",
+                "worker_id": worker_id,
+                "started_at": now,
+                "heartbeat_at": now,
+                "attempts": self.model.attempts + 1,
+            }, synchronize_session=False)
+            self.db.commit()
+            if claimed:
+                self.db.refresh(job)
+                return job
+        return None
+
+    def cancel(self, job_id: str):
+        """
+        Cancel a queued job outright, or flag a running one for its worker to
+        stop. Both are conditional updates so they cannot undo a claim.
+        Returns True if the job was cancelled or flagged.
+        """
+        now = datetime.utcnow()
+        updated = self.db.query(self.model).filter(
+            self.model.job_id == job_id,
+            self.model.status == "queued"
+        ).update({"status": "cancelled", "cancel_requested": True, "finished_at": now},
+                 synchronize_session=False)
+        if not updated:
+            updated = self.db.query(self.model).filter(
+                self.model.job_id == job_id,
+                self.model.status == "running"
+            ).update({"cancel_requested": True}, synchronize_session=False)
+        self.db.commit()
+        return bool(updated)
+
+    def requeue_stale(self, stale_after: timedelta, max_attempts: int):
+        """
+        Jobs left running by a worker that stopped sending heartbeats go back
+        to the queue, or fail once they have used up max_attempts.
+        Returns the number of jobs touched.
+        """
+        cutoff = datetime.utcnow() - stale_after
+        stale = self.db.query(self.model).filter(
+            self.model.status == "running",
+            self.model.heartbeat_at < cutoff
+        ).all()
+        for job in stale:
+            if job.cancel_requested:
+                job.status = "cancelled"
+                job.finished_at = datetime.utcnow()
+            elif job.attempts >= max_attempts:
+                job.status = "failed"
+                job.error = f"Worker {job.worker_id} stopped responding after {job.attempts} attempts"
+                job.finished_at = datetime.utcnow()
+            else:
+                job.status = "queued"
+                job.worker_id = None
+        self.db.commit()
+        return len(stale)
@@ -1,14 +1,19 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks
+from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 from datetime import datetime, timedelta
 from typing import List, Optional
 from fastapi.security import OAuth2PasswordRequestForm
+from fastapi.responses import StreamingResponse
+from fastapi.concurrency import run_in_threadpool
+import asyncio
+import json
+import time
 import uuid
 import service
 from GA import generate_timetable
 from typing import Dict, Any
-from GA import generate_timetable, Chromosome, ScheduleItem, TimetableGenerator
+from GA import generate_timetable, Chromosome, ScheduleItem, TimetableGenerator, validate_generation_parameters, replan_timetable, validate_parameters, REPLAN_PARAMETERS
 import logging
 logger = logging.getLogger(__name__)
 
@@ -27,15 +32,18 @@ from schemas import (
     Timeslot, TimeslotCreate, TimeslotUpdate,
     Constraint, ConstraintCreate, ConstraintUpdate,
     User, UserCreate, UserUpdate, Token,
-    ConflictItem, ConflictSchema, TimetableStats, TimetableWithConflicts
+    ConflictItem, ConflictSchema, TimetableStats, TimetableWithConflicts,
+    GenerationJob
 )
 from service import (
     LecturerService, CourseService, DepartmentService,
-    RoomService, TimeslotService, ConstraintService, UserService
+    RoomService, TimeslotService, ConstraintService, UserService,
+    GenerationJobService
 )
 from repositories import (
     LecturerRepository, CourseRepository, DepartmentRepository,
-    RoomRepository, TimeslotRepository, ConstraintRepository, UserRepository
+    RoomRepository, TimeslotRepository, ConstraintRepository, UserRepository,
+    GenerationJobRepository
 )
 from auth import (
     create_access_token,
@@ -434,6 +442,12 @@ async def check_timetable_status(semester: str, year: Optional[int] = None, db:
     if year is not None:
         timeslots = timeslots.filter(models.Timeslot.year == year)
     count = timeslots.count()
+    jobs = GenerationJobRepository(db).get_by_semester(semester, year, limit=1)
+    if jobs:
+        # The latest generation job is authoritative over existing timeslots
+        job = jobs[0]
+        job_status = {"queued": "running", "running": "running", "completed": "complete"}.get(job.status, job.status)
+        return {"status": job_status, "timeslot_count": count, "job_id": job.job_id, "job_status": job.status}
     return {"status": "complete" if count > 0 else "running", "timeslot_count": count}
 
 @router.put("/timeslots/{timeslot_id}", response_model=Timeslot)
@@ -583,12 +597,14 @@ async def read_users_me(
 ):
     return current_user
 
+def get_generation_job_service(db: Session = Depends(get_db)) -> GenerationJobService:
+    return GenerationJobService(GenerationJobRepository(db))
+
 @router.post("/generate-timetable/")
 async def generate_timetable_endpoint(
     request: Dict[str, Any],
-    background_tasks: BackgroundTasks,
-    db: Session = Depends(get_db),
-    _ = Depends(require_role("admin"))
+    job_service: GenerationJobService = Depends(get_generation_job_service),
+    current_user: User = Depends(require_role("admin"))
 ):
     try:
         semester = request.get("semester")
@@ -618,41 +634,20 @@ async def generate_timetable_endpoint(
                 detail="Year must be a valid positive integer"
             )
         
-        # Log the processing details
-        logger.info(f"Starting timetable generation for semester: {semester}, year: {year}")
+        # Reject bad parameters now rather than when a worker picks the job up
+        try:
+            validate_generation_parameters(parameters)
+        except ValueError as ve:
+            raise HTTPException(status_code=400, detail=str(ve))
         
-        def run_ga_task():
-            try:
-                logger.info(f"Processing timetable generation for {semester} year {year}")
-                
-                # Generate timetable with validated parameters
-                timetable_result = generate_timetable(db, semester, year, parameters)
-                
-                logger.info(f"Generated timetable with {len(timetable_result['schedule'])} schedule items")
-                
-                # Save the timetable
-                create_timetable(db, timetable_result['schedule'])
-                db.commit()
-                
-                logger.info(f"Successfully saved timetable for {semester} year {year}")
-                
-            except ValueError as ve:
-                logger.error(f"Validation error in GA task for {semester} year {year}: {str(ve)}")
-                db.rollback()
-                raise HTTPException(status_code=400, detail=f"Invalid data: {str(ve)}")
-                
-            except Exception as e:
-                logger.error(f"GA task error for {semester} year {year}: {str(e)}")
-                db.rollback()
-                raise HTTPException(status_code=500, detail=f"Timetable generation failed: {str(e)}")
-
-        # Add the background task
-        background_tasks.add_task(run_ga_task)
+        # The GA runs in a worker process (worker.py), not on the API worker
+        job = job_service.enqueue_job(semester, year, parameters, requested_by=current_user.user_id)
         
-        logger.info(f"Timetable generation task queued for {semester} year {year}")
+        logger.info(f"Timetable generation job {job.job_id} queued for {semester} year {year}")
         return {
-            "message": "Timetable generation started", 
-            "status": "running",
+            "message": "Timetable generation queued", 
+            "status": job.status,
+            "job_id": job.job_id,
             "semester": semester,
             "year": year
         }
@@ -666,6 +661,229 @@ async def generate_timetable_endpoint(
             status_code=500, 
             detail=f"Error starting timetable generation: {str(e)}"
         )
+
+@router.get("/generation-jobs/", response_model=List[GenerationJob])
+def read_generation_jobs(
+    semester: Optional[str] = None,
+    year: Optional[int] = None,
+    skip: int = 0,
+    limit: int = 100,
+    job_service: GenerationJobService = Depends(get_generation_job_service),
+    _ = Depends(require_role("admin"))
+):
+    return job_service.get_jobs(semester, year, skip, limit)
+
+@router.get("/generation-jobs/{job_id}", response_model=GenerationJob)
+def read_generation_job(
+    job_id: str,
+    job_service: GenerationJobService = Depends(get_generation_job_service),
+    _ = Depends(require_role("admin"))
+):
+    job = job_service.get_job(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+# The worker publishes progress on the job row; the stream reads it by primary key
+JOB_EVENTS_POLL_SECONDS = 0.5
+JOB_EVENTS_KEEPALIVE_SECONDS = 15
+FINISHED_JOB_STATUSES = ("completed", "failed", "cancelled")
+
+def _sse_event(event: str, data: Dict[str, Any]) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+def _read_job_snapshot(job_id: str) -> Optional[Dict[str, Any]]:
+    """The job as JSON-ready data, read with a session of its own"""
+    db = next(get_db())
+    try:
+        job = GenerationJobRepository(db).get(job_id)
+        return GenerationJob.model_validate(job).model_dump(mode="json") if job else None
+    finally:
+        db.close()
+
+@router.get("/generation-jobs/{job_id}/events")
+async def stream_generation_job_events(
+    job_id: str,
+    job_service: GenerationJobService = Depends(get_generation_job_service),
+    _ = Depends(require_role("admin"))
+):
+    """
+    Server-Sent Events for a job: 'status' when its status changes, 'progress'
+    with each new GA report (generation, best and mean fitness, hard/soft
+    violations, ETA) and a final 'result' event once the job has finished.
+    """
+    if not job_service.get_job(job_id):
+        raise HTTPException(status_code=404, detail="Job not found")
+    
+    async def events():
+        last_status = None
+        last_progress = None
+        last_sent = time.monotonic()
+        while True:
+            # A session per read, since the request's session is closed once streaming
+            # starts, and off the event loop so open streams don't stall other requests
+            job = await run_in_threadpool(_read_job_snapshot, job_id)
+            if job is None:
+                yield _sse_event("error", {"detail": "Job not found"})
+                return
+            
+            if job["status"] != last_status:
+                last_status = job["status"]
+                last_sent = time.monotonic()
+                yield _sse_event("status", {"job_id": job_id, "status": job["status"]})
+            if job["progress"] and job["progress"] != last_progress:
+                last_progress = job["progress"]
+                last_sent = time.monotonic()
+                yield _sse_event("progress", job["progress"])
+            if job["status"] in FINISHED_JOB_STATUSES:
+                yield _sse_event("result", {
+                    "job_id": job_id,
+                    "status": job["status"],
+                    "stats": job["result"],
+                    "error": job["error"],
+                    "progress": job["progress"]
+                })
+                return
+            if time.monotonic() - last_sent >= JOB_EVENTS_KEEPALIVE_SECONDS:
+                last_sent = time.monotonic()
+                yield ": keepalive\n\n"
+            await asyncio.sleep(JOB_EVENTS_POLL_SECONDS)
+    
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@router.post("/generation-jobs/{job_id}/cancel", response_model=GenerationJob)
+def cancel_generation_job(
+    job_id: str,
+    job_service: GenerationJobService = Depends(get_generation_job_service),
+    _ = Depends(require_role("admin"))
+):
+    job = job_service.cancel_job(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    logger.info(f"Cancellation requested for job {job_id} ({job.status})")
+    return job
+
+@router.post("/generate-semester-timetables/")
+async def generate_semester_timetables_endpoint(
+    request: Dict[str, Any],
+    job_service: GenerationJobService = Depends(get_generation_job_service),
+    current_user: User = Depends(require_role("admin"))
+):
+    semester = request.get("semester")
+    years = request.get("years")  # None means every year with courses in the semester
+    parameters = request.get("parameters", {})
+    
+    if not semester:
+        raise HTTPException(status_code=400, detail="Semester is required")
+    if years is not None:
+        if not isinstance(years, list) or not all(isinstance(y, int) and y > 0 for y in years):
+            raise HTTPException(status_code=400, detail="Years must be a list of positive integers")
+    try:
+        validate_generation_parameters(parameters)
+    except ValueError as ve:
+        raise HTTPException(status_code=400, detail=str(ve))
+    
+    # One semester-wide job: the worker runs the years together so they can share rooms and lecturers
+    job = job_service.enqueue_semester_job(semester, years, parameters, requested_by=current_user.user_id)
+    
+    logger.info(f"Semester timetable generation job {job.job_id} queued for {semester}, years: {years or 'all'}")
+    return {
+        "message": "Semester timetable generation queued",
+        "status": job.status,
+        "job_id": job.job_id,
+        "semester": semester,
+        "years": years
+    }
+
+@router.post("/timetables/replan/")
+def replan_timetable_endpoint(
+    request: Dict[str, Any],
+    db: Session = Depends(get_db),
+    _ = Depends(require_role("admin"))
+):
+    semester = request.get("semester")
+    years = request.get("years")  # None means every year the changes touch
+    course_ids = request.get("course_ids", [])
+    room_ids = request.get("room_ids", [])
+    lecturer_ids = request.get("lecturer_ids", [])
+    apply = request.get("apply", True)
+    
+    if not semester:
+        raise HTTPException(status_code=400, detail="Semester is required")
+    if years is not None:
+        if not isinstance(years, list) or not all(isinstance(y, int) and y > 0 for y in years):
+            raise HTTPException(status_code=400, detail="Years must be a list of positive integers")
+    for name, ids in (("course_ids", course_ids), ("room_ids", room_ids), ("lecturer_ids", lecturer_ids)):
+        if not isinstance(ids, list):
+            raise HTTPException(status_code=400, detail=f"{name} must be a list")
+    if not (course_ids or room_ids or lecturer_ids):
+        raise HTTPException(status_code=400, detail="Nothing to re-plan: give the changed course, room or lecturer ids")
+    # The search runs inside this request, so timeLimit is kept short
+    try:
+        time_limit = validate_parameters(request, REPLAN_PARAMETERS)['timeLimit']
+    except ValueError as ve:
+        raise HTTPException(status_code=400, detail=str(ve))
+    
+    # A queued or running GA job, per-year or semester-wide, would overwrite the repair when it saves
+    job_repository = GenerationJobRepository(db)
+    job = None
+    for year in (years if years is not None else [None]):
+        job = job or job_repository.get_active(semester, year)
+    if job:
+        scope = f"year {job.year}" if job.year is not None else "the whole semester"
+        raise HTTPException(
+            status_code=409,
+            detail=f"A generation job for {semester} ({scope}) is {job.status}; re-plan once it has finished"
+        )
+    
+    try:
+        results = replan_timetable(db, semester, course_ids, room_ids, lecturer_ids,
+                                   years=years, apply=apply, time_limit=float(time_limit))
+    except Exception as e:
+        db.rollback()
+        logger.error(f"Re-planning {semester} failed: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Error re-planning timetable: {str(e)}")
+    
+    logger.info(f"Re-planned {semester} years {sorted(results)}: "
+                f"{sum(len(r['changes']) for r in results.values())} changes, applied: {apply}")
+    return {
+        "semester": semester,
+        "applied": apply,
+        "years": {year: {
+            "freed": result["freed"],
+            "changes": result["changes"],
+            "stats": {k: (v.item() if hasattr(v, "item") else v) for k, v in result["stats"].items()},
+        } for year, result in results.items()}
+    }
+
+@router.get("/timetables/presolve/")
+def presolve_timetable(
+    semester: str,
+    year: Optional[int] = None,
+    db: Session = Depends(get_db),
+    _ = Depends(require_role("admin"))
+):
+    """Hard-constraint pre-solve: proven infeasibilities and domain sizes, without running the GA"""
+    try:
+        generator = TimetableGenerator(db=db, semester=semester, year=year)
+        tables = generator.presolve_tables()
+    except Exception as e:
+        logger.error(f"Pre-solve for {semester} year {year} failed: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Error running pre-solve: {str(e)}")
+    return {
+        "semester": semester,
+        "year": year,
+        "feasible": not generator.infeasibilities,  # False only when proven infeasible
+        "infeasibilities": generator.infeasibilities,
+        "placements": {
+            course_id: len(cells) for course_id, cells in zip(tables.course_ids, tables.course_domain_cells)
+        }
+    }
+
 @router.get("/timetables/", response_model=List[Timeslot])
 def read_timetables(
     skip: int = 0,
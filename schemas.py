@@ -1,5 +1,6 @@
-from pydantic import BaseModel, EmailStr
-from typing import Optional, List
+import json
+from pydantic import BaseModel, EmailStr, field_validator
+from typing import Optional, List, Dict, Any
 from datetime import date, time
 from datetime import datetime
 
@@ -300,4 +301,35 @@ class TimetableWithConflicts(BaseModel):
     stats: TimetableStats
 
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+# ====================== GENERATION JOB SCHEMAS ======================
+class GenerationJob(BaseModel):
+    job_id: str
+    semester: str
+    year: Optional[int] = None  # None for a semester-wide job
+    years: Optional[List[int]] = None
+    status: str
+    cancel_requested: bool = False
+    parameters: Optional[Dict[str, Any]] = None
+    progress: Optional[Dict[str, Any]] = None
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+    attempts: int = 0
+    worker_id: Optional[str] = None
+    requested_by: Optional[str] = None
+    created_at: Optional[datetime] = None
+    started_at: Optional[datetime] = None
+    heartbeat_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+    @field_validator("years", "parameters", "progress", "result", mode="before")
+    @classmethod
+    def parse_json_text(cls, value):
+        # Stored as JSON text in the jobs table
+        if isinstance(value, str):
+            return json.loads(value) if value else None
+        return value
+
+    class Config:
+        from_attributes = True
@@ -1,4 +1,6 @@
 import re
+import json
+import uuid
 from sqlalchemy.orm import Session
 import logging
 from sqlalchemy.sql import func
@@ -13,7 +15,8 @@ from repositories import (
     RoomRepository,
     TimeslotRepository,
     ConstraintRepository,
-    UserRepository
+    UserRepository,
+    GenerationJobRepository
 )
 from models import (
     Lecturer, 
@@ -22,7 +25,8 @@ from models import (
     Room,
     Timeslot,
     Constraint,
-    User
+    User,
+    GenerationJob
 )
 from schemas import (
     LecturerCreate, LecturerUpdate,
@@ -305,6 +309,69 @@ class UserService:
     
 
 
+class GenerationJobService:
+    def __init__(self, job_repository: GenerationJobRepository):
+        self.repository = job_repository
+
+    def enqueue_job(self, semester: str, year: int, parameters: dict, requested_by: Optional[str] = None) -> GenerationJob:
+        """Queue a GA run for the worker. Only one job per semester/year may be queued or running."""
+        active = self.repository.get_active(semester, year)
+        if active:
+            scope = f"year {year}" if active.year is not None else "the whole semester"
+            raise HTTPException(
+                status_code=409,
+                detail=f"Timetable generation for {semester} ({scope}) is already {active.status} (job {active.job_id})"
+            )
+        return self.repository.create({
+            "job_id": str(uuid.uuid4()),
+            "semester": semester,
+            "year": year,
+            "parameters": json.dumps(parameters or {}),
+            "status": "queued",
+            "requested_by": requested_by,
+        })
+
+    def enqueue_semester_job(self, semester: str, years: Optional[List[int]], parameters: dict,
+                             requested_by: Optional[str] = None) -> GenerationJob:
+        """
+        Queue a semester-wide GA run (every year, or the given ones) for the
+        worker. It cannot be queued next to any active job of the semester.
+        """
+        active = self.repository.get_active(semester)
+        if active:
+            scope = f"year {active.year}" if active.year is not None else "the whole semester"
+            raise HTTPException(
+                status_code=409,
+                detail=f"Timetable generation for {semester} ({scope}) is already {active.status} (job {active.job_id})"
+            )
+        return self.repository.create({
+            "job_id": str(uuid.uuid4()),
+            "semester": semester,
+            "year": None,
+            "years": json.dumps(years) if years is not None else None,
+            "parameters": json.dumps(parameters or {}),
+            "status": "queued",
+            "requested_by": requested_by,
+        })
+
+    def get_job(self, job_id: str) -> Optional[GenerationJob]:
+        return self.repository.get(job_id)
+
+    def get_jobs(self, semester: Optional[str] = None, year: Optional[int] = None,
+                 skip: int = 0, limit: int = 100) -> List[GenerationJob]:
+        if semester:
+            return self.repository.get_by_semester(semester, year, skip, limit)
+        return self.repository.get_all(skip, limit)
+
+    def cancel_job(self, job_id: str) -> Optional[GenerationJob]:
+        job = self.repository.get(job_id)
+        if not job:
+            return None
+        if not self.repository.cancel(job_id):
+            raise HTTPException(status_code=409, detail=f"Job {job_id} has already {job.status}")
+        self.repository.db.refresh(job)
+        return job
+
 def get_lecturers(db: Session, skip: int = 0, limit: int = 100) -> List[Lecturer]:
     lecturer_service = LecturerService(LecturerRepository(db))
     return lecturer_service.get_all_lecturers(skip, limit)
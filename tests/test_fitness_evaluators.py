@@ -0,0 +1,168 @@
+"""The loop, vectorized and batch evaluators must agree on the same chromosomes"""
+import random
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from GA import (DAYS, PERIODS_PER_DAY, ArrayChromosome, ProblemData, TimetableGenerator,
+                build_fitness_state, evaluate_genome_vectorized, score_fitness_state)
+
+N_CHROMOSOMES = 200
+
+
+def make_problem(n_courses=30, n_rooms=4, n_lecturers=6, n_groups=5, seed=0) -> ProblemData:
+    """Small synthetic problem with few rooms and shared lecturers and groups, so clashes are common"""
+    rnd = random.Random(seed)
+    rooms = {
+        f"R{i}": SimpleNamespace(room_id=f"R{i}", room_name=f"Room {i}", capacity=rnd.choice([20, 40, 60]),
+                                 room_type="LAB" if i % 3 == 0 else "LECTURE")
+        for i in range(n_rooms)
+    }
+    lecturers = {
+        f"L{i}": SimpleNamespace(lecturer_id=f"L{i}", lecturer_name=f"Lecturer {i}")
+        for i in range(n_lecturers)
+    }
+    courses = {
+        f"C{i}": SimpleNamespace(course_id=f"C{i}", course_name=f"Course {i}" + (" Lab" if i % 7 == 0 else ""),
+                                 no_of_students=rnd.choice([15, 30, 50]), sessions_count=rnd.choice([1, 2]),
+                                 student_group=f"G{i % n_groups}", lecturer_id=f"L{i % n_lecturers}")
+        for i in range(n_courses)
+    }
+    return ProblemData(
+        semester="Fall",
+        year=1,
+        lecturers=lecturers,
+        courses=courses,
+        rooms=rooms,
+        constraints=[],
+        course_lecturer_mapping={c_id: course.lecturer_id for c_id, course in courses.items()},
+    )
+
+
+def make_generator(fitness_evaluator: str, seed=0) -> TimetableGenerator:
+    return TimetableGenerator(db=None, semester="Fall", year=1, genome_mode="array",
+                              fitness_evaluator=fitness_evaluator, problem=make_problem(seed=seed))
+
+
+def random_chromosomes(generator: TimetableGenerator, n: int, seed=0):
+    """Uniformly random placements over every room, day and period, weekends and prayer time included"""
+    rng = np.random.default_rng(seed)
+    course_idx = generator.genome_tables.gene_course
+    n_genes, n_rooms = len(course_idx), len(generator.genome_tables.room_ids)
+    return [
+        ArrayChromosome(course_idx,
+                        rng.integers(0, n_rooms, n_genes).astype(course_idx.dtype),
+                        rng.integers(0, len(DAYS), n_genes).astype(course_idx.dtype),
+                        rng.integers(0, PERIODS_PER_DAY, n_genes).astype(course_idx.dtype))
+        for _ in range(n)
+    ]
+
+
+@pytest.fixture(scope="module")
+def evaluated():
+    """(loop, vectorized, batch) results of the same random chromosomes, as (fitness, hard, soft) tuples"""
+    loop = make_generator("loop")
+    vectorized = make_generator("vectorized")
+    chromosomes = random_chromosomes(loop, N_CHROMOSOMES)
+
+    loop_results = []
+    for chromosome in chromosomes:
+        fitness = loop.calculate_fitness(chromosome.copy())
+        decoded = loop.decode_chromosome(chromosome)
+        loop.calculate_fitness(decoded)
+        loop_results.append((fitness, decoded.hard_violations, decoded.soft_violations))
+
+    vectorized_results = [
+        evaluate_genome_vectorized(vectorized.genome_tables, c.course_idx, c.room_idx, c.day_idx, c.period_idx)
+        for c in chromosomes
+    ]
+
+    batch = [c.copy() for c in chromosomes]
+    vectorized._evaluate_population_batch(batch)
+    batch_results = [(c.fitness, c.hard_violations, c.soft_violations) for c in batch]
+    return chromosomes, loop_results, vectorized_results, batch_results
+
+
+def test_population_is_conflict_heavy(evaluated):
+    _, loop_results, _, _ = evaluated
+    assert all(hard > 0 for _, hard, _ in loop_results)
+
+
+def test_fitness_matches_loop(evaluated):
+    _, loop_results, vectorized_results, batch_results = evaluated
+    for loop_result, vectorized_result, batch_result in zip(loop_results, vectorized_results, batch_results):
+        assert vectorized_result[0] == pytest.approx(loop_result[0], rel=1e-12)
+        assert batch_result[0] == pytest.approx(loop_result[0], rel=1e-12)
+
+
+def test_check_vectorized_fitness_finds_no_mismatch(evaluated):
+    chromosomes, _, _, _ = evaluated
+    assert make_generator("vectorized").check_vectorized_fitness(chromosomes) == []
+
+
+def test_soft_violations_match_loop(evaluated):
+    _, loop_results, vectorized_results, batch_results = evaluated
+    assert [r[2] for r in vectorized_results] == [r[2] for r in loop_results]
+    assert [r[2] for r in batch_results] == [r[2] for r in loop_results]
+
+
+def test_batch_matches_single_chromosome_evaluation(evaluated):
+    _, _, vectorized_results, batch_results = evaluated
+    assert batch_results == [(float(f), int(h), int(s)) for f, h, s in vectorized_results]
+
+
+def test_hard_violation_shortfall_is_bounded(evaluated):
+    # Documented in evaluate_population_vectorized: overlap conflicts are merged
+    # as connected components, while calculate_fitness merges each new conflict
+    # into the first one sharing a course, so chained overlaps can count lower
+    _, loop_results, vectorized_results, _ = evaluated
+    shortfall = [loop[1] - vectorized[1] for loop, vectorized in zip(loop_results, vectorized_results)]
+    assert min(shortfall) >= 0
+    assert max(shortfall) <= 2
+    assert sum(shortfall) <= 0.01 * sum(loop[1] for loop in loop_results)
+
+
+def loop_result(generator: TimetableGenerator, chromosome: ArrayChromosome):
+    decoded = generator.decode_chromosome(chromosome)
+    fitness = generator.calculate_fitness(decoded)
+    return fitness, decoded.hard_violations, decoded.soft_violations
+
+
+def test_fitness_state_matches_loop():
+    generator = make_generator("loop")
+    for chromosome in random_chromosomes(generator, 50, seed=1):
+        fitness, hard, soft = score_fitness_state(build_fitness_state(generator.genome_tables, chromosome))
+        loop_fitness, loop_hard, loop_soft = loop_result(generator, chromosome)
+        assert fitness == pytest.approx(loop_fitness, rel=1e-12)
+        assert (hard, soft) == (loop_hard, loop_soft)
+
+
+def test_move_gene_matches_loop():
+    generator = make_generator("loop")
+    tables = generator.genome_tables
+    rng = random.Random(2)
+    for chromosome in random_chromosomes(generator, 20, seed=2):
+        for _ in range(20):
+            generator.move_gene(chromosome, rng.randrange(len(chromosome)), rng.randrange(len(tables.room_ids)),
+                                rng.randrange(len(DAYS)), rng.randrange(PERIODS_PER_DAY))
+            loop_fitness, loop_hard, loop_soft = loop_result(generator, chromosome)
+            assert chromosome.fitness == pytest.approx(loop_fitness, rel=1e-12)
+            assert (chromosome.hard_violations, chromosome.soft_violations) == (loop_hard, loop_soft)
+
+
+@pytest.mark.parametrize("presolved", [False, True])
+def test_move_fitness_matches_move_gene(presolved):
+    generator = make_generator("loop")
+    if presolved:
+        generator.presolve_tables()
+    rng = random.Random(3)
+    for chromosome in random_chromosomes(generator, 10, seed=3):
+        for gene in rng.sample(range(len(chromosome)), 5):
+            rooms, days, periods = generator._candidate_placements(int(chromosome.course_idx[gene]))
+            predicted = generator.move_fitness(chromosome, gene, rooms, days, periods)
+            origin = (chromosome.room_idx[gene], chromosome.day_idx[gene], chromosome.period_idx[gene])
+            for room, day, period, fitness in zip(rooms, days, periods, predicted):
+                generator.move_gene(chromosome, gene, room, day, period)
+                assert fitness == pytest.approx(chromosome.fitness, rel=1e-12)
+            generator.move_gene(chromosome, gene, *origin)
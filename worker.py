@@ -0,0 +1,194 @@
+"""
+Worker process for queued timetable generation jobs.
+
+The API only records GA runs in the generation_jobs table. Start one or more
+workers next to it to run them:
+
+    python worker.py [--poll-interval 2] [--once]
+
+Each worker claims one job at a time, runs the GA with its own database
+sessions and records progress, the timetable stats or the error on the job.
+Semester-wide jobs (no year) run every year of the semester at once with
+generate_semester_timetables. Only one job per semester/year runs at any
+time, across all workers, and a semester-wide job runs alone in its semester.
+Running per-year jobs are checkpointed, so a job requeued after its worker
+died resumes where it was instead of starting over.
+"""
+import argparse
+import json
+import logging
+import os
+import socket
+import time
+from datetime import datetime, timedelta
+
+from database import get_db
+from models import GenerationJob
+from repositories import GenerationJobRepository
+from GA import generate_timetable, generate_semester_timetables
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# How often a running job writes its progress, which the API streams to
+# clients, and checks for cancellation
+HEARTBEAT_SECONDS = 1
+# Running jobs without a heartbeat for this long are assumed lost with their worker
+STALE_AFTER_SECONDS = 600
+MAX_ATTEMPTS = 3
+# Shared by all workers that may pick up a requeued job. Checkpoints are
+# pickles and resuming one runs whatever it contains, so this directory must
+# be writable by the service account only
+CHECKPOINT_DIR = os.environ.get("TIMETABLE_CHECKPOINT_DIR", "checkpoints")
+
+
+class JobCancelled(Exception):
+    """Raised from the progress callback to stop a GA run that was cancelled"""
+
+
+def _json_default(value):
+    # numpy scalars from the vectorized evaluator
+    if hasattr(value, "item"):
+        return value.item()
+    return str(value)
+
+
+class JobProgress:
+    """
+    progress_callback for a job: stores the latest GA progress on the job row
+    at most every HEARTBEAT_SECONDS, which doubles as the worker heartbeat,
+    and raises JobCancelled once the job has been cancelled.
+    """
+
+    def __init__(self, job_db, job_id: str):
+        self.job_db = job_db
+        self.job_id = job_id
+        self.last_write = 0.0
+        self.latest = None
+
+    def __call__(self, progress: dict, force: bool = False):
+        self.latest = progress
+        now = time.monotonic()
+        if not force and now - self.last_write < HEARTBEAT_SECONDS:
+            return
+        self.last_write = now
+        self.job_db.query(GenerationJob).filter(GenerationJob.job_id == self.job_id).update({
+            "progress": json.dumps(progress, default=_json_default),
+            "heartbeat_at": datetime.utcnow(),
+        }, synchronize_session=False)
+        self.job_db.commit()
+        cancel_requested = self.job_db.query(GenerationJob.cancel_requested).filter(
+            GenerationJob.job_id == self.job_id
+        ).scalar()
+        if cancel_requested:
+            raise JobCancelled(self.job_id)
+
+
+def _finish_job(job_db, job_id: str, status: str, **fields):
+    fields.update(status=status, finished_at=datetime.utcnow())
+    job_db.query(GenerationJob).filter(GenerationJob.job_id == job_id).update(
+        fields, synchronize_session=False
+    )
+    job_db.commit()
+
+
+def _discard_checkpoint(path: str):
+    if os.path.exists(path):
+        os.remove(path)
+
+
+def run_semester_job(ga_db, job: GenerationJob, parameters: dict, progress: JobProgress) -> dict:
+    """
+    Run a semester-wide job. Every year's stats go on the job's progress as
+    soon as that year is saved; cancellation is checked with the heartbeat.
+    Returns the job result, {'years': {year: stats}}.
+    """
+    years = json.loads(job.years) if job.years else None
+    finished = {}
+
+    def year_done(year, timetable):
+        logger.info(f"Job {job.job_id}: year {year} finished with {len(timetable['schedule'])} schedule items")
+        finished[str(year)] = dict(timetable['stats'], schedule_items=len(timetable['schedule']))
+        progress({'years': finished}, force=True)
+
+    generate_semester_timetables(ga_db, job.semester, years, parameters, on_year_done=year_done,
+                                 heartbeat=lambda: progress({'years': finished}))
+    return {'years': finished}
+
+
+def run_job(job_db, job: GenerationJob):
+    """Run a claimed job to completion, failure or cancellation"""
+    scope = f"year {job.year}" if job.year is not None else "all years"
+    logger.info(f"Running job {job.job_id}: {job.semester} {scope} (attempt {job.attempts})")
+    parameters = json.loads(job.parameters) if job.parameters else {}
+    # The GA gets a session of its own: job bookkeeping commits would
+    # otherwise expire the records it loaded
+    ga_db = next(get_db())
+    progress = JobProgress(job_db, job.job_id)
+    checkpoint_path = os.path.join(CHECKPOINT_DIR, f"{job.job_id}.ckpt")
+    try:
+        if job.year is None:
+            result = run_semester_job(ga_db, job, parameters, progress)
+        else:
+            # Islands keep their populations in child processes, and annealing runs
+            # are short single trajectories: neither is checkpointed
+            checkpointed = parameters.get('islands', 1) == 1 and parameters.get('engine', 'ga') == 'ga'
+            timetable = generate_timetable(ga_db, job.semester, job.year, parameters, progress_callback=progress,
+                                           checkpoint_path=checkpoint_path if checkpointed else None, resume=True)
+            logger.info(f"Job {job.job_id} completed with {len(timetable['schedule'])} schedule items")
+            result = timetable['stats']
+    except JobCancelled:
+        ga_db.rollback()
+        logger.info(f"Job {job.job_id} cancelled")
+        _discard_checkpoint(checkpoint_path)
+        _finish_job(job_db, job.job_id, "cancelled")
+    except Exception as e:
+        ga_db.rollback()
+        logger.exception(f"Job {job.job_id} failed")
+        _discard_checkpoint(checkpoint_path)
+        _finish_job(job_db, job.job_id, "failed", error=str(e))
+    else:
+        _finish_job(job_db, job.job_id, "completed",
+                    progress=json.dumps(progress.latest, default=_json_default),
+                    result=json.dumps(result, default=_json_default))
+    finally:
+        ga_db.close()
+
+
+def run_worker(poll_interval: float = 2.0, once: bool = False,
+               stale_after: float = STALE_AFTER_SECONDS, max_attempts: int = MAX_ATTEMPTS):
+    """Claim and run jobs until interrupted, or until the queue is empty with once=True"""
+    worker_id = f"{socket.gethostname()}:{os.getpid()}"
+    logger.info(f"Worker {worker_id} started")
+    while True:
+        job_db = next(get_db())
+        try:
+            repository = GenerationJobRepository(job_db)
+            requeued = repository.requeue_stale(timedelta(seconds=stale_after), max_attempts)
+            if requeued:
+                logger.warning(f"Recovered {requeued} job(s) from unresponsive workers")
+            job = repository.claim_next(worker_id)
+            if job:
+                run_job(job_db, job)
+        finally:
+            job_db.close()
+        if job is None:
+            if once:
+                break
+            time.sleep(poll_interval)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Run queued timetable generation jobs')
+    parser.add_argument('--poll-interval', type=float, default=2.0,
+                        help='Seconds to wait between checks of an empty queue')
+    parser.add_argument('--once', action='store_true', help='Exit once the queue is empty')
+    parser.add_argument('--stale-after', type=float, default=STALE_AFTER_SECONDS,
+                        help='Seconds without a heartbeat before a running job is requeued')
+    parser.add_argument('--max-attempts', type=int, default=MAX_ATTEMPTS,
+                        help='Attempts before a job whose worker keeps disappearing is failed')
+    args = parser.parse_args()
+    try:
+        run_worker(args.poll_interval, args.once, args.stale_after, args.max_attempts)
+    except KeyboardInterrupt:
+        logger.info("Worker stopped")